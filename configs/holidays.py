@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | Known NSE non-trading weekdays
+
+Used by the backfill downloader to avoid probing days NSE never
+publishes. Weekends are skipped separately. Extend each year from the
+NSE holiday circular; days learned as missing during a backfill are
+remembered in the backfill progress file, so gaps here only cost one probe.
+
+Muhurat-trading days (Diwali) are deliberately NOT listed.
+"""
+
+from datetime import date
+
+NSE_HOLIDAYS = {
+    # 2024
+    date(2024, 1, 22),
+    date(2024, 1, 26),
+    date(2024, 3, 8),
+    date(2024, 3, 25),
+    date(2024, 3, 29),
+    date(2024, 4, 11),
+    date(2024, 4, 17),
+    date(2024, 5, 1),
+    date(2024, 5, 20),
+    date(2024, 6, 17),
+    date(2024, 7, 17),
+    date(2024, 8, 15),
+    date(2024, 10, 2),
+    date(2024, 11, 15),
+    date(2024, 11, 20),
+    date(2024, 12, 25),
+    # 2025
+    date(2025, 2, 26),
+    date(2025, 3, 14),
+    date(2025, 3, 31),
+    date(2025, 4, 10),
+    date(2025, 4, 14),
+    date(2025, 4, 18),
+    date(2025, 5, 1),
+    date(2025, 8, 15),
+    date(2025, 8, 27),
+    date(2025, 10, 2),
+    date(2025, 10, 22),
+    date(2025, 11, 5),
+    date(2025, 12, 25),
+}
+
+
+def is_trading_day(d: date) -> bool:
+    return d.weekday() < 5 and d not in NSE_HOLIDAYS
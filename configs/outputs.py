@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | Output Policy (parquet authoritative, CSV mirrors optional)
+
+✔ Parquet is the source of truth for every table
+✔ CSV mirrors controlled in one place
+✔ CSVs still read by pipeline code are always written
+
+Modes (env NIFTY_CSV_MIRRORS, or run.py --csv-mirrors):
+  off   : no CSV mirrors
+  lazy  : CSV queued, exported later by tools/export_csv_mirrors.py
+          (run.py starts it in the background at low priority)
+  eager : CSV written next to the parquet, as before
+"""
+
+import os
+from fnmatch import fnmatch
+
+from configs.paths import AUDIT_DIR
+
+CSV_MODES   = ("off", "lazy", "eager")
+CSV_DEFAULT = "lazy"
+
+# CSVs consumed by pipeline code (file name patterns): written eagerly in every mode
+CSV_REQUIRED = [
+    "FUT_NIFTY_*.csv",           # append_master_futures / backfill_missing_futures
+    "nifty_ml_prediction.csv",   # batch_options_backtest
+]
+
+# Lazy mode: CSVs waiting for export (csv path → parquet source)
+CSV_PENDING = AUDIT_DIR / "csv_mirrors_pending.json"
+
+
+def csv_mode() -> str:
+    # Read per call: run.py may switch modes for in-process stages
+    mode = os.environ.get("NIFTY_CSV_MIRRORS", CSV_DEFAULT).strip().lower()
+    if mode not in CSV_MODES:
+        raise ValueError(f"NIFTY_CSV_MIRRORS must be one of {CSV_MODES}, got {mode!r}")
+    return mode
+
+
+def csv_required(csv_name: str) -> bool:
+    return any(fnmatch(csv_name, pat) for pat in CSV_REQUIRED)
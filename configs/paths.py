@@ -32,6 +32,11 @@ RAW_EQUITY_DIR  = RAW_DIR / "equity"
 RAW_FUTURES_DIR = RAW_DIR / "futures"
 RAW_OPTIONS_DIR = RAW_DIR / "options"
 
+# Shared FO bhavcopy store (content-addressed, one copy per day)
+RAW_FO_DIR      = RAW_DIR / "fo"
+RAW_FO_OBJECTS  = RAW_FO_DIR / "objects"
+RAW_FO_MANIFEST = RAW_FO_DIR / "manifest.json"
+
 # ==================================================
 # PROCESSED DATA
 # ==================================================
@@ -54,6 +59,13 @@ CONT_DIR          = DATA_DIR / "continuous"
 NIFTY_CONTINUOUS  = CONT_DIR / "nifty_continuous.parquet"
 BANKNIFTY_CONT    = CONT_DIR / "banknifty_continuous.parquet"
 
+MASTER_EQUITY_PQ   = CONT_DIR / "master_equity.parquet"
+MASTER_FUTURES_PQ  = CONT_DIR / "master_futures.parquet"
+
+# Options master: hive dataset, one TRADE_DATE=YYYY-MM-DD dir per day
+MASTER_OPTIONS_DS  = CONT_DIR / "master_options"
+MASTER_OPTIONS_CSV = CONT_DIR / "master_options.csv"
+
 # ==================================================
 # ML / FUTURES / OPTIONS OUTPUTS
 # ==================================================
@@ -68,12 +80,16 @@ BACKTEST_DIR  = DATA_DIR / "backtest"
 ANALYSIS_DIR  = DATA_DIR / "analysis"
 SIGNAL_DIR    = DATA_DIR / "signals"
 AUDIT_DIR     = DATA_DIR / "audit"
+REPLAY_DIR    = DATA_DIR / "replay"
 
 # ==================================================
 # 🔥 MODELS (FIX FOR YOUR ERROR)
 # ==================================================
 MODEL_DIR = BASE_DIR / "models"
 
+# Written by train_nifty_lgbm, read by the historical ensemble + model server
+LGBM_MODEL_FILE = MODEL_DIR / "nifty_lgbm_model.joblib"
+
 # ==================================================
 # OPTIONAL OPTIONS STRUCTURE
 # ==================================================
@@ -87,6 +103,7 @@ for p in [
     RAW_EQUITY_DIR,
     RAW_FUTURES_DIR,
     RAW_OPTIONS_DIR,
+    RAW_FO_OBJECTS,
     PROC_EQ_DAILY,
     PROC_FUT_DAILY,
     PROC_OPT_DAILY,
@@ -99,6 +116,7 @@ for p in [
     ANALYSIS_DIR,
     SIGNAL_DIR,
     AUDIT_DIR,
+    REPLAY_DIR,
     MODEL_DIR,
 ]:
     p.mkdir(parents=True, exist_ok=True)
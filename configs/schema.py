@@ -39,3 +39,35 @@ OPTIONS_DAILY_SCHEMA = {
     "PR_VAL": "float",
     "TRADE_DATE": "datetime64[ns]",
 }
+
+# --------------------------------------------------
+# OPTIONS MASTER — STORAGE SCHEMA (partitioned parquet)
+# --------------------------------------------------
+# Arrow types as stored on disk and returned by the loaders
+# (pipelines/storage/compact.py). Strings are dictionary-encoded,
+# counts are integers (missing → 0), prices float32.
+OPTIONS_MASTER_STORAGE = {
+    "INSTRUMENT": "dictionary",
+    "SYMBOL": "dictionary",
+    "OPT_TYPE": "dictionary",
+    "TRADE_DATE": "date32",
+    "EXP_DATE": "date32",
+    "STR_PRICE": "int32",       # paise, see SCALED_COLS
+    "OPEN_PRICE": "float32",
+    "HI_PRICE": "float32",
+    "LO_PRICE": "float32",
+    "CLOSE_PRICE": "float32",
+    "OPEN_INT": "int64",
+    "TRD_QTY": "int64",
+    "NO_OF_CONT": "int32",
+    "NO_OF_TRADE": "int32",
+    "NOTION_VAL": "float32",    # Rs lakhs
+    "PR_VAL": "float32",        # Rs lakhs
+}
+
+# Stored as round(value * scale); loaders divide back (float32 rupees)
+SCALED_COLS = {
+    "STR_PRICE": 100,
+}
+
+OPTIONS_STORAGE_VERSION = "compact-v1"
@@ -58,15 +58,13 @@ function Run-Script($name, $script) {
 # PHASE 1 - DOWNLOAD
 # =====================================================
 Run-Step "Download Equity"   "pipelines.equity.daily_download_equ_auto"
-Run-Step "Download Futures"  "pipelines.futures.daily_download_fut_auto"
-Run-Step "Download Options"  "pipelines.options.daily_download_opt_auto"
+Run-Step "Download FO (Futures + Options)" "pipelines.fo.daily_download_fo_auto"
 
 # =====================================================
 # PHASE 2 - CLEAN
 # =====================================================
 Run-Step "Clean Equity"   "pipelines.equity.clean_daily_equ"
-Run-Step "Clean Futures"  "pipelines.futures.clean_daily_fut"
-Run-Step "Clean Options"  "pipelines.options.clean_daily_opt"
+Run-Step "Clean FO (Futures + Options)" "pipelines.fo.clean_daily_fo"
 
 # =====================================================
 # PHASE 3 - APPEND TO MASTER
@@ -25,17 +25,14 @@ if str(ROOT) not in sys.path:
 # ==========================================================
 # IMPORTS
 # ==========================================================
+from configs.paths import ML_DIR
 from pipelines.ml.ensemble_blender import ensemble_probability
 from pipelines.ml.trade_decision import decide_trade
 
 # ==========================================================
 # PATHS
 # ==========================================================
-BASE = ROOT
-ML_DIRS = [
-    BASE / "data" / "processed" / "ml",
-    Path(r"H:\NIFTY-LAB-Trial\data\processed\ml"),
-]
+ML_DIRS = [ML_DIR]
 
 candidates = []
 for d in ML_DIRS:
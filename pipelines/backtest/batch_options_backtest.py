@@ -9,6 +9,7 @@ PHASE-16 | BATCH OPTIONS BACKTEST ENGINE (INSTITUTIONAL)
 ✔ No look-ahead bias
 ✔ Capital-compounded equity curve
 ✔ CSV-only (parquet banned to avoid corruption)
+✔ backtest(predictions, returns) importable; CLI reads / writes the CSVs
 """
 
 import sys
@@ -25,26 +26,19 @@ if str(ROOT) not in sys.path:
 # ==================================================
 # IMPORTS
 # ==================================================
-from configs.paths import BASE_DIR
+from configs.paths import BACKTEST_DIR, ML_DIR
 from pipelines.ml.ensemble_blender import ensemble_probability
 from pipelines.ml.trade_decision import decide_trade
 
 # ==================================================
 # PATHS
 # ==================================================
-ML_FILE = BASE_DIR / "data" / "processed" / "ml" / "nifty_ml_prediction.csv"
-RET_FILE = BASE_DIR / "data" / "backtest" / "nifty_daily_returns.csv"
-
-OUT_DIR = BASE_DIR / "data" / "backtest"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+ML_FILE = ML_DIR / "nifty_ml_prediction.csv"
+RET_FILE = BACKTEST_DIR / "nifty_daily_returns.csv"
 
+OUT_DIR = BACKTEST_DIR
 OUT_FILE = OUT_DIR / "nifty_option_pnl_history.csv"
 
-if not ML_FILE.exists():
-    raise FileNotFoundError(f"❌ ML prediction file not found: {ML_FILE}")
-
-print(f"📄 Using ML file: {ML_FILE.name}")
-
 # ==================================================
 # CONFIG
 # ==================================================
@@ -58,97 +52,133 @@ REGIME_PRIOR = {
 }
 
 # ==================================================
-# LOAD ML DATA (CSV ONLY)
+# PREPARE INPUTS
 # ==================================================
-df = pd.read_csv(ML_FILE)
-df.columns = df.columns.str.upper()
+def prepare(pred: pd.DataFrame, ret: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Predictions sorted by DATE with the index return (RET, 0 when
+    returns are missing) alongside.
+    """
+    df = pred.copy()
+    df.columns = df.columns.str.upper()
 
-if "DATE" not in df.columns or "PROB_UP" not in df.columns:
-    raise RuntimeError("❌ ML prediction CSV missing DATE / PROB_UP")
+    if "DATE" not in df.columns or "PROB_UP" not in df.columns:
+        raise RuntimeError("❌ ML prediction CSV missing DATE / PROB_UP")
 
-df["DATE"] = pd.to_datetime(df["DATE"])
-df = df.sort_values("DATE").reset_index(drop=True)
+    df["DATE"] = pd.to_datetime(df["DATE"])
+    df = df.sort_values("DATE").reset_index(drop=True)
 
-# ==================================================
-# LOAD RETURNS (OPTIONAL)
-# ==================================================
-if RET_FILE.exists():
-    ret = pd.read_csv(RET_FILE)
-    ret.columns = ret.columns.str.upper()
-    ret["DATE"] = pd.to_datetime(ret["DATE"])
-    df = df.merge(ret[["DATE", "RET"]], on="DATE", how="left")
-else:
-    df["RET"] = 0.0
+    if ret is not None:
+        ret = ret.copy()
+        ret.columns = ret.columns.str.upper()
+        ret["DATE"] = pd.to_datetime(ret["DATE"])
+        df = df.merge(ret[["DATE", "RET"]], on="DATE", how="left")
+    else:
+        df["RET"] = 0.0
 
-df["RET"] = df["RET"].fillna(0.0)
+    df["RET"] = df["RET"].fillna(0.0)
+    return df
 
 # ==================================================
 # BACKTEST LOOP
 # ==================================================
-capital = START_CAPITAL
-rows = []
-
-for i in range(len(df) - 1):  # no look-ahead
-
-    row = df.iloc[i]
-
-    # -------------------------------
-    # ENSEMBLE (SINGLE PROB SAFE)
-    # -------------------------------
-    probs = [row["PROB_UP"]] * 3
-    scores = [0.5, 0.5, 0.5]
-    regime_weights = [1 / 3] * 3
-
-    ens = ensemble_probability(
-        probs=probs,
-        scores=scores,
-        regime_weights=regime_weights
-    )
-
-    # -------------------------------
-    # DECISION
-    # -------------------------------
-    decision = decide_trade(
-        ensemble_out=ens,
-        capital=capital,
-        volatility=VOLATILITY,
-        regime="TREND",
-        regime_changed_recently=False
-    )
-
-    # -------------------------------
-    # PnL SIMULATION (INDEX RETURN PROXY)
-    # -------------------------------
-    pnl = 0.0
-    ret_val = float(row["RET"])
-
-    if decision.action == "LONG":
-        pnl = decision.position_size * ret_val
-        capital += pnl
-
-    elif decision.action == "SHORT":
-        pnl = -decision.position_size * ret_val
-        capital += pnl
-
-    # -------------------------------
-    # RECORD
-    # -------------------------------
-    rows.append({
-        "DATE": row["DATE"],
-        "ACTION": decision.action,
-        "POSITION_SIZE": decision.position_size,
-        "PROBABILITY": ens["P_adj"],
-        "CONFIDENCE": ens["confidence"],
-        "PNL": pnl,
-        "CAPITAL": capital,
-    })
-
-# ==================================================
-# SAVE
-# ==================================================
-bt = pd.DataFrame(rows)
-bt.to_csv(OUT_FILE, index=False)
-
-print("\n✅ BATCH OPTIONS BACKTEST COMPLETE")
-print(bt.tail(10))
-print(f"\n📁 Saved → {OUT_FILE}")
+def backtest(pred: pd.DataFrame, ret: pd.DataFrame = None,
+             start_capital=START_CAPITAL) -> pd.DataFrame:
+    """
+    Daily decision → position → PnL. One row per day but the last
+    (no look-ahead).
+    """
+    df = prepare(pred, ret)
+
+    capital = start_capital
+    rows = []
+
+    for i in range(len(df) - 1):  # no look-ahead
+
+        row = df.iloc[i]
+
+        # -------------------------------
+        # ENSEMBLE (SINGLE PROB SAFE)
+        # -------------------------------
+        probs = [row["PROB_UP"]] * 3
+        scores = [0.5, 0.5, 0.5]
+        regime_weights = [1 / 3] * 3
+
+        ens = ensemble_probability(
+            probs=probs,
+            scores=scores,
+            regime_weights=regime_weights
+        )
+
+        # -------------------------------
+        # DECISION
+        # -------------------------------
+        decision = decide_trade(
+            ensemble_out=ens,
+            capital=capital,
+            volatility=VOLATILITY,
+            regime="TREND",
+            regime_changed_recently=False
+        )
+
+        # -------------------------------
+        # PnL SIMULATION (INDEX RETURN PROXY)
+        # -------------------------------
+        pnl = 0.0
+        ret_val = float(row["RET"])
+
+        if decision.action == "LONG":
+            pnl = decision.position_size * ret_val
+            capital += pnl
+
+        elif decision.action == "SHORT":
+            pnl = -decision.position_size * ret_val
+            capital += pnl
+
+        # -------------------------------
+        # RECORD
+        # -------------------------------
+        rows.append({
+            "DATE": row["DATE"],
+            "ACTION": decision.action,
+            "POSITION_SIZE": decision.position_size,
+            "PROBABILITY": ens["P_adj"],
+            "CONFIDENCE": ens["confidence"],
+            "PNL": pnl,
+            "CAPITAL": capital,
+        })
+
+    return pd.DataFrame(rows)
+
+
+def run(ml_file=ML_FILE, ret_file=RET_FILE, out_file=OUT_FILE) -> pd.DataFrame:
+    """
+    Stage entry: CSVs in, PnL history CSV out (out_file=None skips).
+    """
+    ml_file, ret_file = Path(ml_file), Path(ret_file)
+    if not ml_file.exists():
+        raise FileNotFoundError(f"❌ ML prediction file not found: {ml_file}")
+
+    print(f"📄 Using ML file: {ml_file.name}")
+    # LOAD ML DATA (CSV ONLY); returns are optional
+    ret = pd.read_csv(ret_file) if ret_file.exists() else None
+    bt = backtest(pd.read_csv(ml_file), ret)
+
+    if out_file is not None:
+        Path(out_file).parent.mkdir(parents=True, exist_ok=True)
+        bt.to_csv(out_file, index=False)
+    return bt
+
+# ==================================================
+# CLI
+# ==================================================
+def main():
+    bt = run()
+
+    print("\n✅ BATCH OPTIONS BACKTEST COMPLETE")
+    print(bt.tail(10))
+    print(f"\n📁 Saved → {OUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,27 +4,34 @@
 """
 NIFTY-LAB | Build NIFTY Daily Returns
 ------------------------------------
-✔ Uses master_equity.csv
+✔ Uses master_equity.parquet (authoritative; CSV mirror may be lazy)
 ✔ Computes next-day returns
 ✔ Backtest-safe (no look-ahead)
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import BACKTEST_DIR, MASTER_EQUITY_PQ
+
 # ==========================================================
 # PATHS
 # ==========================================================
-BASE = Path(r"H:\NIFTY-LAB")
-EQ_FILE = BASE / "data" / "continuous" / "master_equity.csv"
-OUT_FILE = BASE / "data" / "backtest" / "nifty_daily_returns.csv"
+EQ_FILE = MASTER_EQUITY_PQ
+OUT_FILE = BACKTEST_DIR / "nifty_daily_returns.csv"
 
 OUT_FILE.parent.mkdir(parents=True, exist_ok=True)
 
 # ==========================================================
 # LOAD
 # ==========================================================
-df = pd.read_csv(EQ_FILE, parse_dates=["DATE"])
+df = pd.read_parquet(EQ_FILE)
+df["DATE"] = pd.to_datetime(df["DATE"])
 
 # Only NIFTY
 df = df[df["SYMBOL"] == "NIFTY"].copy()
@@ -10,69 +10,89 @@ NIFTY-LAB | EQUITY CURVE ANALYZER (OPTIONS)
 ✔ Max DD
 ✔ Win rate
 ✔ No side effects
+✔ analyze(pnl) importable
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
-# ==================================================
-# PATHS
-# ==================================================
 ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-PNL_FILE = ROOT / "data" / "backtest" / "nifty_option_pnl_history.csv"
-OUT_DIR  = ROOT / "data" / "analysis"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
-EQUITY_CURVE_FILE = OUT_DIR / "nifty_equity_curve.csv"
-DD_FILE           = OUT_DIR / "nifty_drawdown_curve.csv"
-
-# ==================================================
-# LOAD
-# ==================================================
-if not PNL_FILE.exists():
-    raise FileNotFoundError(f"❌ PnL file not found: {PNL_FILE}")
-
-df = pd.read_csv(PNL_FILE, parse_dates=["DATE"])
+from configs.paths import ANALYSIS_DIR, BACKTEST_DIR
 
 # ==================================================
-# EQUITY CURVE
+# PATHS
 # ==================================================
-df = df.sort_values("DATE").reset_index(drop=True)
+PNL_FILE = BACKTEST_DIR / "nifty_option_pnl_history.csv"
+OUT_DIR  = ANALYSIS_DIR
 
-df["EQUITY"] = df["CAPITAL"]
-df["RET"] = df["EQUITY"].pct_change().fillna(0)
+EQUITY_CURVE_FILE = OUT_DIR / "nifty_equity_curve.csv"
+DD_FILE           = OUT_DIR / "nifty_drawdown_curve.csv"
 
 # ==================================================
-# DRAWDOWN
+# ANALYSE
 # ==================================================
-df["PEAK"] = df["EQUITY"].cummax()
-df["DRAWDOWN"] = (df["EQUITY"] - df["PEAK"]) / df["PEAK"]
-
-max_dd = df["DRAWDOWN"].min()
+def analyze(pnl: pd.DataFrame):
+    """
+    (curve, stats): curve has DATE / EQUITY / RET / PEAK / DRAWDOWN,
+    stats holds total_pnl, max_dd, win_rate, trades.
+    """
+    # EQUITY CURVE
+    df = pnl.sort_values("DATE").reset_index(drop=True)
+
+    df["EQUITY"] = df["CAPITAL"]
+    df["RET"] = df["EQUITY"].pct_change().fillna(0)
+
+    # DRAWDOWN
+    df["PEAK"] = df["EQUITY"].cummax()
+    df["DRAWDOWN"] = (df["EQUITY"] - df["PEAK"]) / df["PEAK"]
+
+    # STATS
+    trades = df[df["ACTION"] != "HOLD"]
+
+    stats = {
+        "total_pnl": trades["PNL"].sum(),
+        "max_dd": df["DRAWDOWN"].min(),
+        "win_rate": (trades["PNL"] > 0).mean() * 100 if len(trades) else 0,
+        "trades": len(trades),
+    }
+    return df, stats
+
+
+def run(pnl_file=PNL_FILE, curve_file=EQUITY_CURVE_FILE, dd_file=DD_FILE):
+    """
+    Stage entry: PnL history in, equity / drawdown curves out
+    (curve_file=None skips saving). Returns (curve, stats).
+    """
+    if not Path(pnl_file).exists():
+        raise FileNotFoundError(f"❌ PnL file not found: {pnl_file}")
+
+    df, stats = analyze(pd.read_csv(pnl_file, parse_dates=["DATE"]))
+
+    if curve_file is not None:
+        Path(curve_file).parent.mkdir(parents=True, exist_ok=True)
+        df[["DATE", "EQUITY"]].to_csv(curve_file, index=False)
+        df[["DATE", "DRAWDOWN"]].to_csv(dd_file, index=False)
+    return df, stats
 
 # ==================================================
-# STATS
+# CLI
 # ==================================================
-trades = df[df["ACTION"] != "HOLD"]
+def main():
+    _, stats = run()
 
-win_rate = (trades["PNL"] > 0).mean() * 100 if len(trades) else 0
-total_pnl = trades["PNL"].sum()
+    print("\n📈 EQUITY CURVE ANALYSIS COMPLETE")
+    print(f"📁 Equity curve  : {EQUITY_CURVE_FILE}")
+    print(f"📁 Drawdown curve: {DD_FILE}")
+    print(f"💰 Total PnL     : {stats['total_pnl']:,.2f}")
+    print(f"📉 Max Drawdown  : {stats['max_dd']:.2%}")
+    print(f"🎯 Win Rate      : {stats['win_rate']:.2f}%")
+    print(f"🔢 Trades        : {stats['trades']}")
 
-# ==================================================
-# SAVE OUTPUTS
-# ==================================================
-df[["DATE", "EQUITY"]].to_csv(EQUITY_CURVE_FILE, index=False)
-df[["DATE", "DRAWDOWN"]].to_csv(DD_FILE, index=False)
 
-# ==================================================
-# SUMMARY
-# ==================================================
-print("\n📈 EQUITY CURVE ANALYSIS COMPLETE")
-print(f"📁 Equity curve  : {EQUITY_CURVE_FILE}")
-print(f"📁 Drawdown curve: {DD_FILE}")
-print(f"💰 Total PnL     : {total_pnl:,.2f}")
-print(f"📉 Max Drawdown  : {max_dd:.2%}")
-print(f"🎯 Win Rate      : {win_rate:.2f}%")
-print(f"🔢 Trades        : {len(trades)}")
+if __name__ == "__main__":
+    main()
@@ -5,34 +5,43 @@
 NIFTY-LAB | APPEND DAILY EQUITY TO MASTER (SELF-HEALING)
 
 ✔ Append-only
-✔ Recovers deleted rows from daily history
-✔ Master safety lock
+✔ Recovers deleted rows from daily history (ledger vs manifest)
+✔ Master safety lock (from manifest, no data read)
+✔ Ledger: only new / changed / healing daily files are opened
 ✔ Date-safe
-✔ Deduplicated
-✔ Parquet + CSV
+✔ Deduplicated (sorted-merge upsert)
+✔ Parquet (+ CSV mirror per configs/outputs.py)
+✔ Master lock + atomic replace (safe next to other jobs)
+✔ In a DAG run the master is handed on in memory (storage/bus.py);
+  the file is written before the master lock is released
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import CONT_DIR, MASTER_EQUITY_PQ, PROC_EQ_DAILY
+from pipelines.storage import atomic, bus, ledger, manifest, outputs, versions
+from pipelines.storage.upsert import sorted_upsert
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-DAILY_DIR   = BASE / "data" / "processed" / "daily" / "equity"
-MASTER_PQ  = BASE / "data" / "continuous" / "master_equity.parquet"
-MASTER_CSV = BASE / "data" / "continuous" / "master_equity.csv"
+DAILY_DIR   = PROC_EQ_DAILY
+MASTER_PQ  = MASTER_EQUITY_PQ
+MASTER_CSV = CONT_DIR / "master_equity.csv"
 
 # --------------------------------------------------
 # MAIN
 # --------------------------------------------------
-def main():
+def update_master():
     print("NIFTY-LAB | APPEND DAILY EQUITY TO MASTER")
     print("-" * 60)
 
-    # ------------------------------
-    # Load ALL daily equity (source of truth)
-    # ------------------------------
     daily_files = sorted(DAILY_DIR.glob("EQUITY_NIFTY_*.parquet"))
     if not daily_files:
         print("No daily equity files found — skipping")
@@ -40,29 +49,48 @@ def main():
 
     print(f"Daily files found : {len(daily_files)}")
 
-    daily_frames = []
-    for f in daily_files:
-        df = pd.read_parquet(f)
-        df["DATE"] = pd.to_datetime(df["DATE"])
-        daily_frames.append(df)
-
-    daily_all = pd.concat(daily_frames, ignore_index=True)
-
     # ------------------------------
-    # Load master (with SAFETY LOCK)
+    # Master state from manifest (with SAFETY LOCK)
     # ------------------------------
-    if MASTER_PQ.exists():
-        master = pd.read_parquet(MASTER_PQ)
-        master["DATE"] = pd.to_datetime(master["DATE"])
+    m = manifest.ensure(MASTER_PQ, "DATE")
 
-        print(f"Loaded master rows : {len(master):,}")
+    if m is not None:
+        print(f"Master rows        : {m['rows']:,}")
 
         # 🔒 CRITICAL SAFETY LOCK
-        if len(master) < 100:
+        if m["rows"] < 100:
             raise RuntimeError(
                 "MASTER TOO SMALL — POSSIBLE CORRUPTION. "
                 "REFUSING TO MODIFY MASTER EQUITY."
             )
+
+    # ------------------------------
+    # Daily equity is the source of truth: open only files the ledger
+    # has not seen, that changed, or whose dates the master lost
+    # ------------------------------
+    led = ledger.Ledger(MASTER_PQ)
+    todo = led.pending(daily_files, m)
+    print(f"Files to open     : {len(todo)} (ledger skipped {len(daily_files) - len(todo)})")
+
+    if not todo:
+        print(f"Master up to date  : {m['max_date']} — nothing to write")
+        return
+
+    daily_frames = []
+    seen = []
+    for f, status in todo:
+        df = pd.read_parquet(f)
+        df["DATE"] = pd.to_datetime(df["DATE"])
+        daily_frames.append(df)
+        seen.append((f, len(df), ledger.file_dates(df, "DATE")))
+        if status == ledger.HEAL:
+            print(f"  Healing from     : {f.name}")
+
+    daily_all = pd.concat(daily_frames, ignore_index=True)
+
+    if m is not None:
+        master = bus.read_parquet(MASTER_PQ)  # warm copy in watch mode
+        master["DATE"] = pd.to_datetime(master["DATE"])
     else:
         master = pd.DataFrame()
         print("No master found — creating new")
@@ -70,18 +98,28 @@ def main():
     # ------------------------------
     # SELF-HEALING MERGE
     # ------------------------------
-    combined = (
-        pd.concat([master, daily_all], ignore_index=True)
-          .drop_duplicates(subset=["DATE", "SYMBOL"], keep="last")
-          .sort_values("DATE")
-          .reset_index(drop=True)
+    combined, stats = sorted_upsert(
+        master,
+        daily_all,
+        keys=["DATE", "SYMBOL"],
+        sort_by=["DATE", "SYMBOL"],
     )
+    print(f"Inserted / updated : {stats['inserted']:,} / {stats['updated']:,}")
 
     # ------------------------------
     # SAVE
     # ------------------------------
-    combined.to_parquet(MASTER_PQ, index=False)
-    combined.to_csv(MASTER_CSV, index=False)
+    versions.snapshot(MASTER_PQ, note="append_master_equ")
+
+    def after_write():
+        # Mirror, manifest and ledger only once the master has landed
+        outputs.mirror(combined, MASTER_CSV, MASTER_PQ)
+        manifest.record_table(MASTER_PQ, combined, "DATE")
+        for f, rows, dates in seen:
+            led.record(f, rows, dates)
+        led.save()
+
+    bus.write_parquet(combined, MASTER_PQ, then=after_write, lock=True, also=[MASTER_CSV])
 
     print("-" * 60)
     print("MASTER EQUITY UPDATED (SELF-HEALING)")
@@ -90,6 +128,10 @@ def main():
     print(f"To   : {combined['DATE'].max().date()}")
     print("DONE")
 
+def main():
+    with atomic.master_lock(MASTER_PQ):
+        update_master()
+
 # --------------------------------------------------
 if __name__ == "__main__":
     main()
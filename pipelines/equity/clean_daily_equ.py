@@ -6,20 +6,28 @@ NIFTY-LAB | CLEAN DAILY EQUITY (AUTO | NIFTY INDEX)
 
 ✔ Auto-picks latest raw equity file
 ✔ Safe on holidays / NSE delays
-✔ Parquet + CSV
+✔ Parquet (+ CSV mirror per configs/outputs.py)
 ✔ NEVER breaks scheduler
+✔ clean_day(date, raw_file) for one given day (watch mode)
 """
 
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import PROC_EQ_DAILY, RAW_EQUITY_DIR
+from pipelines.storage import outputs
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-RAW_DIR = BASE / "data" / "raw" / "equity"
-OUT_DIR = BASE / "data" / "processed" / "daily" / "equity"
+RAW_DIR = RAW_EQUITY_DIR
+OUT_DIR = PROC_EQ_DAILY
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # --------------------------------------------------
@@ -35,24 +43,19 @@ def find_latest_raw(max_lookback=7):
     return None, None
 
 # --------------------------------------------------
-# MAIN
+# CLEAN ONE DAY
 # --------------------------------------------------
-def main():
-    print("NIFTY-LAB | CLEAN DAILY EQUITY (AUTO)")
-    print("-" * 60)
-
-    trade_date, raw_file = find_latest_raw()
-
-    if raw_file is None:
-        print("No raw equity file found in recent days — skipping clean")
-        return  #  SOFT EXIT
-
+def clean_day(trade_date, raw_file):
+    """
+    Clean one raw equity file into EQUITY_NIFTY_<date>.parquet.
+    Returns the parquet path, or None when it already existed.
+    """
     out_pq = OUT_DIR / f"EQUITY_NIFTY_{trade_date}.parquet"
     out_csv = OUT_DIR / f"EQUITY_NIFTY_{trade_date}.csv"
 
     if out_pq.exists():
         print(f"Already cleaned → {out_pq.name}")
-        return  #  SOFT EXIT
+        return None
 
     print(f"Using raw file : {raw_file.name}")
     print(f"Trade Date    : {trade_date}")
@@ -76,11 +79,28 @@ def main():
           .drop_duplicates(subset=["DATE", "SYMBOL"])
     )
 
-    df.to_parquet(out_pq, index=False)
-    df.to_csv(out_csv, index=False)
+    outputs.write(df, out_pq, out_csv)
 
     print(f"Saved : {out_pq.name}")
     print(f"Rows  : {len(df)}")
+    return out_pq
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+def main():
+    print("NIFTY-LAB | CLEAN DAILY EQUITY (AUTO)")
+    print("-" * 60)
+
+    trade_date, raw_file = find_latest_raw()
+
+    if raw_file is None:
+        print("No raw equity file found in recent days — skipping clean")
+        return  #  SOFT EXIT
+
+    if clean_day(trade_date, raw_file) is None:
+        return  #  SOFT EXIT
+
     print(" DAILY EQUITY CLEAN COMPLETE")
 
 # --------------------------------------------------
@@ -7,17 +7,22 @@ Input  : data/raw/equity/equity_YYYY-MM-DD.csv
 Output : data/processed/daily/equity/clean_equity_YYYY-MM-DD.parquet
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import PROC_EQ_DAILY, RAW_EQUITY_DIR
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-
-RAW_DIR = BASE / "data" / "raw" / "equity"
-OUT_DIR = BASE / "data" / "processed" / "daily" / "equity"
+RAW_DIR = RAW_EQUITY_DIR
+OUT_DIR = PROC_EQ_DAILY
 
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
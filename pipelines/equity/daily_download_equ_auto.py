@@ -10,17 +10,26 @@ NIFTY-LAB | NSE NIFTY INDEX EOD (ULTRA ROBUST)
 ✔ Scheduler safe
 """
 
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 import pandas as pd
 import requests
 from io import StringIO
 
+# --------------------------------------------------
+# PROJECT ROOT
+# --------------------------------------------------
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import RAW_EQUITY_DIR
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-RAW_DIR = BASE / "data" / "raw" / "equity"
+RAW_DIR = RAW_EQUITY_DIR
 RAW_DIR.mkdir(parents=True, exist_ok=True)
 
 # --------------------------------------------------
@@ -83,6 +92,40 @@ def find_price_cols(df):
     return o, h, l, c
 
 
+def parse_index_csv(text: str, trade_date) -> pd.DataFrame:
+    """
+    NIFTY 50 EOD row from an ind_close_all CSV, in raw equity layout.
+    """
+    df = pd.read_csv(StringIO(text))
+    df.columns = df.columns.str.strip()
+
+    idx_col = find_index_col(df)
+    o_col, h_col, l_col, c_col = find_price_cols(df)
+
+    df[idx_col] = (
+        df[idx_col]
+        .astype(str)
+        .str.upper()
+        .str.strip()
+    )
+
+    nifty = df[df[idx_col].str.contains("NIFTY 50", regex=False)]
+    if nifty.empty:
+        raise RuntimeError("NIFTY 50 row not found")
+
+    r0 = nifty.iloc[0]
+
+    return pd.DataFrame({
+        "DATE":   [trade_date],
+        "OPEN":   [r0[o_col]],
+        "HIGH":   [r0[h_col]],
+        "LOW":    [r0[l_col]],
+        "CLOSE":  [r0[c_col]],
+        "VOLUME": [0],
+        "SYMBOL": ["NIFTY"],
+    })
+
+
 # --------------------------------------------------
 # MAIN
 # --------------------------------------------------
@@ -106,34 +149,7 @@ def main():
             if r.status_code != 200:
                 raise RuntimeError("Index file not available")
 
-            df = pd.read_csv(StringIO(r.text))
-            df.columns = df.columns.str.strip()
-
-            idx_col = find_index_col(df)
-            o_col, h_col, l_col, c_col = find_price_cols(df)
-
-            df[idx_col] = (
-                df[idx_col]
-                .astype(str)
-                .str.upper()
-                .str.strip()
-            )
-
-            nifty = df[df[idx_col].str.contains("NIFTY 50", regex=False)]
-            if nifty.empty:
-                raise RuntimeError("NIFTY 50 row not found")
-
-            r0 = nifty.iloc[0]
-
-            out = pd.DataFrame({
-                "DATE":   [trade_date],
-                "OPEN":   [r0[o_col]],
-                "HIGH":   [r0[h_col]],
-                "LOW":    [r0[l_col]],
-                "CLOSE":  [r0[c_col]],
-                "VOLUME": [0],
-                "SYMBOL": ["NIFTY"],
-            })
+            out = parse_index_csv(r.text, trade_date)
 
             out.to_csv(out_file, index=False)
 
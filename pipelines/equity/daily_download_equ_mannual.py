@@ -6,17 +6,22 @@ NIFTY-LAB | DAILY NIFTY50 EQUITY DOWNLOADER
 RAW DATA ONLY — DO NOT CLEAN HERE
 """
 
+import sys
 from pathlib import Path
 from datetime import datetime
 import yfinance as yf
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import RAW_EQUITY_DIR
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-
-OUT_DIR = BASE / "data" / "raw" / "equity"
+OUT_DIR = RAW_EQUITY_DIR
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 TICKER = "^NSEI"
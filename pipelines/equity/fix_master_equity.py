@@ -6,14 +6,21 @@ NIFTY-LAB | FIX MASTER EQUITY (HISTORICAL NORMALIZATION)
 RUN ONCE ONLY
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
-BASE = Path(r"H:\NIFTY-LAB")
-MASTER_PQ = BASE / "data" / "continuous" / "master_equity.parquet"
-MASTER_CSV = BASE / "data" / "continuous" / "master_equity.csv"
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-def main():
+from configs.paths import CONT_DIR, MASTER_EQUITY_PQ
+from pipelines.storage import atomic, manifest, outputs, versions
+
+MASTER_PQ = MASTER_EQUITY_PQ
+MASTER_CSV = CONT_DIR / "master_equity.csv"
+
+def update_master():
     print("🛠️ FIXING MASTER EQUITY (HISTORICAL PATCH)")
     print("-" * 60)
 
@@ -49,8 +56,10 @@ def main():
         .reset_index(drop=True)
     )
 
-    df.to_parquet(MASTER_PQ, index=False)
-    df.to_csv(MASTER_CSV, index=False)
+    versions.snapshot(MASTER_PQ, note="fix_master_equity")
+    atomic.write_parquet(df, MASTER_PQ)
+    outputs.mirror(df, MASTER_CSV, MASTER_PQ)
+    manifest.record_table(MASTER_PQ, df, "DATE")
 
     print("✅ MASTER EQUITY FIXED")
     print(f"📊 Rows   : {len(df):,}")
@@ -59,5 +68,9 @@ def main():
     print(f"💾 Saved  : {MASTER_PQ}")
     print("🎉 DONE ✅ (RUN ONCE ONLY)")
 
+def main():
+    with atomic.master_lock(MASTER_PQ):
+        update_master()
+
 if __name__ == "__main__":
     main()
@@ -8,13 +8,19 @@ NIFTY-LAB | DAILY EQUITY SANITY CHECK (PROD SAFE)
 ✔ NEVER breaks pipeline
 """
 
+import sys
 from pathlib import Path
 from datetime import date
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import PROC_EQ_DAILY
+
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-EQ_DAILY_DIR = BASE / "data" / "processed" / "daily" / "equity"
+EQ_DAILY_DIR = PROC_EQ_DAILY
 # --------------------------------------------------
 
 def main():
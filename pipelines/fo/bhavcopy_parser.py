@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | FO BHAVCOPY PARSER (SINGLE PASS)
+
+✔ Reads each fo_YYYY-MM-DD.zip exactly once
+✔ Finds the INSTRUMENT header at byte level (no full decode)
+✔ Splits FUTIDX / OPTIDX / FUTSTK / OPTSTK in one pass
+✔ NSE column-name safe (*, %, spaces)
+✔ Shared by futures + options cleaning
+"""
+
+import io
+import re
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+INSTRUMENTS = ("FUTIDX", "OPTIDX", "FUTSTK", "OPTSTK")
+
+EXPIRY_ALIASES = ("EXP_DATE", "EXPIRY", "EXPIRY_DATE", "EXP_DT")
+
+# Header line may carry a UTF-8 BOM and leading blanks
+HEADER_RE = re.compile(rb"(?m)^(?:\xef\xbb\xbf)?[ \t]*INSTRUMENT")
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+def find_header_offset(raw: bytes):
+    """
+    Byte offset of the INSTRUMENT header line, or None.
+    Junk preamble lines above the header are skipped without decoding.
+    """
+    m = HEADER_RE.search(raw)
+    return m.start() if m else None
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    NSE sometimes uses special chars like *, %, ₹ in column names.
+    Strips everything except A-Z, 0-9 and _.
+    """
+    df.columns = (
+        df.columns.astype(str)
+        .str.strip()
+        .str.upper()
+        .str.replace(" ", "_")
+        .str.replace(r"[^A-Z0-9_]", "", regex=True)
+    )
+    return df
+
+
+def read_member(raw: bytes):
+    """
+    Parse one CSV member starting at its INSTRUMENT header.
+    """
+    start = find_header_offset(raw)
+    if start is None:
+        return None
+
+    buf = io.BytesIO(raw)
+    buf.seek(start)
+
+    df = pd.read_csv(buf, encoding_errors="ignore")
+    if df.empty:
+        return None
+
+    df = normalize_columns(df)
+
+    if not {"INSTRUMENT", "SYMBOL"}.issubset(df.columns):
+        return None
+
+    for c in EXPIRY_ALIASES:
+        if c in df.columns:
+            df = df.rename(columns={c: "EXP_DATE"})
+            break
+    else:
+        return None
+
+    df["INSTRUMENT"] = df["INSTRUMENT"].astype(str).str.strip().str.upper()
+    df["SYMBOL"] = df["SYMBOL"].astype(str).str.strip().str.upper()
+    return df
+
+
+# --------------------------------------------------
+# PUBLIC API
+# --------------------------------------------------
+def parse_fo_zip(zip_file: Path, trade_date=None) -> dict:
+    """
+    Parse an NSE FO bhavcopy ZIP in a single pass.
+
+    Returns:
+        {instrument: DataFrame} for FUTIDX, OPTIDX, FUTSTK, OPTSTK.
+        Instruments absent from the ZIP map to an empty DataFrame.
+    """
+    parts = {k: [] for k in INSTRUMENTS}
+
+    with zipfile.ZipFile(zip_file) as z:
+        for name in z.namelist():
+            if not name.lower().endswith(".csv"):
+                continue
+
+            df = read_member(z.read(name))
+            if df is None:
+                continue
+
+            for inst, grp in df.groupby("INSTRUMENT", sort=False):
+                if inst in parts:
+                    parts[inst].append(grp)
+
+    out = {}
+    for inst, frames in parts.items():
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+        else:
+            df = pd.DataFrame(columns=["INSTRUMENT", "SYMBOL", "EXP_DATE"])
+
+        if trade_date is not None:
+            df["TRADE_DATE"] = pd.Timestamp(trade_date)
+
+        out[inst] = df
+
+    return out
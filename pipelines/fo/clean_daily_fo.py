@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | CLEAN DAILY FO (FUTURES + OPTIONS | ONE PASS)
+
+✔ Opens each FO ZIP once
+✔ Futures + options cleaned from the same parse
+✔ Latest day (default), one --date, or --all for history
+✔ Skips days already cleaned
+✔ NEVER breaks scheduler
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# --------------------------------------------------
+# PROJECT ROOT
+# --------------------------------------------------
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import PROC_FUT_DAILY, PROC_OPT_DAILY
+from pipelines.fo import raw_store
+from pipelines.fo.bhavcopy_parser import parse_fo_zip
+from pipelines.futures.clean_daily_fut import clean_futures
+from pipelines.options.clean_daily_opt import clean_options
+from pipelines.storage import outputs
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+def out_paths(trade_date):
+    return (
+        PROC_FUT_DAILY / f"FUT_NIFTY_{trade_date}.parquet",
+        PROC_OPT_DAILY / f"OPTIONS_NIFTY_{trade_date}.parquet",
+    )
+
+
+def clean_day(trade_date, zip_file):
+    """
+    Parse one FO ZIP and write whichever daily outputs are missing.
+    """
+    fut_pq, opt_pq = out_paths(trade_date)
+
+    if fut_pq.exists() and opt_pq.exists():
+        print(f"Already cleaned → {trade_date}")
+        return
+
+    print(f"Trade Date  : {trade_date}")
+    print(f"Using FO ZIP : {zip_file.name}")
+
+    frames = parse_fo_zip(zip_file, trade_date)
+
+    jobs = [
+        ("FUTURES", fut_pq, clean_futures),
+        ("OPTIONS", opt_pq, clean_options),
+    ]
+
+    for label, out_pq, cleaner in jobs:
+        if out_pq.exists():
+            continue
+
+        df = cleaner(frames, trade_date)
+        if df is None:
+            print(f"  {label:<8}: no valid NIFTY rows — skipped")
+            continue
+
+        outputs.write(df, out_pq)
+        print(f"  {label:<8}: {out_pq.name} | rows: {len(df):,}")
+
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+def main(trade_date=None, all_dates=False):
+    print("NIFTY-LAB | CLEAN DAILY FO (FUTURES + OPTIONS)")
+    print("-" * 60)
+
+    zips = raw_store.list_days()
+    if not zips:
+        print("No FO ZIP found — skipping FO clean")
+        return  # SOFT EXIT
+
+    if all_dates:
+        todo = zips
+    elif trade_date is not None:
+        if trade_date not in zips:
+            print(f"No FO ZIP for {trade_date} — skipping")
+            return
+        todo = {trade_date: zips[trade_date]}
+    else:
+        last = max(zips)
+        todo = {last: zips[last]}
+
+    for d, f in todo.items():
+        clean_day(d, f)
+
+    print(" DAILY FO CLEAN COMPLETE")
+
+
+# --------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Clean NSE FO bhavcopy into daily futures + options"
+    )
+    parser.add_argument("--date", help="Trade date YYYY-MM-DD")
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Clean every FO ZIP on disk (history backfill)",
+    )
+    args = parser.parse_args()
+
+    d = datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else None
+
+    try:
+        main(trade_date=d, all_dates=args.all)
+    except Exception as e:
+        print(f"Non-fatal FO clean error: {e}")
+        exit(0)
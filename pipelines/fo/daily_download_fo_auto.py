@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | DAILY FO BHAVCOPY DOWNLOAD (FUTURES + OPTIONS)
+AUTO MODE — SAFE FOR SCHEDULER
+
+✔ Fetches each day ONCE into the shared raw FO store
+✔ Looks back up to 7 days
+✔ Weekend-aware
+✔ Logs when the day is already stored
+✔ NEVER breaks pipeline
+✔ RAW ONLY — no cleaning here
+
+Downloads:
+  foDDMMYYYY.zip from NSE
+
+Saves:
+  data/raw/fo/objects/<sha256>.zip  (+ manifest.json entry)
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import requests
+
+# --------------------------------------------------
+# PROJECT ROOT
+# --------------------------------------------------
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pipelines.fo import raw_store
+
+# --------------------------------------------------
+# NSE CONFIG
+# --------------------------------------------------
+BASE_URL = "https://nsearchives.nseindia.com/archives/fo/mkt/fo{date}.zip"
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/121.0.0.0 Safari/537.36"
+    ),
+    "Accept": "*/*",
+    "Referer": "https://www.nseindia.com/",
+}
+
+MIN_ZIP_BYTES = 50_000
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+def fo_url(d, base_url=BASE_URL):
+    return base_url.format(date=d.strftime("%d%m%Y"))
+
+
+def fetch_fo_zip(d, session=None, base_url=BASE_URL, timeout=20):
+    """
+    Download one day's FO ZIP into the raw store.
+
+    Returns the stored path, or None when NSE has no file for the day.
+    Raises requests.RequestException on network errors.
+    """
+    url = fo_url(d, base_url)
+    get = session.get if session is not None else requests.get
+
+    r = get(url, headers=HEADERS, timeout=timeout)
+
+    if r.status_code == 200 and len(r.content) > MIN_ZIP_BYTES:
+        return raw_store.put(d, r.content, source=url)
+
+    return None
+
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+def main(trade_date):
+    print("NIFTY-LAB | DAILY FO DOWNLOAD (AUTO)")
+    print("-" * 60)
+
+    for i in range(7):  # look back up to 7 days
+        d = trade_date - timedelta(days=i)
+
+        print(f"Trying FO bhavcopy for {d}")
+
+        # Weekend skip
+        if d.weekday() >= 5:
+            print("   Weekend — skipped")
+            continue
+
+        # IMPORTANT: explicit log if already stored
+        if raw_store.has(d):
+            print(f" Already stored → {d}")
+            return  # SOFT EXIT (scheduler-safe)
+
+        try:
+            path = fetch_fo_zip(d)
+
+            if path is not None:
+                e = raw_store.entry(d)
+                print(f" Downloaded & stored → {path.name}")
+                print(f" Size : {e['size']:,} bytes | sha256 {e['sha256'][:12]}")
+                return
+            else:
+                print("   Not available")
+
+        except requests.RequestException as e:
+            print(f" Network error : {e}")
+
+    #  NEVER FAIL PIPELINE
+    print("No FO bhavcopy found in recent days — skipping safely")
+    return
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Download daily NSE FO bhavcopy (futures + options)"
+    )
+    parser.add_argument(
+        "--date",
+        help="Trade date YYYY-MM-DD (default: today)",
+        required=False,
+    )
+
+    args = parser.parse_args()
+
+    trade_date = (
+        datetime.strptime(args.date, "%Y-%m-%d").date()
+        if args.date
+        else datetime.today().date()
+    )
+
+    main(trade_date)
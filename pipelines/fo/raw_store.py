@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | RAW FO STORE (CONTENT-ADDRESSED)
+
+✔ One copy of each fo bhavcopy, shared by futures + options
+✔ Keyed by trade date → SHA-256 object
+✔ Manifest: size, sha256, fetched_at, source
+✔ Adopts legacy data/raw/{futures,options}/fo_*.zip on first read
+  (list_days: the whole batch in one manifest update)
+✔ Manifest read-modify-write under its master lock (threads + processes)
+
+Layout:
+  data/raw/fo/manifest.json
+  data/raw/fo/objects/ab/abcdef....zip
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# --------------------------------------------------
+# PROJECT ROOT
+# --------------------------------------------------
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import (
+    RAW_FO_DIR,
+    RAW_FO_OBJECTS,
+    RAW_FO_MANIFEST,
+    RAW_FUTURES_DIR,
+    RAW_OPTIONS_DIR,
+)
+from pipelines.storage import atomic
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+LEGACY_DIRS = [RAW_FUTURES_DIR, RAW_OPTIONS_DIR]
+
+_LOCK = threading.RLock()
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+def _day(d) -> str:
+    if isinstance(d, str):
+        return d
+    if isinstance(d, datetime):
+        d = d.date()
+    return d.isoformat()
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def object_path(sha: str) -> Path:
+    return RAW_FO_OBJECTS / sha[:2] / f"{sha}.zip"
+
+
+def load_manifest() -> dict:
+    if not RAW_FO_MANIFEST.exists():
+        return {"days": {}}
+    return json.loads(RAW_FO_MANIFEST.read_text(encoding="utf-8"))
+
+
+def _update_manifest(records: dict):
+    """
+    Merge {day: record} into the manifest: one load, one write, under
+    the manifest lock (threads queue on _LOCK, processes on the file).
+    """
+    if not records:
+        return
+    with _LOCK, atomic.master_lock(RAW_FO_MANIFEST, quiet=True):
+        manifest = load_manifest()
+        manifest["days"].update(records)
+        atomic.write_text(RAW_FO_MANIFEST, json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def _write_object(data: bytes, sha: str) -> Path:
+    out = object_path(sha)
+    if out.exists() and out.stat().st_size == len(data):
+        return out  # identical content already stored
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(f".tmp{threading.get_ident()}")
+    tmp.write_bytes(data)
+    os.replace(tmp, out)
+    return out
+
+
+# --------------------------------------------------
+# PUBLIC API
+# --------------------------------------------------
+def _store(data: bytes, source: str = None, fetched_at: str = None):
+    """
+    Write the object; (path, manifest record). The manifest is not touched.
+    """
+    sha = sha256_bytes(data)
+    path = _write_object(data, sha)
+
+    rec = {
+        "sha256": sha,
+        "size": len(data),
+        "fetched_at": fetched_at or datetime.now().isoformat(timespec="seconds"),
+        "source": source,
+        "object": path.relative_to(RAW_FO_DIR).as_posix(),
+    }
+    return path, rec
+
+
+def put(trade_date, data: bytes, source: str = None, fetched_at: str = None) -> Path:
+    """
+    Store one day's FO ZIP. Identical bytes are stored once.
+    """
+    path, rec = _store(data, source, fetched_at)
+    _update_manifest({_day(trade_date): rec})
+    return path
+
+
+def _store_legacy(day: str):
+    """
+    Object for fo_YYYY-MM-DD.zip from the old per-consumer raw dirs;
+    (path, record), or None when there is no such file.
+    """
+    for d in LEGACY_DIRS:
+        f = d / f"fo_{day}.zip"
+        if f.exists():
+            fetched = datetime.fromtimestamp(f.stat().st_mtime)
+            return _store(
+                f.read_bytes(),
+                source=f"legacy:{f.parent.name}/{f.name}",
+                fetched_at=fetched.isoformat(timespec="seconds"),
+            )
+    return None
+
+
+def _adopt_legacy(day: str):
+    """
+    Import one legacy zip into the store.
+    """
+    stored = _store_legacy(day)
+    if stored is None:
+        return None
+    path, rec = stored
+    _update_manifest({day: rec})
+    return path
+
+
+def _stored(day: str, manifest: dict):
+    """
+    Path of the day's object per the manifest, None when absent.
+    """
+    rec = manifest["days"].get(day)
+    if rec:
+        path = RAW_FO_DIR / rec["object"]
+        if path.exists():
+            return path
+    return None
+
+
+def get(trade_date, manifest=None):
+    """
+    Path to the stored ZIP for trade_date, or None.
+    """
+    day = _day(trade_date)
+    path = _stored(day, manifest or load_manifest())
+    return path if path is not None else _adopt_legacy(day)
+
+
+def has(trade_date) -> bool:
+    return get(trade_date) is not None
+
+
+def entry(trade_date):
+    """
+    Manifest record for trade_date (size, sha256, fetched_at, source).
+    """
+    return load_manifest()["days"].get(_day(trade_date))
+
+
+def list_days() -> dict:
+    """
+    {trade_date: zip_path} for every stored day, legacy files included
+    (adopted together: one manifest write for the whole batch).
+    """
+    manifest = load_manifest()
+    days = set(manifest["days"])
+
+    for d in LEGACY_DIRS:
+        for f in d.glob("fo_*.zip"):
+            m = re.search(r"(\d{4}-\d{2}-\d{2})", f.name)
+            if m:
+                days.add(m.group(1))
+
+    out, adopted = {}, {}
+    for day in sorted(days):
+        path = _stored(day, manifest)
+        if path is None:
+            stored = _store_legacy(day)
+            if stored is None:
+                continue
+            path, adopted[day] = stored
+        out[date.fromisoformat(day)] = path
+
+    _update_manifest(adopted)
+    return out
+
+
+def latest(max_lookback=7, today=None):
+    """
+    (trade_date, zip_path) of the newest day within max_lookback, else (None, None).
+    """
+    today = today or datetime.today().date()
+    for i in range(max_lookback):
+        d = today - timedelta(days=i)
+        path = get(d)
+        if path is not None:
+            return d, path
+    return None, None
+
+
+def verify(trade_date) -> bool:
+    """
+    Re-hash the stored object and compare with the manifest.
+    """
+    e = entry(trade_date)
+    if not e:
+        return False
+    path = RAW_FO_DIR / e["object"]
+    return path.exists() and sha256_file(path) == e["sha256"]
@@ -10,19 +10,27 @@ NIFTY-LAB | APPEND HISTORICAL FUTURES TO MASTER
 ✔ OI → OPEN_INTEREST normalized
 ✔ Numeric sanity enforced
 ✔ Deduplicated
+✔ Master lock + atomic replace (safe next to other jobs)
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import CONT_DIR, MASTER_FUTURES_PQ, RAW_HIST_DIR
+from pipelines.storage import atomic, manifest, outputs, versions
+from pipelines.storage.upsert import sorted_upsert
+
 # ==================================================
 # PATHS
 # ==================================================
-BASE = Path(r"H:\NIFTY-LAB")
-
-HIST_PQ   = BASE / "data" / "raw" / "historical" / "futures" / "nifty50_future_hist_2016.parquet"
-MASTER_PQ  = BASE / "data" / "continuous" / "master_futures.parquet"
-MASTER_CSV = BASE / "data" / "continuous" / "master_futures.csv"
+HIST_PQ   = RAW_HIST_DIR / "futures" / "nifty50_future_hist_2016.parquet"
+MASTER_PQ  = MASTER_FUTURES_PQ
+MASTER_CSV = CONT_DIR / "master_futures.csv"
 
 # ==================================================
 # NUMERIC SCHEMA
@@ -65,7 +73,7 @@ def sanitize_futures_numeric(df: pd.DataFrame) -> pd.DataFrame:
 # ==================================================
 # MAIN
 # ==================================================
-def main():
+def update_master():
     print("NIFTY-LAB | APPEND HISTORICAL FUTURES TO MASTER")
     print("-" * 60)
 
@@ -111,18 +119,20 @@ def main():
     # --------------------------------------------------
     # Append + dedupe
     # --------------------------------------------------
-    combined = (
-        pd.concat([master, hist], ignore_index=True)
-        .drop_duplicates(subset=["SYMBOL", "TRADE_DATE", "EXP_DATE"], keep="last")
-        .sort_values(["TRADE_DATE", "EXP_DATE"])
-        .reset_index(drop=True)
+    combined, _ = sorted_upsert(
+        master,
+        hist,
+        keys=["SYMBOL", "TRADE_DATE", "EXP_DATE"],
+        sort_by=["TRADE_DATE", "EXP_DATE"],
     )
 
     # --------------------------------------------------
     # SAVE
     # --------------------------------------------------
-    combined.to_parquet(MASTER_PQ, index=False)
-    combined.to_csv(MASTER_CSV, index=False)
+    versions.snapshot(MASTER_PQ, note="append_historical_futures_to_master")
+    atomic.write_parquet(combined, MASTER_PQ)
+    outputs.mirror(combined, MASTER_CSV, MASTER_PQ)
+    manifest.record_table(MASTER_PQ, combined, "TRADE_DATE")
 
     print("-" * 60)
     print("MASTER FUTURES UPDATED (HISTORICAL APPENDED)")
@@ -131,6 +141,10 @@ def main():
     print(f"To         : {combined['TRADE_DATE'].max().date()}")
     print("DONE")
 
+def main():
+    with atomic.master_lock(MASTER_PQ):
+        update_master()
+
 # ==================================================
 # ENTRY
 # ==================================================
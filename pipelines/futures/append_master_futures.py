@@ -5,27 +5,36 @@
 NIFTY-LAB | APPEND DAILY FUTURES TO MASTER (LOCKED + SELF-HEALING)
 
 ✔ Append-only (date-aware)
+✔ Ledger: only new / changed daily files are opened
 ✔ Numeric sanity enforced
 ✔ OI → OPEN_INTEREST normalized
-✔ MASTER SAFETY LOCK
-✔ Auto-backup before write
-✔ Deduplicated & sorted
+✔ MASTER SAFETY LOCK (from manifest, no data read)
+✔ Versioned snapshot before write (hard links, pruned)
+✔ Master lock + atomic replace (safe next to other jobs)
+✔ In a DAG run the master is handed on in memory (storage/bus.py);
+  the file is written before the master lock is released
+✔ Deduplicated & sorted (sorted-merge upsert)
 ✔ Scheduler-safe
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
-import shutil
-from datetime import datetime
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import CONT_DIR, MASTER_FUTURES_PQ, PROC_FUT_DAILY
+from pipelines.storage import atomic, bus, ledger, manifest, outputs, versions
+from pipelines.storage.upsert import sorted_upsert
 
 # ==================================================
 # PATHS
 # ==================================================
-BASE = Path(r"H:\NIFTY-LAB")
-
-DAILY_DIR   = BASE / "data" / "processed" / "daily" / "futures"
-MASTER_PQ  = BASE / "data" / "continuous" / "master_futures.parquet"
-MASTER_CSV = BASE / "data" / "continuous" / "master_futures.csv"
+DAILY_DIR   = PROC_FUT_DAILY
+MASTER_PQ  = MASTER_FUTURES_PQ
+MASTER_CSV = CONT_DIR / "master_futures.csv"
 
 # ==================================================
 # NUMERIC SCHEMA
@@ -66,41 +75,44 @@ def sanitize_futures_numeric(df: pd.DataFrame) -> pd.DataFrame:
 # ==================================================
 # MAIN
 # ==================================================
-def main():
+def update_master():
     print("NIFTY-LAB | APPEND DAILY FUTURES TO MASTER")
     print("-" * 60)
 
     # --------------------------------------------------
-    # Load master (WITH LOCK)
+    # Master state from manifest (WITH LOCK)
     # --------------------------------------------------
-    if MASTER_PQ.exists():
-        master = pd.read_parquet(MASTER_PQ)
-        master["TRADE_DATE"] = pd.to_datetime(master["TRADE_DATE"])
-        master["EXP_DATE"] = pd.to_datetime(master["EXP_DATE"])
+    m = manifest.ensure(MASTER_PQ, "TRADE_DATE")
 
-        print(f"Loaded master rows : {len(master):,}")
+    if m is not None:
+        print(f"Master rows        : {m['rows']:,}")
 
         # 🔒 HARD SAFETY LOCK
-        if len(master) < 100:
+        if m["rows"] < 100:
             raise RuntimeError(
                 "MASTER FUTURES TOO SMALL — POSSIBLE CORRUPTION. "
                 "REFUSING TO MODIFY."
             )
 
-        last_date = master["TRADE_DATE"].max()
+        last_date = manifest.max_date(m)
         print(f"Last master date  : {last_date.date()}")
 
     else:
-        master = pd.DataFrame()
         last_date = None
         print("No master found — creating new")
 
     # --------------------------------------------------
-    # Load truly new daily data
+    # Load truly new daily data (ledger: unseen / changed files only)
     # --------------------------------------------------
+    daily_files = sorted(DAILY_DIR.glob("FUT_NIFTY_*.csv"))
+    led = ledger.Ledger(MASTER_PQ)
+    todo = led.pending(daily_files, m)
+    print(f"Files to open     : {len(todo)} (ledger skipped {len(daily_files) - len(todo)})")
+
     new_rows = []
+    seen = []
 
-    for file in sorted(DAILY_DIR.glob("FUT_NIFTY_*.csv")):
+    for file, status in todo:
         df = pd.read_csv(file)
         df.columns = [c.strip().upper() for c in df.columns]
 
@@ -110,19 +122,23 @@ def main():
             "VOLUME", "OI"
         }
         if not required.issubset(df.columns):
+            seen.append((file, 0, set()))
             continue
 
         df["TRADE_DATE"] = pd.to_datetime(df["TRADE_DATE"])
         df["EXP_DATE"] = pd.to_datetime(df["EXP_DATE"])
+        seen.append((file, len(df), ledger.file_dates(df, "TRADE_DATE")))
 
-        if last_date is not None:
-            df = df[df["TRADE_DATE"] > last_date]
+        df = ledger.new_rows(df, "TRADE_DATE", status, m)
 
         if not df.empty:
             df = sanitize_futures_numeric(df)
             new_rows.append(df)
 
     if not new_rows:
+        for file, rows, dates in seen:
+            led.record(file, rows, dates)
+        led.save()
         print("No new futures data to append")
         return
 
@@ -130,36 +146,42 @@ def main():
     print(f"New rows appended : {len(daily_new):,}")
 
     # --------------------------------------------------
-    # Merge & dedupe
+    # Merge & dedupe (master read only when there is work)
     # --------------------------------------------------
-    combined = (
-        pd.concat([master, daily_new], ignore_index=True)
-        .drop_duplicates(
-            subset=["SYMBOL", "TRADE_DATE", "EXP_DATE"],
-            keep="last"
-        )
-        .sort_values(["TRADE_DATE", "EXP_DATE"])
-        .reset_index(drop=True)
+    if m is not None:
+        master = bus.read_parquet(MASTER_PQ)  # warm copy in watch mode
+        master["TRADE_DATE"] = pd.to_datetime(master["TRADE_DATE"])
+        master["EXP_DATE"] = pd.to_datetime(master["EXP_DATE"])
+    else:
+        master = pd.DataFrame()
+
+    combined, stats = sorted_upsert(
+        master,
+        daily_new,
+        keys=["SYMBOL", "TRADE_DATE", "EXP_DATE"],
+        sort_by=["TRADE_DATE", "EXP_DATE"],
     )
+    print(f"Inserted / updated : {stats['inserted']:,} / {stats['updated']:,}")
 
     # --------------------------------------------------
-    # Backup before save
+    # Snapshot before save (hard links, no copy)
     # --------------------------------------------------
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    shutil.copy2(
-        MASTER_PQ,
-        MASTER_PQ.with_name(f"master_futures_backup_{ts}.parquet")
-    )
-    shutil.copy2(
-        MASTER_CSV,
-        MASTER_CSV.with_name(f"master_futures_backup_{ts}.csv")
-    )
+    version = versions.snapshot(MASTER_PQ, note="append_master_futures")
+    if version:
+        print(f"Snapshot          : {version}")
 
     # --------------------------------------------------
     # Save
     # --------------------------------------------------
-    combined.to_parquet(MASTER_PQ, index=False)
-    combined.to_csv(MASTER_CSV, index=False)
+    def after_write():
+        # Mirror, manifest and ledger only once the master has landed
+        outputs.mirror(combined, MASTER_CSV, MASTER_PQ)
+        manifest.record_table(MASTER_PQ, combined, "TRADE_DATE")
+        for file, rows, dates in seen:
+            led.record(file, rows, dates)
+        led.save()
+
+    bus.write_parquet(combined, MASTER_PQ, then=after_write, lock=True, also=[MASTER_CSV])
 
     print("-" * 60)
     print("MASTER FUTURES UPDATED SAFELY")
@@ -168,6 +190,10 @@ def main():
     print(f"To   : {combined['TRADE_DATE'].max().date()}")
     print("DONE")
 
+def main():
+    with atomic.master_lock(MASTER_PQ):
+        update_master()
+
 # ==================================================
 if __name__ == "__main__":
     main()
@@ -6,22 +6,30 @@ NIFTY-LAB | BACKFILL MISSING FUTURES DAYS
 
 ✔ Allows older dates
 ✔ Append-only
-✔ Deduplicated
+✔ Deduplicated (sorted-merge upsert, back-dated rows land in order)
 ✔ Numeric sanity enforced
 ✔ SAFE for historical fixes
+✔ Master lock + atomic replace (safe next to other jobs)
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import CONT_DIR, MASTER_FUTURES_PQ, PROC_FUT_DAILY
+from pipelines.storage import atomic, manifest, outputs, versions
+from pipelines.storage.upsert import sorted_upsert
+
 # ==================================================
 # PATHS
 # ==================================================
-BASE = Path(r"H:\NIFTY-LAB")
-
-DAILY_DIR   = BASE / "data" / "processed" / "daily" / "futures"
-MASTER_PQ  = BASE / "data" / "continuous" / "master_futures.parquet"
-MASTER_CSV = BASE / "data" / "continuous" / "master_futures.csv"
+DAILY_DIR   = PROC_FUT_DAILY
+MASTER_PQ  = MASTER_FUTURES_PQ
+MASTER_CSV = CONT_DIR / "master_futures.csv"
 
 # ==================================================
 # NUMERIC SCHEMA
@@ -56,7 +64,7 @@ def sanitize(df: pd.DataFrame) -> pd.DataFrame:
 # ==================================================
 # MAIN
 # ==================================================
-def main():
+def update_master():
     print("NIFTY-LAB | BACKFILL MISSING FUTURES DAYS")
     print("-" * 60)
 
@@ -92,24 +100,28 @@ def main():
 
     daily_all = pd.concat(frames, ignore_index=True)
 
-    combined = (
-        pd.concat([master, daily_all], ignore_index=True)
-        .drop_duplicates(
-            subset=["SYMBOL", "TRADE_DATE", "EXP_DATE"],
-            keep="last"
-        )
-        .sort_values(["TRADE_DATE", "EXP_DATE"])
-        .reset_index(drop=True)
+    combined, stats = sorted_upsert(
+        master,
+        daily_all,
+        keys=["SYMBOL", "TRADE_DATE", "EXP_DATE"],
+        sort_by=["TRADE_DATE", "EXP_DATE"],
     )
 
-    combined.to_parquet(MASTER_PQ, index=False)
-    combined.to_csv(MASTER_CSV, index=False)
+    versions.snapshot(MASTER_PQ, note="backfill_missing_futures")
+    atomic.write_parquet(combined, MASTER_PQ)
+    outputs.mirror(combined, MASTER_CSV, MASTER_PQ)
+    manifest.record_table(MASTER_PQ, combined, "TRADE_DATE")
 
     print(f"Rows before : {before}")
     print(f"Rows after  : {len(combined)}")
-    print(f"Backfilled : {len(combined) - before}")
+    print(f"Backfilled : {stats['inserted']}")
+    print(f"Updated    : {stats['updated']}")
     print("DONE")
 
+def main():
+    with atomic.master_lock(MASTER_PQ):
+        update_master()
+
 # ==================================================
 if __name__ == "__main__":
     main()
@@ -8,71 +8,87 @@ PHASE-14 | BUILD NIFTY FUTURES OI HISTORICAL (AUTO-DETECT)
 ✔ Detects DATE & OPEN INTEREST automatically
 ✔ Computes OI_CHANGE_PCT
 ✔ ML & backtest ready
+✔ build_oi_history(df) importable; script = read CSV → build → save
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import FUTURES_ML_DIR
+
 # ======================================================
 # PATHS
 # ======================================================
-BASE_DIR = Path(r"H:\NIFTY-LAB-Trial")
-
-IN_FILE = BASE_DIR / "data" / "processed" / "futures_ml" / "nifty_fut_oi_daily.csv"
-OUT_DIR = BASE_DIR / "data" / "processed" / "futures_ml"
+IN_FILE = FUTURES_ML_DIR / "nifty_fut_oi_daily.csv"
+OUT_DIR = FUTURES_ML_DIR
 OUT_FILE = OUT_DIR / "nifty_fut_oi_historical.parquet"
 
+DATE_CANDIDATES = [
+    "DATE", "TRAD_DT", "TRADE_DATE", "BUSINESS_DATE"
+]
+OI_CANDIDATES = [
+    "OPEN_INT", "OPENINTEREST", "OPEN_INTEREST", "OI"
+]
+
 # ======================================================
-# LOAD
+# BUILD
 # ======================================================
-if not IN_FILE.exists():
-    raise FileNotFoundError(f"❌ Missing input file: {IN_FILE}")
+def build_oi_history(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    DATE / OPEN_INT / OI_CHANGE_PCT from a daily OI table with any of
+    the NSE column spellings.
+    """
+    df = df.copy()
+    df.columns = df.columns.str.strip().str.upper()
 
-df = pd.read_csv(IN_FILE)
-df.columns = df.columns.str.strip().str.upper()
+    # AUTO-DETECT DATE COLUMN
+    date_col = next((c for c in DATE_CANDIDATES if c in df.columns), None)
+    if not date_col:
+        raise RuntimeError(f"❌ DATE column not found. Columns: {df.columns.tolist()}")
 
-# ======================================================
-# AUTO-DETECT DATE COLUMN
-# ======================================================
-DATE_CANDIDATES = [
-    "DATE", "TRAD_DT", "TRADE_DATE", "BUSINESS_DATE"
-]
+    df["DATE"] = pd.to_datetime(df[date_col])
 
-date_col = next((c for c in DATE_CANDIDATES if c in df.columns), None)
-if not date_col:
-    raise RuntimeError(f"❌ DATE column not found. Columns: {df.columns.tolist()}")
+    # AUTO-DETECT OPEN INTEREST COLUMN
+    oi_col = next((c for c in OI_CANDIDATES if c in df.columns), None)
+    if not oi_col:
+        raise RuntimeError(f"❌ OPEN INTEREST column not found. Columns: {df.columns.tolist()}")
 
-df["DATE"] = pd.to_datetime(df[date_col])
+    df["OPEN_INT"] = pd.to_numeric(df[oi_col], errors="coerce").fillna(0)
 
-# ======================================================
-# AUTO-DETECT OPEN INTEREST COLUMN
-# ======================================================
-OI_CANDIDATES = [
-    "OPEN_INT", "OPENINTEREST", "OPEN_INTEREST", "OI"
-]
+    # SORT + OI CHANGE %
+    df = df.sort_values("DATE").reset_index(drop=True)
+    df["OI_CHANGE_PCT"] = df["OPEN_INT"].pct_change().fillna(0.0)
 
-oi_col = next((c for c in OI_CANDIDATES if c in df.columns), None)
-if not oi_col:
-    raise RuntimeError(f"❌ OPEN INTEREST column not found. Columns: {df.columns.tolist()}")
+    return df[["DATE", "OPEN_INT", "OI_CHANGE_PCT"]]
 
-df["OPEN_INT"] = pd.to_numeric(df[oi_col], errors="coerce").fillna(0)
 
-# ======================================================
-# SORT
-# ======================================================
-df = df.sort_values("DATE").reset_index(drop=True)
+def run(in_file=IN_FILE, out_file=OUT_FILE) -> pd.DataFrame:
+    """
+    Stage entry: CSV in, parquet out (out_file=None skips saving).
+    """
+    if not Path(in_file).exists():
+        raise FileNotFoundError(f"❌ Missing input file: {in_file}")
 
-# ======================================================
-# OI CHANGE %
-# ======================================================
-df["OI_CHANGE_PCT"] = df["OPEN_INT"].pct_change().fillna(0.0)
+    df_out = build_oi_history(pd.read_csv(in_file))
+    if out_file is not None:
+        df_out.to_parquet(out_file, index=False)
+    return df_out
 
 # ======================================================
-# SAVE
+# CLI
 # ======================================================
-df_out = df[["DATE", "OPEN_INT", "OI_CHANGE_PCT"]]
-df_out.to_parquet(OUT_FILE, index=False)
+def main():
+    df_out = run()
+
+    print("\n✅ NIFTY FUTURES OI HISTORICAL BUILT")
+    print(df_out.tail())
+    print(f"\n📁 Saved → {OUT_FILE}")
+
 
-print("\n✅ NIFTY FUTURES OI HISTORICAL BUILT")
-print(df_out.tail())
-print(f"\n📁 Saved → {OUT_FILE}")
+if __name__ == "__main__":
+    main()
@@ -5,134 +5,57 @@
 NIFTY-LAB | CLEAN DAILY FUTURES (AUTO | NIFTY ONLY)
 
 ✔ Auto-finds latest FO ZIP
+✔ Single-pass shared FO parser
 ✔ FIXED: Reads NSE OPEN_INT* correctly
 ✔ Holiday / delay safe
 ✔ NEVER breaks scheduler
 ✔ Outputs Parquet + CSV
 """
 
+import sys
 from pathlib import Path
-from datetime import datetime, timedelta
-import zipfile
 import pandas as pd
-from io import StringIO
+
+# --------------------------------------------------
+# PROJECT ROOT
+# --------------------------------------------------
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import PROC_FUT_DAILY
+from pipelines.fo import raw_store
+from pipelines.fo.bhavcopy_parser import parse_fo_zip
+from pipelines.storage import outputs
 
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-RAW_DIR = BASE / "data" / "raw" / "futures"
-OUT_DIR = BASE / "data" / "processed" / "daily" / "futures"
+OUT_DIR = PROC_FUT_DAILY
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # --------------------------------------------------
 # HELPERS
 # --------------------------------------------------
 def find_latest_fo_zip(max_lookback=7):
-    today = datetime.today().date()
-    for i in range(max_lookback):
-        d = today - timedelta(days=i)
-        f = RAW_DIR / f"fo_{d:%Y-%m-%d}.zip"
-        if f.exists():
-            return d, f
-    return None, None
-
+    return raw_store.latest(max_lookback)
 
-def read_nse_csv(f):
-    lines = f.read().decode("utf-8", errors="ignore").splitlines()
-    for i, line in enumerate(lines):
-        if line.strip().startswith("INSTRUMENT"):
-            return pd.read_csv(StringIO("\n".join(lines[i:])))
-    return None
 
-
-def normalize_columns(df):
+def clean_futures(frames: dict, trade_date):
     """
-    NSE sometimes uses special chars like *, %, ₹ in column names.
-    This function strips everything except A-Z, 0-9 and _.
+    NIFTY index futures from parsed FO frames (see parse_fo_zip).
+    Returns None when the day has no usable rows.
     """
-    df.columns = (
-        df.columns.astype(str)
-        .str.strip()
-        .str.upper()
-        .str.replace(" ", "_")
-        .str.replace(r"[^A-Z0-9_]", "", regex=True)  #  KEY FIX
-    )
-    return df
-
-# --------------------------------------------------
-# MAIN
-# --------------------------------------------------
-def main():
-    print("NIFTY-LAB | CLEAN DAILY FUTURES (AUTO | NIFTY ONLY)")
-    print("-" * 60)
-
-    trade_date, zip_file = find_latest_fo_zip()
-
-    if zip_file is None:
-        print("No FO ZIP found in recent days — skipping futures clean")
-        return
-
-    out_pq = OUT_DIR / f"FUT_NIFTY_{trade_date}.parquet"
-    out_csv = OUT_DIR / f"FUT_NIFTY_{trade_date}.csv"
-
-    if out_pq.exists():
-        print(f"Already cleaned → {out_pq.name}")
-        return
-
-    print(f"Using FO ZIP : {zip_file.name}")
-    print(f"Trade Date  : {trade_date}")
-
-    frames = []
-
-    with zipfile.ZipFile(zip_file) as z:
-        for name in z.namelist():
-            if not name.lower().endswith(".csv"):
-                continue
-
-            with z.open(name) as f:
-                df = read_nse_csv(f)
-                if df is None or df.empty:
-                    continue
-
-                df = normalize_columns(df)
-
-                if not {"INSTRUMENT", "SYMBOL"}.issubset(df.columns):
-                    continue
-
-                df["INSTRUMENT"] = df["INSTRUMENT"].astype(str).str.strip()
-                df["SYMBOL"] = df["SYMBOL"].astype(str).str.strip()
+    df = frames["FUTIDX"]
+    df = df[df["SYMBOL"] == "NIFTY"].copy()
 
-                # Only NIFTY index futures
-                df = df[
-                    (df["INSTRUMENT"] == "FUTIDX") &
-                    (df["SYMBOL"] == "NIFTY")
-                ]
-
-                if df.empty:
-                    continue
-
-                # Detect expiry column
-                for c in ("EXP_DATE", "EXPIRY", "EXPIRY_DATE", "EXP_DT"):
-                    if c in df.columns:
-                        df.rename(columns={c: "EXP_DATE"}, inplace=True)
-                        break
-                else:
-                    continue
-
-                df["TRADE_DATE"] = trade_date
-                frames.append(df)
-
-    if not frames:
-        print("No valid NIFTY futures found — skipping")
-        return
-
-    df = pd.concat(frames, ignore_index=True)
+    if df.empty:
+        return None
 
     # --------------------------------------------------
     # DATE NORMALIZATION
     # --------------------------------------------------
-    df["TRADE_DATE"] = pd.to_datetime(df["TRADE_DATE"])
+    df["TRADE_DATE"] = pd.to_datetime(trade_date)
     df["EXP_DATE"] = pd.to_datetime(df["EXP_DATE"], dayfirst=True)
 
     # --------------------------------------------------
@@ -196,11 +119,42 @@ def main():
     df = df.drop_duplicates()
     df = df.dropna(subset=["OPEN", "HIGH", "LOW", "CLOSE"])
 
+    return df if not df.empty else None
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+def main():
+    print("NIFTY-LAB | CLEAN DAILY FUTURES (AUTO | NIFTY ONLY)")
+    print("-" * 60)
+
+    trade_date, zip_file = find_latest_fo_zip()
+
+    if zip_file is None:
+        print("No FO ZIP found in recent days — skipping futures clean")
+        return
+
+    out_pq = OUT_DIR / f"FUT_NIFTY_{trade_date}.parquet"
+    out_csv = OUT_DIR / f"FUT_NIFTY_{trade_date}.csv"
+
+    if out_pq.exists():
+        print(f"Already cleaned → {out_pq.name}")
+        return
+
+    print(f"Using FO ZIP : {zip_file.name}")
+    print(f"Trade Date  : {trade_date}")
+
+    frames = parse_fo_zip(zip_file, trade_date)
+    df = clean_futures(frames, trade_date)
+
+    if df is None:
+        print("No valid NIFTY futures found — skipping")
+        return
+
     # --------------------------------------------------
     # SAVE
     # --------------------------------------------------
-    df.to_parquet(out_pq, index=False)
-    df.to_csv(out_csv, index=False)
+    outputs.write(df, out_pq, out_csv)
 
     print(f"Saved : {out_pq.name}")
     print(f"Rows  : {len(df)}")
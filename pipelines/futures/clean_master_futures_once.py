@@ -1,24 +1,34 @@
+import sys
 from pathlib import Path
 import pandas as pd
 
-BASE = Path(r"H:\NIFTY-LAB")
-MASTER_PQ  = BASE / "data" / "continuous" / "master_futures.parquet"
-MASTER_CSV = BASE / "data" / "continuous" / "master_futures.csv"
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-print("Loading master futures...")
-df = pd.read_parquet(MASTER_PQ)
+from configs.paths import CONT_DIR, MASTER_FUTURES_PQ
+from pipelines.storage import atomic, manifest, outputs, versions
 
-before = len(df)
+MASTER_PQ  = MASTER_FUTURES_PQ
+MASTER_CSV = CONT_DIR / "master_futures.csv"
 
-# Drop fully empty rows
-df = df.dropna(subset=["TRADE_DATE", "EXP_DATE", "SYMBOL"], how="any")
+with atomic.master_lock(MASTER_PQ):
+    print("Loading master futures...")
+    df = pd.read_parquet(MASTER_PQ)
 
-after = len(df)
+    before = len(df)
 
-df = df.sort_values(["TRADE_DATE", "EXP_DATE"]).reset_index(drop=True)
+    # Drop fully empty rows
+    df = df.dropna(subset=["TRADE_DATE", "EXP_DATE", "SYMBOL"], how="any")
 
-df.to_parquet(MASTER_PQ, index=False)
-df.to_csv(MASTER_CSV, index=False)
+    after = len(df)
+
+    df = df.sort_values(["TRADE_DATE", "EXP_DATE"]).reset_index(drop=True)
+
+    versions.snapshot(MASTER_PQ, note="clean_master_futures_once")
+    atomic.write_parquet(df, MASTER_PQ)
+    outputs.mirror(df, MASTER_CSV, MASTER_PQ)
+    manifest.record_table(MASTER_PQ, df, "TRADE_DATE")
 
 print(f"Removed {before - after} empty rows")
 print("MASTER CLEANED")
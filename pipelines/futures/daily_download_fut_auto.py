@@ -5,90 +5,26 @@
 NIFTY-LAB | DAILY FUTURES DOWNLOAD (FO ZIP)
 AUTO MODE — SAFE FOR SCHEDULER
 
-✔ Looks back up to 7 days
-✔ Weekend-aware
-✔ Logs when file already exists
-✔ NEVER breaks pipeline
-✔ RAW ONLY — no cleaning here
+Futures and options share ONE fo bhavcopy. This entrypoint is kept for
+existing schedules and delegates to pipelines/fo/daily_download_fo_auto.py,
+which stores each day once in the shared raw FO store (data/raw/fo).
 
-Downloads:
-  foDDMMYYYY.zip from NSE
-
-Saves:
-  data/raw/futures/fo_YYYY-MM-DD.zip
+RAW DATA ONLY — DO NOT CLEAN HERE
 """
 
 import argparse
-import requests
-from datetime import datetime, timedelta
+import sys
+from datetime import datetime
 from pathlib import Path
 
 # --------------------------------------------------
-# PATHS
-# --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-OUT_DIR = BASE / "data" / "raw" / "futures"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
+# PROJECT ROOT
 # --------------------------------------------------
-# NSE CONFIG
-# --------------------------------------------------
-BASE_URL = "https://nsearchives.nseindia.com/archives/fo/mkt/fo{date}.zip"
-
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/121.0.0.0 Safari/537.36"
-    ),
-    "Accept": "*/*",
-    "Referer": "https://www.nseindia.com/",
-}
-
-# --------------------------------------------------
-# MAIN
-# --------------------------------------------------
-def main(trade_date):
-    print("NIFTY-LAB | DAILY FUTURES DOWNLOAD (AUTO)")
-    print("-" * 60)
-
-    for i in range(7):  # look back up to 7 days
-        d = trade_date - timedelta(days=i)
-
-        print(f"Trying FO bhavcopy for {d}")
-
-        # Weekend skip
-        if d.weekday() >= 5:
-            print("   Weekend — skipped")
-            continue
-
-        out_file = OUT_DIR / f"fo_{d:%Y-%m-%d}.zip"
-
-        # IMPORTANT: explicit log if already exists
-        if out_file.exists():
-            print(f" Already exists → {out_file.name}")
-            return  # SOFT EXIT (scheduler-safe)
-
-        d_nse = d.strftime("%d%m%Y")
-        url = BASE_URL.format(date=d_nse)
-
-        try:
-            r = requests.get(url, headers=HEADERS, timeout=20)
-
-            if r.status_code == 200 and len(r.content) > 50_000:
-                out_file.write_bytes(r.content)
-                print(f" Downloaded & saved → {out_file.name}")
-                return
-            else:
-                print("   Not available")
-
-        except requests.RequestException as e:
-            print(f" Network error : {e}")
-
-    #  NEVER FAIL PIPELINE
-    print("No FO bhavcopy found in recent days — skipping safely")
-    return
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
+from pipelines.fo.daily_download_fo_auto import main
 
 # --------------------------------------------------
 # CLI
@@ -8,36 +8,25 @@ Downloads:
   foDDMMYYYY.zip from NSE
 
 Saves:
-  data/raw/futures/fo_YYYY-MM-DD.zip
+  data/raw/fo (shared raw FO store)
 
 RAW ONLY — DO NOT CLEAN HERE
 """
 
+import sys
 import requests
 from datetime import datetime
 from pathlib import Path
 
 # --------------------------------------------------
-# PATHS
+# PROJECT ROOT
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-OUT_DIR = BASE / "data" / "raw" / "futures"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-# --------------------------------------------------
-# NSE CONFIG
-# --------------------------------------------------
-BASE_URL = "https://nsearchives.nseindia.com/archives/fo/mkt/fo{date}.zip"
-
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/121.0.0.0 Safari/537.36"
-    ),
-    "Accept": "*/*",
-    "Referer": "https://www.nseindia.com/",
-}
+from pipelines.fo import raw_store
+from pipelines.fo.daily_download_fo_auto import fetch_fo_zip, fo_url
 
 # --------------------------------------------------
 # MAIN
@@ -59,24 +48,18 @@ def main():
         print("⚠️ Weekend selected — no FO data on Saturday/Sunday")
         return
 
-    d_nse = trade_date.strftime("%d%m%Y")
-    url = BASE_URL.format(date=d_nse)
+    url = fo_url(trade_date)
 
-    out_file = OUT_DIR / f"fo_{trade_date:%Y-%m-%d}.zip"
-
-    if out_file.exists():
-        print(f"⏩ Already downloaded: {out_file.name}")
+    if raw_store.has(trade_date):
+        print(f"⏩ Already downloaded: {trade_date}")
         return
 
     print(f"🌐 URL  : {url}")
 
     try:
-        r = requests.get(url, headers=HEADERS, timeout=20)
-
-        if r.status_code == 200 and len(r.content) > 50_000:
-            with open(out_file, "wb") as f:
-                f.write(r.content)
+        out_file = fetch_fo_zip(trade_date)
 
+        if out_file is not None:
             print("✅ Download successful")
             print(f"📅 Date  : {trade_date}")
             print(f"💾 Saved : {out_file}")
@@ -84,7 +67,7 @@ def main():
         else:
             print("❌ Bhavcopy not available (holiday / not released yet)")
 
-    except Exception as e:
+    except requests.RequestException as e:
         print(f"⚠️ Error: {e}")
 
 
@@ -1,26 +1,36 @@
+import sys
 from pathlib import Path
 import pandas as pd
 
-BASE = Path(r"H:\NIFTY-LAB")
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-MASTER_PQ  = BASE / "data" / "continuous" / "master_futures.parquet"
-MASTER_CSV = BASE / "data" / "continuous" / "master_futures.csv"
+from configs.paths import CONT_DIR, MASTER_FUTURES_PQ
+from pipelines.storage import atomic, manifest, outputs, versions
 
-print("Loading master futures...")
-df = pd.read_parquet(MASTER_PQ)
 
-# --------------------------------------------------
-# FORCE INTEGER TYPES (NULLABLE)
-# --------------------------------------------------
-for col in ["VOLUME", "OPEN_INTEREST"]:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+MASTER_PQ  = MASTER_FUTURES_PQ
+MASTER_CSV = CONT_DIR / "master_futures.csv"
 
-# --------------------------------------------------
-# SAVE BACK
-# --------------------------------------------------
-df.to_parquet(MASTER_PQ, index=False)
-df.to_csv(MASTER_CSV, index=False)
+with atomic.master_lock(MASTER_PQ):
+    print("Loading master futures...")
+    df = pd.read_parquet(MASTER_PQ)
+
+    # --------------------------------------------------
+    # FORCE INTEGER TYPES (NULLABLE)
+    # --------------------------------------------------
+    for col in ["VOLUME", "OPEN_INTEREST"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+
+    # --------------------------------------------------
+    # SAVE BACK
+    # --------------------------------------------------
+    versions.snapshot(MASTER_PQ, note="fix_master_futures_dtypes")
+    atomic.write_parquet(df, MASTER_PQ)
+    outputs.mirror(df, MASTER_CSV, MASTER_PQ)
+    manifest.record_table(MASTER_PQ, df, "TRADE_DATE")
 
 print("MASTER FUTURES DTYPES FIXED")
 print(df.dtypes)
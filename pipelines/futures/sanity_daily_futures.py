@@ -12,15 +12,21 @@ AUTO • HOLIDAY SAFE • NIFTY ONLY
 ✔ Skips safely if latest data ≠ today
 """
 
+import sys
 from pathlib import Path
 from datetime import date
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import PROC_FUT_DAILY
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-FUT_DAILY_DIR = BASE / "data" / "processed" / "daily" / "futures"
+FUT_DAILY_DIR = PROC_FUT_DAILY
 
 REQUIRED_COLS = {
     "SYMBOL",
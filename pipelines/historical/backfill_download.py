@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | DATE-RANGE BACKFILL DOWNLOADER (FO ZIP + NIFTY INDEX)
+
+✔ Any date range (--from / --to), not just the last 7 days
+✔ One keep-alive HTTP session, pooled connections
+✔ Bounded concurrency + global rate limit
+✔ Resumable (progress file, Ctrl-C safe)
+✔ Skips weekends, known NSE holidays, days already stored
+✔ --base-url for a local stand-in (tools/fake_nse_server.py)
+
+Downloads:
+  foDDMMYYYY.zip          → shared raw FO store (data/raw/fo)
+  ind_close_all_DDMMYYYY  → data/raw/equity/equity_YYYY-MM-DD.csv
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# --------------------------------------------------
+# PROJECT ROOT
+# --------------------------------------------------
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import RAW_DIR, RAW_EQUITY_DIR
+from configs.holidays import is_trading_day
+from pipelines.fo import raw_store
+from pipelines.fo.daily_download_fo_auto import HEADERS, MIN_ZIP_BYTES
+from pipelines.equity.daily_download_equ_auto import parse_index_csv
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+NSE_ARCHIVES = "https://nsearchives.nseindia.com"
+
+FO_PATH     = "/archives/fo/mkt/fo{date}.zip"
+EQUITY_PATH = "/content/indices/ind_close_all_{date}.csv"
+
+PROGRESS_FILE = RAW_DIR / "backfill_progress.json"
+
+DEFAULT_WORKERS = 4
+DEFAULT_RPS     = 2.0
+
+# Progress states
+OK      = "ok"
+MISSING = "missing"   # NSE returned nothing → non-trading day
+ERROR   = "error"     # network / parse error → retried next run
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+class RateLimiter:
+    """
+    Spaces request starts at least 1/rps apart across all threads.
+    """
+
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps if rps > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def make_session(workers: int) -> requests.Session:
+    """
+    Keep-alive session with a pool sized for the worker count.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=1.0,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=max(workers, 2),
+        max_retries=retry,
+    )
+    s = requests.Session()
+    s.headers.update(HEADERS)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+class Progress:
+    """
+    {kind: {YYYY-MM-DD: ok|missing|error}} persisted after every result.
+    """
+
+    def __init__(self, path: Path = PROGRESS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        if path.exists():
+            self.state = json.loads(path.read_text(encoding="utf-8"))
+        else:
+            self.state = {}
+
+    def get(self, kind, d):
+        return self.state.get(kind, {}).get(d.isoformat())
+
+    def set(self, kind, d, status):
+        with self._lock:
+            self.state.setdefault(kind, {})[d.isoformat()] = status
+            tmp = self.path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(self.state, indent=1, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+
+def date_range(start: date, end: date):
+    d = start
+    while d <= end:
+        yield d
+        d += timedelta(days=1)
+
+
+# --------------------------------------------------
+# FETCHERS
+# --------------------------------------------------
+def equity_out(d):
+    return RAW_EQUITY_DIR / f"equity_{d}.csv"
+
+
+def fetch_fo(session, limiter, base_url, d):
+    if raw_store.has(d):
+        return OK
+
+    url = base_url + FO_PATH.format(date=d.strftime("%d%m%Y"))
+    limiter.wait()
+    r = session.get(url, timeout=30)
+
+    if r.status_code == 200 and len(r.content) > MIN_ZIP_BYTES:
+        raw_store.put(d, r.content, source=url)
+        return OK
+    if r.status_code in (200, 403, 404):
+        return MISSING
+    return ERROR
+
+
+def fetch_equity(session, limiter, base_url, d):
+    out_file = equity_out(d)
+    if out_file.exists():
+        return OK
+
+    url = base_url + EQUITY_PATH.format(date=d.strftime("%d%m%Y"))
+    limiter.wait()
+    r = session.get(url, timeout=30)
+
+    if r.status_code != 200:
+        return MISSING if r.status_code in (403, 404) else ERROR
+
+    out = parse_index_csv(r.text, d)
+    tmp = out_file.with_suffix(".csv.tmp")
+    out.to_csv(tmp, index=False)
+    os.replace(tmp, out_file)
+    return OK
+
+
+FETCHERS = {
+    "fo": fetch_fo,
+    "equity": fetch_equity,
+}
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+def plan(start, end, kinds, progress, retry_missing=False):
+    """
+    (kind, date) jobs still to do, after skip list + progress.
+    """
+    jobs = []
+    skipped = 0
+    for d in date_range(start, end):
+        if not is_trading_day(d):
+            skipped += 1
+            continue
+        for kind in kinds:
+            status = progress.get(kind, d)
+            if status == OK or (status == MISSING and not retry_missing):
+                continue
+            jobs.append((kind, d))
+    return jobs, skipped
+
+
+def main(start, end, kinds=("fo", "equity"), workers=DEFAULT_WORKERS,
+         rps=DEFAULT_RPS, base_url=NSE_ARCHIVES, retry_missing=False,
+         progress_file=PROGRESS_FILE):
+    print("NIFTY-LAB | BACKFILL DOWNLOAD")
+    print("-" * 60)
+    print(f"Range    : {start} → {end}")
+    print(f"Kinds    : {', '.join(kinds)}")
+    print(f"Workers  : {workers} | Rate: {rps:g} req/s")
+    print(f"Source   : {base_url}")
+
+    progress = Progress(progress_file)
+    jobs, skipped = plan(start, end, kinds, progress, retry_missing)
+
+    print(f"Skipped  : {skipped} weekend/holiday days")
+    print(f"To fetch : {len(jobs)} (kind, day) pairs")
+
+    if not jobs:
+        print("Nothing to do — range already complete")
+        return {}
+
+    session = make_session(workers)
+    limiter = RateLimiter(rps)
+    counts = {OK: 0, MISSING: 0, ERROR: 0}
+    t0 = time.perf_counter()
+
+    def run_job(kind, d):
+        try:
+            return FETCHERS[kind](session, limiter, base_url, d)
+        except (requests.RequestException, RuntimeError, ValueError) as e:
+            print(f"  {kind:<6} {d} : error ({e})")
+            return ERROR
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, k, d): (k, d) for k, d in jobs}
+        try:
+            for fut in as_completed(futures):
+                kind, d = futures[fut]
+                status = fut.result()
+                progress.set(kind, d, status)
+                counts[status] += 1
+                if status != OK:
+                    print(f"  {kind:<6} {d} : {status}")
+        except KeyboardInterrupt:
+            print("Interrupted — progress saved, rerun to resume")
+            for f in futures:
+                f.cancel()
+            raise
+
+    session.close()
+    elapsed = time.perf_counter() - t0
+
+    print("-" * 60)
+    print(f"OK       : {counts[OK]}")
+    print(f"Missing  : {counts[MISSING]} (remembered as non-trading)")
+    print(f"Errors   : {counts[ERROR]} (retried on next run)")
+    print(f"Elapsed  : {elapsed:.1f}s")
+    print("Next     : python pipelines/fo/clean_daily_fo.py --all")
+    print("BACKFILL DOWNLOAD COMPLETE")
+    return counts
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Backfill NSE FO bhavcopy + NIFTY index EOD over a date range"
+    )
+    parser.add_argument("--from", dest="start", required=True, help="YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", help="YYYY-MM-DD (default: today)")
+    parser.add_argument(
+        "--kinds",
+        default="fo,equity",
+        help="Comma list of: fo, equity (default: both)",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rps", type=float, default=DEFAULT_RPS, help="Max requests/second")
+    parser.add_argument("--base-url", default=NSE_ARCHIVES, help="Archive host (local stand-in for tests)")
+    parser.add_argument(
+        "--retry-missing",
+        action="store_true",
+        help="Re-probe days previously found missing",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    start = datetime.strptime(args.start, "%Y-%m-%d").date()
+    end = (
+        datetime.strptime(args.end, "%Y-%m-%d").date()
+        if args.end
+        else datetime.today().date()
+    )
+
+    main(
+        start,
+        end,
+        kinds=tuple(k.strip() for k in args.kinds.split(",") if k.strip()),
+        workers=args.workers,
+        rps=args.rps,
+        base_url=args.base_url.rstrip("/"),
+        retry_missing=args.retry_missing,
+    )
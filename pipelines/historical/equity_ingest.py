@@ -6,20 +6,25 @@ ONE-TIME HISTORICAL INGEST
 RAW HISTORICAL EQUITY  → MASTER EQUITY
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import CONT_DIR, RAW_HIST_DIR
+from pipelines.storage import atomic, manifest, outputs, versions
+
 # -------------------------------------------------
 # PATHS
 # -------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-
 IN_FILE = (
-    BASE / "data" / "raw" / "historical" / "equity"
-    / "nifty50_equ_hist_2007.csv"
+    RAW_HIST_DIR / "equity" / "nifty50_equ_hist_2007.csv"
 )
 
-OUT_DIR = BASE / "data" / "continuous"
+OUT_DIR = CONT_DIR
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 OUT_PQ  = OUT_DIR / "master_equity.parquet"
@@ -87,8 +92,11 @@ def main():
     # -------------------------------
     # Save MASTER
     # -------------------------------
-    df.to_parquet(OUT_PQ, index=False)
-    df.to_csv(OUT_CSV, index=False)
+    with atomic.master_lock(OUT_PQ):
+        versions.snapshot(OUT_PQ, note="equity_ingest")
+        atomic.write_parquet(df, OUT_PQ)
+        outputs.mirror(df, OUT_CSV, OUT_PQ)
+        manifest.record_table(OUT_PQ, df, "DATE")
 
     print("-" * 70)
     print("✅ MASTER EQUITY CREATED")
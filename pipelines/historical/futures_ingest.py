@@ -13,26 +13,26 @@ Purpose:
 ⚠️ RUN ONCE ONLY
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import CONT_DIR, RAW_HIST_DIR
+from pipelines.storage import atomic, manifest, outputs, versions
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-
-BASE = Path(r"H:\NIFTY-LAB")
-
 IN_FILE = (
-    BASE
-    / "data"
-    / "raw"
-    / "historical"
-    / "futures"
-    / "nifty50_future_hist_2016.parquet"
+    RAW_HIST_DIR / "futures" / "nifty50_future_hist_2016.parquet"
 )
 
 # ✅ OUTPUT MOVED TO CONTINUOUS
-OUT_DIR = BASE / "data" / "continuous"
+OUT_DIR = CONT_DIR
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 OUT_PQ  = OUT_DIR / "master_futures.parquet"
@@ -117,8 +117,11 @@ def main():
     )
 
     # ---------------- SAVE ----------------
-    df.to_parquet(OUT_PQ, index=False)
-    df.to_csv(OUT_CSV, index=False)
+    with atomic.master_lock(OUT_PQ):
+        versions.snapshot(OUT_PQ, note="futures_ingest")
+        atomic.write_parquet(df, OUT_PQ)
+        outputs.mirror(df, OUT_CSV, OUT_PQ)
+        manifest.record_table(OUT_PQ, df, "TRADE_DATE")
 
     # ---------------- SUMMARY ----------------
     print("-" * 70)
@@ -6,11 +6,17 @@ MASTER SANITY CHECK
 Single source of truth: data/continuous/
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
-BASE = Path(r"H:\NIFTY-LAB")
-MASTER_DIR = BASE / "data" / "continuous"
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import CONT_DIR
+
+MASTER_DIR = CONT_DIR
 
 
 def check_master(name, date_col):
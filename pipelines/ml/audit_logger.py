@@ -13,13 +13,15 @@ from pathlib import Path
 import pandas as pd
 from datetime import datetime
 
+from configs.paths import AUDIT_DIR
 
-def log_decision(signal: dict, base_dir: Path):
+
+def log_decision(signal: dict, audit_dir: Path = AUDIT_DIR):
     """
     Append trading decision to audit log.
     """
 
-    audit_dir = base_dir / "data" / "audit"
+    audit_dir = Path(audit_dir)
     audit_dir.mkdir(parents=True, exist_ok=True)
 
     csv_file = audit_dir / "nifty_decision_audit.csv"
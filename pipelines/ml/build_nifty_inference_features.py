@@ -4,12 +4,16 @@
 """
 NIFTY-LAB | DAILY INFERENCE FEATURES (PRODUCTION SAFE)
 
-✔ Schema aligned with training
+✔ Schema aligned with training (pipelines/ml/feature_registry.py)
 ✔ Column-variant safe
 ✔ Subprocess safe
 ✔ No leakage
+✔ Importable: build_features(eq, fut) / run()
+✔ Daily run is incremental: rolling state carried between days
+  (incremental_features.py); --full recomputes the whole history
 """
 
+import argparse
 import sys
 from pathlib import Path
 import pandas as pd
@@ -22,6 +26,8 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from configs.paths import CONT_DIR, PROC_DIR
+from pipelines.ml import feature_registry, incremental_features
+from pipelines.storage import bus, outputs
 
 # ==================================================
 # PATHS
@@ -30,111 +36,57 @@ EQ_FILE  = CONT_DIR / "master_equity.parquet"
 FUT_FILE = PROC_DIR / "futures_ml" / "nifty_fut_oi_historical.parquet"
 
 OUT_DIR = PROC_DIR / "ml"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
 OUT_PQ  = OUT_DIR / "nifty_inference_features.parquet"
 OUT_CSV = OUT_DIR / "nifty_inference_features.csv"
 
 # ==================================================
-# LOAD DATA
+# BUILD (REGISTRY, LATEST COMMON DAY)
 # ==================================================
-print("📥 Loading master equity + futures...")
+def build_features(eq: pd.DataFrame, fut: pd.DataFrame) -> pd.DataFrame:
+    """
+    Inference row for the latest day present in both inputs.
+    """
+    return feature_registry.latest(eq, fut)
 
-eq  = pd.read_parquet(EQ_FILE)
-fut = pd.read_parquet(FUT_FILE)
 
-# ==================================================
-# STANDARDISE EQUITY
-# ==================================================
-eq = eq.rename(columns={
-    "DATE": "date",
-    "OPEN": "open",
-    "HIGH": "high",
-    "LOW": "low",
-    "CLOSE": "close",
-})
+def run(eq_file=EQ_FILE, fut_file=FUT_FILE, out_pq=OUT_PQ, out_csv=OUT_CSV,
+        incremental=True) -> pd.DataFrame:
+    """
+    Stage entry: build and save the features. Incremental: advance the
+    rolling state by the bars added since the last run (state rebuilt
+    when it does not line up). Full: read the masters (in-memory copies
+    from the data bus when the run just rebuilt them) and recompute.
+    out_pq=None skips saving. Returns the feature frame.
+    """
+    if incremental:
+        df, mode = incremental_features.update(eq_file, fut_file)
+        print(f"🧮 Rolling state : {mode}")
+    else:
+        print("📥 Loading master equity + futures...")
+        df = build_features(bus.read_parquet(eq_file), bus.read_parquet(fut_file))
 
-eq["date"] = pd.to_datetime(eq["date"])
-eq = eq.sort_values("date").reset_index(drop=True)
+    if out_pq is not None:
+        Path(out_pq).parent.mkdir(parents=True, exist_ok=True)
+        outputs.write(df, out_pq, out_csv)
+    return df
 
 # ==================================================
-# EQUITY FEATURES (MATCH TRAINING)
+# CLI
 # ==================================================
-eq["ret_1d"] = eq["close"].pct_change()
-eq["ret_3d"] = eq["close"].pct_change(3)
-
-eq["prev_close"] = eq["close"].shift(1)
-eq["tr"] = (eq["close"] - eq["prev_close"]).abs()
-eq["atr"] = eq["tr"].rolling(14).mean()
-eq["atr_pct"] = eq["atr"] / eq["close"]
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true",
+                        help="Recompute over the whole history (no rolling state)")
+    args = parser.parse_args()
 
-eq["range_pct"] = (eq["high"] - eq["low"]) / eq["close"]
+    df = run(incremental=not args.full)
 
-eq["dma50"] = eq["close"].rolling(50).mean()
-eq["trend_up"] = (eq["close"] > eq["dma50"]).astype(int)
+    print("\n✅ DAILY INFERENCE FEATURES READY")
+    print(f"📦 Parquet : {OUT_PQ}")
+    print(f"📦 CSV     : {OUT_CSV}")
+    print("\nRow:")
+    print(df.T)
 
-eq_feat = eq[[
-    "date",
-    "close",
-    "ret_1d",
-    "ret_3d",
-    "atr_pct",
-    "range_pct",
-    "trend_up",
-]].copy()
 
-# ==================================================
-# FUTURES OI FEATURES (AUTO COLUMN DETECT)
-# ==================================================
-# Detect date column
-for c in ["date", "DATE", "TRADE_DATE"]:
-    if c in fut.columns:
-        fut["date"] = pd.to_datetime(fut[c])
-        break
-else:
-    raise RuntimeError(f"❌ No date column in futures file: {fut.columns}")
-
-# Detect OI pct column
-if "oi_change_pct" in fut.columns:
-    fut["oi_change_pct"] = fut["oi_change_pct"]
-elif "OI_CHANGE_PCT" in fut.columns:
-    fut["oi_change_pct"] = fut["OI_CHANGE_PCT"]
-else:
-    raise RuntimeError("❌ Missing OI % column in futures file")
-
-# Detect regime column
-if "oi_signal" in fut.columns:
-    fut["regime"] = fut["oi_signal"]
-elif "OI_SIGNAL" in fut.columns:
-    fut["regime"] = fut["OI_SIGNAL"]
-else:
-    fut["regime"] = "NO_DATA"
-
-fut_feat = fut[["date", "oi_change_pct", "regime"]].copy()
-
-regime_dum = pd.get_dummies(fut_feat["regime"], prefix="regime")
-fut_feat = pd.concat(
-    [fut_feat.drop(columns="regime"), regime_dum],
-    axis=1
-)
-
-# ==================================================
-# MERGE & KEEP LATEST DAY
-# ==================================================
-df = eq_feat.merge(fut_feat, on="date", how="inner")
-df = df.tail(1).reset_index(drop=True)
-
-# ==================================================
-# SAVE
-# ==================================================
-df.to_parquet(OUT_PQ, index=False)
-df.to_csv(OUT_CSV, index=False)
-
-# ==================================================
-# SUMMARY
-# ==================================================
-print("\n✅ DAILY INFERENCE FEATURES READY")
-print(f"📦 Parquet : {OUT_PQ}")
-print(f"📦 CSV     : {OUT_CSV}")
-print("\nRow:")
-print(df.T)
+if __name__ == "__main__":
+    main()
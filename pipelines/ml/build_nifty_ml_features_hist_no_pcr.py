@@ -2,14 +2,20 @@
 # -*- coding: utf-8 -*-
 
 """
-NIFTY-LAB | DAILY INFERENCE FEATURES (SAFE)
+NIFTY-LAB | HISTORICAL ML FEATURES (TRAINING + BACKTEST)
 
 ✔ Uses latest master equity + futures
-✔ No leakage
-✔ Matches training schema
+✔ Every common day, registry features (pipelines/ml/feature_registry.py)
+  → same columns as the daily inference row
+✔ Materialized once in the feature store (pipelines/ml/feature_store.py):
+  parquet parts keyed by (feature set, watermark), only new days computed
+✔ Target: next day's close up (next_close / next_ret / target), added at
+  read time; the last day has no target yet (NaN)
+✔ --full: rebuild the store from the full history
 ✔ Subprocess safe
 """
 
+import argparse
 import sys
 from pathlib import Path
 import pandas as pd
@@ -25,6 +31,7 @@ from configs.paths import (
     CONT_DIR,
     PROC_DIR,
 )
+from pipelines.ml import feature_registry, feature_store
 
 # ==================================================
 # PATHS
@@ -32,103 +39,43 @@ from configs.paths import (
 EQ_FILE  = CONT_DIR / "master_equity.parquet"
 FUT_FILE = PROC_DIR / "futures_ml" / "nifty_fut_oi_historical.parquet"
 
-OUT_DIR  = PROC_DIR / "ml"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
-OUT_PQ   = OUT_DIR / "nifty_inference_features.parquet"
-OUT_CSV  = OUT_DIR / "nifty_inference_features.csv"
-
-# ==================================================
-# LOAD DATA
-# ==================================================
-print("📥 Loading master equity + futures...")
-
-eq  = pd.read_parquet(EQ_FILE)
-fut = pd.read_parquet(FUT_FILE)
-
 # ==================================================
-# STANDARDISE EQUITY
+# BUILD (FULL HISTORY)
 # ==================================================
-eq = eq.rename(columns={
-    "DATE": "date",
-    "OPEN": "open",
-    "HIGH": "high",
-    "LOW": "low",
-    "CLOSE": "close",
-})
-
-eq["date"] = pd.to_datetime(eq["date"])
-eq = eq.sort_values("date").reset_index(drop=True)
-
-# ==================================================
-# EQUITY FEATURES (MATCH TRAINING)
-# ==================================================
-eq["ret_1d"] = eq["close"].pct_change()
-eq["ret_3d"] = eq["close"].pct_change(3)
-
-eq["prev_close"] = eq["close"].shift(1)
-eq["tr"] = (eq["close"] - eq["prev_close"]).abs()
-eq["atr"] = eq["tr"].rolling(14).mean()
-eq["atr_pct"] = eq["atr"] / eq["close"]
+def build_features(eq: pd.DataFrame, fut: pd.DataFrame) -> pd.DataFrame:
+    """
+    date / FEATURE_NAMES / next_close / next_ret / target per day,
+    computed in memory (no store).
+    """
+    return feature_store.add_target(feature_registry.compute(eq, fut))
 
-eq["range_pct"] = (eq["high"] - eq["low"]) / eq["close"]
 
-eq["dma50"] = eq["close"].rolling(50).mean()
-eq["trend_up"] = (eq["close"] > eq["dma50"]).astype(int)
-
-eq_feat = eq[[
-    "date",
-    "close",
-    "ret_1d",
-    "ret_3d",
-    "atr_pct",
-    "range_pct",
-    "trend_up",
-]].copy()
+def run(eq_file=EQ_FILE, fut_file=FUT_FILE, full=False):
+    """
+    Stage entry: bring the feature store up to the masters' last common
+    day. Returns (store meta, "appended" / "current" / "rebuilt").
+    """
+    print("📥 Syncing feature store with master equity + futures...")
+    return feature_store.sync(eq_file, fut_file, full=full)
 
 # ==================================================
-# FUTURES OI FEATURES
+# CLI
 # ==================================================
-fut = fut.rename(columns={
-    "TRADE_DATE": "date",
-    "price_pct_change": "price_pct",
-    "oi_pct_change": "oi_pct",
-    "oi_signal": "regime",
-})
-
-fut["date"] = pd.to_datetime(fut["date"])
-
-fut_feat = fut[[
-    "date",
-    "oi_pct",
-    "regime",
-]].copy()
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true",
+                        help="rebuild the store from the full history")
+    args = parser.parse_args()
 
-regime_dum = pd.get_dummies(fut_feat["regime"], prefix="regime")
-fut_feat = pd.concat(
-    [fut_feat.drop(columns="regime"), regime_dum],
-    axis=1
-)
+    meta, mode = run(full=args.full)
 
-# ==================================================
-# MERGE (LATEST ONLY)
-# ==================================================
-df = eq_feat.merge(fut_feat, on="date", how="inner")
+    print("\n✅ HISTORICAL ML FEATURES READY")
+    print(f"📦 Store     : {feature_store.store_dir()} ({len(meta['parts'])} parts)")
+    print(f"🧬 Key       : feature set {meta['feature_hash']} | watermark {meta['watermark']}")
+    print(f"🔁 Sync      : {mode}")
+    print("\nLast row:")
+    print(feature_store.read(start=meta["watermark"]).tail(1).T)
 
-# keep latest row only (daily inference)
-df = df.tail(1).reset_index(drop=True)
 
-# ==================================================
-# SAVE
-# ==================================================
-df.to_parquet(OUT_PQ, index=False)
-df.to_csv(OUT_CSV, index=False)
-
-# ==================================================
-# SUMMARY
-# ==================================================
-print("\n✅ DAILY INFERENCE FEATURES READY")
-print(f"📦 Parquet : {OUT_PQ}")
-print(f"📦 CSV     : {OUT_CSV}")
-print("\nRow:")
-print(df.T)
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,9 @@
 """
 NIFTY-LAB | XGBOOST PROBABILITY CALIBRATION (TEMPERATURE SCALING)
 
-✔ Uses historical ML dataset
-✔ Enforces exact XGB feature order
+✔ Uses the historical ML features (feature store, rows with a target)
+✔ Registry feature order, model checked against the registry
+✔ Feature set hash saved next to the scaler
 ✔ No leakage
 ✔ Pickle-safe
 """
@@ -13,7 +14,6 @@ NIFTY-LAB | XGBOOST PROBABILITY CALIBRATION (TEMPERATURE SCALING)
 import sys
 from pathlib import Path
 import numpy as np
-import pandas as pd
 import joblib
 
 # --------------------------------------------------
@@ -23,14 +23,12 @@ ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from configs.paths import PROC_DIR
+from pipelines.ml import feature_registry, feature_store
 from pipelines.ml.temperature_scaler import TemperatureScaler
 
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-DATA_FILE = PROC_DIR / "ml" / "nifty_ml_features_hist_no_pcr.parquet"
-
 MODEL_DIR = ROOT / "models"
 XGB_MODEL = MODEL_DIR / "nifty_xgb_gpu.joblib"
 OUT_SCALER = MODEL_DIR / "nifty_xgb_temp_scaler.joblib"
@@ -39,22 +37,21 @@ OUT_TEMP = MODEL_DIR / "nifty_xgb_temperature.txt"
 # --------------------------------------------------
 def main():
     print("📦 Loading historical ML dataset...")
-    df = pd.read_parquet(DATA_FILE)
-    print(f"📊 Samples: {len(df):,}")
+    watermark = feature_store.key()[1]
+    df = feature_store.training_set(watermark)
+    print(f"📊 Samples: {len(df):,} | watermark {watermark}")
 
     y = df["target"].values
 
     print("🤖 Loading XGBoost model...")
     model = joblib.load(XGB_MODEL)
+    feature_registry.check_model(XGB_MODEL, model)
 
     # --------------------------------------------------
-    # FEATURE ALIGNMENT (CRITICAL)
+    # FEATURES (REGISTRY ORDER)
     # --------------------------------------------------
-    features = model.get_booster().feature_names
-    print(f"🧠 Features used ({len(features)}):")
-    print(features)
-
-    X = df[features]
+    print(f"🧠 Features used ({len(feature_registry.FEATURE_NAMES)}, set {feature_registry.FEATURE_HASH})")
+    X = feature_registry.matrix(df)
 
     print("🔥 Generating raw probabilities...")
     raw_prob = model.predict_proba(X)[:, 1]
@@ -66,6 +63,7 @@ def main():
     scaler = TemperatureScaler().fit(logits, y)
 
     joblib.dump(scaler, OUT_SCALER)
+    feature_registry.save_model_meta(OUT_SCALER, watermark=watermark)
     OUT_TEMP.write_text(f"{scaler.temperature_:.6f}")
 
     print("\n✅ MODEL CALIBRATION COMPLETE")
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | FEATURE REGISTRY (TRAINING = BACKTEST = DAILY)
+
+✔ Every model feature declared once: name, lookback (bars before the
+  current one it needs), NumPy formula
+✔ FEATURE_NAMES is the model input order, everywhere
+✔ compute(eq, fut): every common day, one pass over aligned arrays
+✔ latest(eq, fut): the same row for the last common day, computed on
+  the last LOOKBACK + 1 bars only
+✔ Window means are summed offset by offset, so a value depends on its
+  window only: tail and full history give the same bits
+✔ Fixed regime one-hot columns (REGIMES): no missing-column patching
+✔ FEATURE_HASH (names, lookbacks, formulas) written next to every
+  model (<model>.features.json) and checked when it is loaded
+
+Changing a formula changes FEATURE_HASH: retrain (and recalibrate)
+before the daily run will load the models again.
+"""
+
+import hashlib
+import inspect
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# ==================================================
+# INPUT COLUMNS (accepted spellings)
+# ==================================================
+FUT_DATE   = ["date", "DATE", "TRADE_DATE"]
+FUT_OI     = ["oi_change_pct", "OI_CHANGE_PCT", "oi_pct_change", "oi_pct"]
+FUT_REGIME = ["oi_signal", "OI_SIGNAL", "regime"]
+
+NO_REGIME = "NO_DATA"
+REGIMES   = ["LONG_BUILDUP", "NO_DATA", "SHORT_COVERING"]
+
+# ==================================================
+# WINDOW HELPERS
+# ==================================================
+def _shift(x, k):
+    out = np.full(len(x), np.nan)
+    if k < len(x):
+        out[k:] = x[:len(x) - k]
+    return out
+
+
+def _mean(x, w):
+    """
+    Trailing w-bar mean (NaN until w bars, NaN when any is NaN),
+    summed oldest → newest in every window.
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < w:
+        return out
+    acc = x[:n - w + 1].copy()
+    for j in range(1, w):
+        acc += x[j:n - w + 1 + j]
+    out[w - 1:] = acc / w
+    return out
+
+# ==================================================
+# FORMULAS (a: aligned input arrays)
+# ==================================================
+def close(a):
+    return a["close"]
+
+
+def ret_1d(a):
+    return a["close"] / _shift(a["close"], 1) - 1
+
+
+def ret_3d(a):
+    return a["close"] / _shift(a["close"], 3) - 1
+
+
+def atr_pct(a):
+    tr = np.abs(a["close"] - _shift(a["close"], 1))
+    return _mean(tr, 14) / a["close"]
+
+
+def trend_up(a):
+    return (a["close"] > _mean(a["close"], 50)).astype(float)
+
+
+def oi_change_pct(a):
+    return a["oi"]
+
+
+def _regime(name):
+    def one_hot(a):
+        return (a["regime"] == name).astype(float)
+    return one_hot
+
+# ==================================================
+# REGISTRY
+# ==================================================
+class Feature:
+    """
+    One model input column. source: "equity" (computed over the equity
+    bars) or "futures" (the futures row of the same day).
+    """
+
+    def __init__(self, name, lookback, formula, source="equity"):
+        self.name = name
+        self.lookback = lookback
+        self.formula = formula
+        self.source = source
+
+    def __repr__(self):
+        return f"Feature({self.name}, lookback={self.lookback})"
+
+
+FEATURES = [
+    Feature("close",         0,  close),
+    Feature("ret_1d",        1,  ret_1d),
+    Feature("ret_3d",        3,  ret_3d),
+    Feature("atr_pct",       14, atr_pct),
+    Feature("trend_up",      49, trend_up),
+    Feature("oi_change_pct", 0,  oi_change_pct, source="futures"),
+    *[Feature(f"regime_{r}", 0, _regime(r), source="futures") for r in REGIMES],
+]
+
+FEATURE_NAMES = [f.name for f in FEATURES]
+LOOKBACK      = max(f.lookback for f in FEATURES)
+
+
+def _feature_hash() -> str:
+    spec = {
+        "features": [[f.name, f.lookback, f.source] for f in FEATURES],
+        "regimes": REGIMES,
+        "code": [inspect.getsource(fn) for fn in (_shift, _mean, _regime)]
+                + [inspect.getsource(f.formula) for f in FEATURES if f.formula.__name__ != "one_hot"],
+    }
+    return hashlib.sha256(json.dumps(spec).encode()).hexdigest()[:16]
+
+
+FEATURE_HASH = _feature_hash()
+
+# ==================================================
+# INPUTS → ALIGNED ARRAYS
+# ==================================================
+def _pick(columns, candidates, what, required=True):
+    col = next((c for c in candidates if c in columns), None)
+    if col is None and required:
+        raise RuntimeError(f"❌ No {what} column in futures data: {list(columns)}")
+    return col
+
+
+def _last_per_day(date, arrays: dict) -> dict:
+    """
+    One row per day (the last one given), days ascending.
+    """
+    rev = np.arange(len(date))[::-1]
+    days, first = np.unique(date[rev], return_index=True)
+    keep = rev[first]
+    return {"date": days, **{k: v[keep] for k, v in arrays.items()}}
+
+
+def equity_arrays(eq: pd.DataFrame) -> dict:
+    """
+    date / close arrays of the equity bars.
+    """
+    date = pd.to_datetime(eq["DATE"]).to_numpy(dtype="datetime64[ns]")
+    return _last_per_day(date, {"close": eq["CLOSE"].to_numpy(dtype=float)})
+
+
+def futures_arrays(fut: pd.DataFrame) -> dict:
+    """
+    date / oi / regime arrays.
+    """
+    date_col = _pick(fut.columns, FUT_DATE, "date")
+    oi_col = _pick(fut.columns, FUT_OI, "OI %")
+    regime_col = _pick(fut.columns, FUT_REGIME, "regime", required=False)
+
+    date = pd.to_datetime(fut[date_col]).to_numpy(dtype="datetime64[ns]")
+    if regime_col is None:
+        regime = np.full(len(fut), NO_REGIME, dtype=object)
+    else:
+        regime = fut[regime_col].to_numpy(dtype=object)
+    return _last_per_day(date, {"oi": fut[oi_col].to_numpy(dtype=float), "regime": regime})
+
+# ==================================================
+# COMPUTE
+# ==================================================
+def compute_arrays(e: dict, f: dict) -> pd.DataFrame:
+    """
+    date + FEATURE_NAMES for every day in both inputs.
+    """
+    _, ie, jf = np.intersect1d(e["date"], f["date"], assume_unique=True, return_indices=True)
+    fa = {k: v[jf] for k, v in f.items()}
+
+    X = np.empty((len(ie), len(FEATURES)))
+    with np.errstate(all="ignore"):
+        for i, ft in enumerate(FEATURES):
+            X[:, i] = ft.formula(e)[ie] if ft.source == "equity" else ft.formula(fa)
+
+    out = pd.DataFrame(X, columns=FEATURE_NAMES)
+    out.insert(0, "date", e["date"][ie])
+    return out
+
+
+def compute(eq: pd.DataFrame, fut: pd.DataFrame) -> pd.DataFrame:
+    """
+    Feature history (training / backtest).
+    """
+    return compute_arrays(equity_arrays(eq), futures_arrays(fut))
+
+
+def latest_arrays(e: dict, f: dict) -> pd.DataFrame:
+    """
+    latest() on aligned arrays: the last common day, from its window.
+    """
+    common = np.intersect1d(e["date"], f["date"], assume_unique=True)
+    if len(common) == 0:
+        return compute_arrays({k: v[:0] for k, v in e.items()}, f)
+
+    day = common[-1]
+    end = int(np.searchsorted(e["date"], day, side="right"))
+    start = max(0, end - LOOKBACK - 1)
+    e = {k: v[start:end] for k, v in e.items()}
+    f = {k: v[f["date"] == day] for k, v in f.items()}
+    return compute_arrays(e, f)
+
+
+def latest(eq: pd.DataFrame, fut: pd.DataFrame) -> pd.DataFrame:
+    """
+    Row for the latest day present in both inputs (daily inference).
+    """
+    return latest_arrays(equity_arrays(eq), futures_arrays(fut))
+
+
+def matrix(df: pd.DataFrame) -> np.ndarray:
+    """
+    Model input matrix (FEATURE_NAMES order, float64).
+    """
+    missing = [c for c in FEATURE_NAMES if c not in df.columns]
+    if missing:
+        raise RuntimeError(f"❌ Missing registry features: {missing}")
+    return df[FEATURE_NAMES].to_numpy(dtype=float)
+
+# ==================================================
+# MODEL SIDECARS
+# ==================================================
+def meta_path(model_file) -> Path:
+    return Path(model_file).with_suffix(".features.json")
+
+
+def save_model_meta(model_file, watermark=None):
+    """
+    Record the feature set (and feature store watermark) a model was
+    trained on, next to it.
+    """
+    from pipelines.storage import atomic
+
+    atomic.write_text(meta_path(model_file), json.dumps({
+        "feature_hash": FEATURE_HASH,
+        "features": FEATURE_NAMES,
+        "watermark": watermark,
+    }, indent=1))
+
+
+def check_model(model_file, model=None):
+    """
+    Raise when the model was trained on another feature set. Models
+    without a sidecar (trained before the registry) are accepted when
+    their own feature names are FEATURE_NAMES.
+    """
+    name = Path(model_file).name
+    meta = meta_path(model_file)
+    if meta.exists():
+        trained = json.loads(meta.read_text(encoding="utf-8"))
+        if trained.get("feature_hash") != FEATURE_HASH:
+            raise RuntimeError(
+                f"❌ {name} was trained on feature set {trained.get('feature_hash')}, "
+                f"registry is {FEATURE_HASH}: retrain"
+            )
+        return
+
+    names = None
+    if model is not None and hasattr(model, "get_booster"):
+        names = model.get_booster().feature_names
+    elif model is not None and hasattr(model, "feature_name_"):
+        names = list(model.feature_name_)
+    if names is not None and list(names) != FEATURE_NAMES:
+        raise RuntimeError(f"❌ {name} expects {list(names)}, registry builds {FEATURE_NAMES}: retrain")
+    print(f"⚠ {name}: no feature hash stored (trained before the registry)")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | VERSIONED FEATURE STORE (ONE MATRIX FOR TRAIN / CALIBRATE / PREDICT)
+
+✔ Keyed by (feature set, data watermark): one directory per
+  FEATURE_HASH, rows up to the last common equity / futures day
+✔ Columnar parquet parts, append-only: each sync computes only the
+  days after the watermark (registry formulas on the last LOOKBACK bars)
+✔ read(columns=..., start=..., watermark=...): column projection +
+  date filter pushed down to the parts
+✔ Targets (next day up) derived at read time: stored parts never change
+  when the next bar arrives
+✔ Rebuilt from the full history when the masters no longer line up with
+  the store (row counts up to the watermark changed); compacted into one
+  part past MAX_PARTS
+
+Layout:
+  data/processed/ml/feature_store/<feature hash>/_store.json
+  data/processed/ml/feature_store/<feature hash>/part-00000-20150101-20241231.parquet
+
+_store.json is written last (atomically): parts not listed there are
+ignored by readers and removed by the next sync.
+Not detected: in-place edits of older bars with the same row counts
+(sync --full once after restating history).
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import ML_DIR
+from pipelines.ml import feature_registry as registry
+from pipelines.storage import atomic, bus, partitioned
+from pipelines.storage.masters import build_filter, scan
+
+STORE_DIR = ML_DIR / "feature_store"
+META_FILE = "_store.json"
+
+MAX_PARTS = 64
+TARGET    = "target"
+
+# ==================================================
+# LAYOUT
+# ==================================================
+def store_dir(feature_hash=None) -> Path:
+    return STORE_DIR / (feature_hash or registry.FEATURE_HASH)
+
+
+def _meta_path(root) -> Path:
+    return Path(root) / META_FILE
+
+
+def load_meta(root=None):
+    """
+    Store metadata of the current feature set, None when never built.
+    """
+    try:
+        return json.loads(_meta_path(root or store_dir()).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def key(meta=None):
+    """
+    (feature set, watermark) of what read() returns.
+    """
+    meta = meta or load_meta()
+    return registry.FEATURE_HASH, meta["watermark"] if meta else None
+
+
+def _day(d) -> str:
+    return str(pd.Timestamp(d).date())
+
+# ==================================================
+# WRITE
+# ==================================================
+def _write_part(root, meta, df):
+    name = f"part-{meta['next_part']:05d}-" \
+           f"{pd.Timestamp(df['date'].iloc[0]):%Y%m%d}-{pd.Timestamp(df['date'].iloc[-1]):%Y%m%d}.parquet"
+    atomic.write_parquet(df, Path(root) / name)
+    meta["parts"].append(name)
+    meta["next_part"] += 1
+
+
+def _commit(root, meta):
+    """
+    Publish meta, then drop the parts it no longer lists.
+    """
+    meta["updated"] = datetime.now().isoformat(timespec="seconds")
+    atomic.write_text(_meta_path(root), json.dumps(meta, indent=1))
+    for p in Path(root).glob("part-*.parquet"):
+        if p.name not in meta["parts"]:
+            p.unlink(missing_ok=True)
+
+
+def _counts(eq_ds, fut_ds, fut_date, watermark):
+    """
+    Input rows up to the watermark (what the stored rows were built from).
+    """
+    return (
+        eq_ds.count_rows(filter=build_filter(eq_ds.schema, end=watermark, date_col="DATE")),
+        fut_ds.count_rows(filter=build_filter(fut_ds.schema, end=watermark, date_col=fut_date)),
+    )
+
+
+def _tail_from(e, watermark):
+    """
+    First of the LOOKBACK equity bars up to the watermark: every later
+    day's window starts at or after it.
+    """
+    end = int(np.searchsorted(e["date"], np.datetime64(pd.Timestamp(watermark), "ns"), side="right"))
+    return _day(e["date"][max(0, end - registry.LOOKBACK)])
+
+
+def _finish(root, meta, e, eq_ds, fut_ds, fut_date):
+    meta["eq_rows"], meta["fut_rows"] = _counts(eq_ds, fut_ds, fut_date, meta["watermark"])
+    meta["tail_from"] = _tail_from(e, meta["watermark"])
+    if len(meta["parts"]) > MAX_PARTS:
+        _compact(root, meta)
+    _commit(root, meta)
+
+
+def _compact(root, meta):
+    df = read(meta=meta, root=root)
+    meta["parts"] = []
+    _write_part(root, meta, df)
+
+
+def _rebuild(root, eq_ds, fut_ds, fut_date):
+    meta = {
+        "feature_hash": registry.FEATURE_HASH,
+        "features": registry.FEATURE_NAMES,
+        "watermark": None,
+        "parts": [],
+        "next_part": (load_meta(root) or {}).get("next_part", 0),
+    }
+    e = registry.equity_arrays(partitioned.to_pandas(eq_ds.to_table()))
+    df = registry.compute_arrays(e, registry.futures_arrays(partitioned.to_pandas(fut_ds.to_table())))
+    if df.empty:
+        raise RuntimeError("❌ No common equity / futures day: nothing to store")
+    _write_part(root, meta, df)
+    meta["watermark"] = _day(df["date"].iloc[-1])
+    _finish(root, meta, e, eq_ds, fut_ds, fut_date)
+    return meta
+
+
+def sync(eq_file, fut_file, full=False):
+    """
+    Bring the store of the current feature set up to the latest common
+    day of the masters. Returns (meta, mode): mode "appended",
+    "current" (nothing new) or "rebuilt".
+    """
+    root = store_dir()
+    root.mkdir(parents=True, exist_ok=True)
+
+    with atomic.master_lock(_meta_path(root)):
+        eq_ds, _ = bus.dataset(eq_file)
+        fut_ds, _ = bus.dataset(fut_file)
+        fut_date = registry._pick(fut_ds.schema.names, registry.FUT_DATE, "date")
+
+        meta = None if full else load_meta(root)
+        if meta is None or meta.get("feature_hash") != registry.FEATURE_HASH or not meta["parts"] \
+                or _counts(eq_ds, fut_ds, fut_date, meta["watermark"]) != (meta["eq_rows"], meta["fut_rows"]):
+            return _rebuild(root, eq_ds, fut_ds, fut_date), "rebuilt"
+
+        # only the days after the watermark (+ their windows)
+        wm = pd.Timestamp(meta["watermark"])
+        eq = scan(eq_ds, start=meta["tail_from"], date_col="DATE")
+        fut = scan(fut_ds, start=wm, date_col=fut_date)
+        fut = fut[pd.to_datetime(fut[fut_date]) > wm]
+
+        e = registry.equity_arrays(eq)
+        new = registry.compute_arrays(e, registry.futures_arrays(fut))
+        if new.empty:
+            return meta, "current"
+
+        _write_part(root, meta, new.reset_index(drop=True))
+        meta["watermark"] = _day(new["date"].iloc[-1])
+        _finish(root, meta, e, eq_ds, fut_ds, fut_date)
+        return meta, "appended"
+
+# ==================================================
+# READ
+# ==================================================
+def read(columns=None, start=None, watermark=None, meta=None, root=None) -> pd.DataFrame:
+    """
+    date + the requested feature columns (all when None), days ascending,
+    up to watermark (default: the store's).
+    """
+    root = Path(root or store_dir())
+    meta = meta or load_meta(root)
+    if not meta or not meta["parts"]:
+        raise FileNotFoundError(
+            f"❌ No feature store for feature set {registry.FEATURE_HASH}: "
+            f"run pipelines/ml/build_nifty_ml_features_hist_no_pcr.py"
+        )
+    if watermark is not None and pd.Timestamp(watermark) > pd.Timestamp(meta["watermark"]):
+        raise RuntimeError(f"❌ Feature store only reaches {meta['watermark']} (asked {_day(watermark)})")
+
+    if columns is not None:
+        unknown = [c for c in columns if c not in registry.FEATURE_NAMES and c != "date"]
+        if unknown:
+            raise KeyError(f"Not in the feature store: {unknown}")
+        columns = ["date"] + [c for c in columns if c != "date"]
+
+    dataset = ds.dataset([str(root / p) for p in meta["parts"]], format="parquet")
+    f = build_filter(dataset.schema, start=start, end=watermark, date_col="date")
+    table = dataset.to_table(columns=columns, filter=f).sort_by("date")
+    return partitioned.to_pandas(table)
+
+
+def add_target(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    next_close / next_ret / target (next common day's close up); NaN on
+    the last row. Needs the close column.
+    """
+    df["next_close"] = df["close"].shift(-1)
+    df["next_ret"] = df["next_close"] / df["close"] - 1
+    df[TARGET] = np.where(df["next_ret"].isna(), np.nan, (df["next_ret"] > 0).astype(float))
+    return df
+
+
+def training_set(watermark=None) -> pd.DataFrame:
+    """
+    Registry features + target, rows with a known target only
+    (training / calibration).
+    """
+    df = add_target(read(columns=registry.FEATURE_NAMES, watermark=watermark))
+    return df[df[TARGET].notna()].reset_index(drop=True)
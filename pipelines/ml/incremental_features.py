@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | INCREMENTAL INFERENCE FEATURES (ROLLING STATE)
+
+✔ Same row as build_nifty_inference_features.build_features, without
+  reloading and recomputing the whole history every day
+✔ Rolling state in a small JSON file (processed/ml/
+  inference_feature_state.json): equity bars from the window of the
+  oldest kept futures day on (futures OI may lag equity by any number
+  of days), recent futures OI rows, row counts
+✔ Each new bar: O(window); only rows from the last processed date on
+  are read (filter pushed to parquet / the in-memory bus table)
+✔ The buffer goes through the same registry formulas as the full
+  history (feature_registry.py, window-local sums), so the row matches
+  the full recomputation bit for bit: tools/check_feature_parity.py
+✔ State rebuilt from the full history when missing, from another
+  version / feature set, or when the masters no longer line up with
+  it (row counts, last bar changed)
+
+Not detected: in-place edits of older bars with the same row count
+(run --full once after restating history).
+"""
+
+import json
+import sys
+from bisect import bisect_left
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import ML_DIR
+from pipelines.ml import feature_registry as registry
+from pipelines.storage import atomic, bus
+from pipelines.storage.masters import scan
+
+STATE_FILE    = ML_DIR / "inference_feature_state.json"
+STATE_VERSION = 3
+
+KEEP = 10                           # recent futures days kept to find the last common day
+BARS = registry.LOOKBACK + KEEP     # equity bars kept at least
+
+# ==================================================
+# STATE
+# ==================================================
+def _iso(d) -> str:
+    return pd.Timestamp(d).isoformat()
+
+
+def _same_close(a, b) -> bool:
+    return a == b or (a != a and b != b)
+
+
+class FeatureState:
+    """
+    Everything the latest inference row depends on.
+    """
+
+    def __init__(self):
+        self.eq_rows = 0
+        self.bars = []              # [iso date, close], see _trim
+        self.fut_rows = 0
+        self.fut_recent = {}        # iso date -> [oi %, regime, rows that day]
+
+    # ---------- feeding ----------
+    def push_equity(self, eq: pd.DataFrame):
+        e = registry.equity_arrays(eq)
+        self.bars += [[_iso(d), float(c)] for d, c in zip(e["date"], e["close"])]
+        self.eq_rows += len(eq)
+        self._trim()
+
+    def push_futures(self, fut: pd.DataFrame):
+        f = registry.futures_arrays(fut)
+        days = pd.to_datetime(fut[registry._pick(fut.columns, registry.FUT_DATE, "date")])
+        rows = days.value_counts()
+        for d, oi, regime in zip(f["date"], f["oi"], f["regime"]):
+            key = _iso(d)
+            prev = self.fut_recent.pop(key, [None, None, 0])
+            regime = None if pd.isna(regime) else regime
+            self.fut_recent[key] = [float(oi), regime, prev[2] + int(rows[d])]
+        for key in sorted(self.fut_recent)[:-KEEP]:
+            del self.fut_recent[key]
+        self.fut_rows += len(fut)
+        self._trim()
+
+    def _trim(self):
+        """
+        Drop equity bars no kept futures day can need: keep LOOKBACK bars
+        before the oldest one (the latest common day is one of them, however
+        far futures lag), and never fewer than BARS.
+        """
+        start = len(self.bars) - BARS
+        if self.fut_recent:
+            dates = [b[0] for b in self.bars]
+            start = min(start, bisect_left(dates, min(self.fut_recent)) - registry.LOOKBACK)
+        if start > 0:
+            del self.bars[:start]
+
+    # ---------- output ----------
+    def latest(self) -> pd.DataFrame:
+        """
+        Inference row for the latest day present in both inputs (what
+        build_features returns).
+        """
+        e = {
+            "date": np.array([b[0] for b in self.bars], dtype="datetime64[ns]"),
+            "close": np.array([b[1] for b in self.bars], dtype=float),
+        }
+        keys = sorted(self.fut_recent)
+        f = {
+            "date": np.array(keys, dtype="datetime64[ns]"),
+            "oi": np.array([self.fut_recent[k][0] for k in keys], dtype=float),
+            "regime": np.array([self.fut_recent[k][1] for k in keys], dtype=object),
+        }
+        return registry.latest_arrays(e, f)
+
+    # ---------- persistence ----------
+    def to_dict(self):
+        return {"version": STATE_VERSION, "feature_hash": registry.FEATURE_HASH, **self.__dict__}
+
+    @classmethod
+    def from_dict(cls, d):
+        st = cls()
+        st.__dict__.update({k: v for k, v in d.items() if k in st.__dict__})
+        return st
+
+
+def load_state(path=STATE_FILE):
+    """
+    Saved state, or None when missing / unreadable / from another
+    version or feature set.
+    """
+    try:
+        d = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if d.get("version") != STATE_VERSION or d.get("feature_hash") != registry.FEATURE_HASH:
+        return None
+    return FeatureState.from_dict(d)
+
+
+def save_state(state, path=STATE_FILE):
+    atomic.write_text(path, json.dumps(state.to_dict()))
+
+
+def rebuild(eq: pd.DataFrame, fut: pd.DataFrame) -> FeatureState:
+    """
+    State from the full histories.
+    """
+    state = FeatureState()
+    state.push_futures(fut)
+    state.push_equity(eq)
+    return state
+
+# ==================================================
+# READING ONLY THE TAIL
+# ==================================================
+def advance(state, eq_file, fut_file) -> bool:
+    """
+    Push the bars added since the state was saved. False when the
+    masters no longer line up with the state (rebuild instead).
+    """
+    # EQUITY: from the last bar on (it must be unchanged)
+    dataset, total = bus.dataset(eq_file)
+    last_date, last_close = state.bars[-1]
+    new = scan(dataset, start=last_date, date_col="DATE")
+    at_last = (pd.to_datetime(new["DATE"]) == pd.Timestamp(last_date)).to_numpy()
+    if at_last.sum() != 1 or not _same_close(float(new.loc[at_last, "CLOSE"].iloc[0]), last_close):
+        return False
+    if total != state.eq_rows + len(new) - 1:
+        return False
+    state.eq_rows -= 1
+    state.bars.pop()
+    state.push_equity(new)
+
+    # FUTURES: from the oldest recent day on (those are pushed again)
+    dataset, total = bus.dataset(fut_file)
+    date_col = registry._pick(dataset.schema.names, registry.FUT_DATE, "date")
+    new = scan(dataset, start=min(state.fut_recent), date_col=date_col)
+    kept = sum(v[2] for v in state.fut_recent.values())
+    if total != state.fut_rows - kept + len(new):
+        return False
+    state.fut_rows -= kept
+    state.fut_recent = {}
+    state.push_futures(new)
+    return True
+
+
+def update(eq_file, fut_file, state_file=STATE_FILE):
+    """
+    Latest inference row + how it was obtained ("incremental" or
+    "rebuilt"). Saves the state.
+    """
+    state = load_state(state_file)
+    mode = "incremental"
+    if state is None or not state.bars or not state.fut_recent \
+            or not advance(state, eq_file, fut_file):
+        state = rebuild(bus.read_parquet(eq_file), bus.read_parquet(fut_file))
+        mode = "rebuilt"
+
+    save_state(state, state_file)
+    return state.latest(), mode
+
+# ==================================================
+# PARITY (vs full recomputation)
+# ==================================================
+def _same(a: pd.DataFrame, b: pd.DataFrame):
+    """
+    None when identical bit for bit (columns, dtypes, values), else
+    what differs.
+    """
+    if list(a.columns) != list(b.columns):
+        return f"columns {list(a.columns)} != {list(b.columns)}"
+    if len(a) != len(b):
+        return f"rows {len(a)} != {len(b)}"
+    for c in a.columns:
+        if a[c].dtype != b[c].dtype:
+            return f"{c}: dtype {a[c].dtype} != {b[c].dtype}"
+        if a[c].to_numpy().tobytes() != b[c].to_numpy().tobytes():
+            return f"{c}: {a[c].iloc[-1]!r} != {b[c].iloc[-1]!r}"
+    return None
+
+
+def check_parity(eq: pd.DataFrame, fut: pd.DataFrame, last=250, every=1):
+    """
+    Stream both histories day by day through the state; on the last
+    `last` equity days (each `every`-th) compare its row with
+    build_features on the histories up to that day. Returns
+    [(day, difference)].
+    """
+    from pipelines.ml.build_nifty_inference_features import build_features
+
+    eq = eq.iloc[np.argsort(pd.to_datetime(eq["DATE"]).to_numpy(), kind="stable")]
+    eq_dates = pd.to_datetime(eq["DATE"]).to_numpy()
+    date_col = registry._pick(fut.columns, registry.FUT_DATE, "date")
+    fut = fut.iloc[np.argsort(pd.to_datetime(fut[date_col]).to_numpy(), kind="stable")]
+    fut_dates = pd.to_datetime(fut[date_col]).to_numpy()
+
+    state = FeatureState()
+    check_from = max(0, len(eq) - last)
+    mismatches, pos = [], 0
+    for i in range(len(eq)):
+        upto = int(np.searchsorted(fut_dates, eq_dates[i], side="right"))
+        if upto > pos:
+            state.push_futures(fut.iloc[pos:upto])
+            pos = upto
+        state.push_equity(eq.iloc[i:i + 1])
+
+        if i < check_from or (len(eq) - 1 - i) % every:
+            continue
+        full = build_features(eq.iloc[:i + 1], fut.iloc[:upto])
+        diff = _same(state.latest(), full)
+        if diff:
+            mismatches.append((str(eq_dates[i])[:10], diff))
+    return mismatches
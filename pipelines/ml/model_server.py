@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | LOCAL MODEL SERVER (WARM MODELS, LOCALHOST HTTP)
+
+✔ python run.py --mode serve [--port 8766]   (or this file)
+✔ XGB + LGBM models and the temperature scaler loaded once, each checked
+  against the registry feature set (FEATURE_HASH) at load
+✔ POST /predict/<kind>: float64 rows in FEATURE_NAMES order → PROB_UP
+  per row (raw float64 both ways, any batch size)
+    daily       calibrated XGB       (predict_nifty_ensemble)
+    historical  XGB + LGBM average   (predict_nifty_ensemble_historical)
+✔ GET /health: feature set, loaded model files, reloads, last error
+✔ Hot reload: model files + sidecars polled every RELOAD_POLL s; a changed
+  set is loaded in the background once it stopped changing and swapped in
+  when valid (the old models keep serving meanwhile, and on failure)
+✔ Every request carries the client's view of the model files
+  (X-Model-Signature): the server reloads before answering when they
+  changed, 409 when it cannot serve that set (the client then scores
+  in-process) — never probabilities from models replaced on disk
+✔ Client side: score(X, kind) is what predict() calls first; None when
+  no server answers (callers load the models in-process, as before)
+✔ HTTP/1.1 keep-alive + TCP_NODELAY: one-row round trip well under 1 ms
+
+Env NIFTY_MODEL_SERVER: host:port (default 127.0.0.1:8766) or off.
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pipelines.ml import feature_registry
+
+DEFAULT_ADDRESS = "127.0.0.1:8766"
+KINDS           = ("daily", "historical")
+
+RELOAD_POLL = 1.0       # seconds between model file checks (server)
+TIMEOUT     = 5.0       # seconds per request (client)
+RETRY_AFTER = 5.0       # seconds without trying again after a refused connection (client)
+
+# ==================================================
+# ADDRESS
+# ==================================================
+def address():
+    """
+    (host, port) of the server, None when disabled.
+    """
+    value = os.environ.get("NIFTY_MODEL_SERVER", DEFAULT_ADDRESS).strip()
+    if value.lower() in ("", "off", "0", "no"):
+        return None
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+# ==================================================
+# MODELS (server side)
+# ==================================================
+def model_files() -> dict:
+    from pipelines.ml import predict_nifty_ensemble as daily
+    from pipelines.ml import predict_nifty_ensemble_historical as hist
+
+    return {"xgb": Path(daily.XGB_MODEL), "cal": Path(daily.CALIB), "lgbm": Path(hist.LGBM_MODEL)}
+
+
+def signature(files: dict):
+    """
+    (name, mtime, size) of every model file and its feature sidecar.
+    """
+    sig = []
+    for name, path in sorted(files.items()):
+        for p in (path, feature_registry.meta_path(path)):
+            try:
+                st = p.stat()
+                sig.append((p.name, st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.append((p.name, None, None))
+    return tuple(sig)
+
+
+def digest(sig) -> str:
+    """
+    Short hash of a signature (the X-Model-Signature header).
+    """
+    return hashlib.sha256(json.dumps(sig).encode()).hexdigest()[:16]
+
+
+class ModelSet:
+    """
+    One loaded, validated set of models. Never mutated: a reload builds
+    a new one.
+    """
+
+    def __init__(self, files: dict):
+        import joblib
+
+        self.files = files
+        self.signature = signature(files)
+        self.digest = digest(self.signature)
+
+        self.xgb = joblib.load(files["xgb"])
+        feature_registry.check_model(files["xgb"], self.xgb)
+        self.cal = joblib.load(files["cal"])
+        feature_registry.check_model(files["cal"])
+        self.lgbm = None
+        if files["lgbm"].exists():
+            self.lgbm = joblib.load(files["lgbm"])
+            feature_registry.check_model(files["lgbm"], self.lgbm)
+        self.loaded_at = datetime.now().isoformat(timespec="seconds")
+
+    def score(self, X: np.ndarray, kind: str) -> np.ndarray:
+        if kind == "daily":
+            from pipelines.ml.predict_nifty_ensemble import score
+            return score(X, self.xgb, self.cal)
+        if kind == "historical":
+            from pipelines.ml.predict_nifty_ensemble_historical import score
+            return score(X, self.xgb, self.lgbm)
+        raise KeyError(f"unknown kind {kind!r} (expected one of {KINDS})")
+
+    def describe(self) -> dict:
+        return {
+            "loaded_at": self.loaded_at,
+            "signature": self.digest,
+            "models": {k: str(p) for k, p in self.files.items()
+                       if k != "lgbm" or self.lgbm is not None},
+        }
+
+
+class ModelHolder:
+    """
+    Current ModelSet + the background reloader.
+    """
+
+    def __init__(self, files=None, poll=RELOAD_POLL):
+        self.files = files or model_files()
+        self.poll = poll
+        self.models = ModelSet(self.files)
+        self.reloads = 0
+        self.error = None
+        self._failed = None
+        self._stop = threading.Event()
+        self._lock = threading.RLock()      # one reload at a time
+
+    def start(self):
+        threading.Thread(target=self._watch, name="model-reload", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        seen = self.models.signature
+        while not self._stop.wait(self.poll):
+            sig = signature(self.files)
+            changed = sig != self.models.signature and sig != self._failed
+            settled = sig == seen
+            seen = sig
+            if changed and settled:
+                self.reload(sig)
+
+    def reload(self, sig=None):
+        with self._lock:
+            try:
+                new = ModelSet(self.files)
+            except Exception as e:
+                self._failed = sig or signature(self.files)
+                self.error = f"{datetime.now():%H:%M:%S} {type(e).__name__}: {e}"
+                print(f"⚠ Reload failed, still serving models loaded {self.models.loaded_at}: {e}")
+                return False
+            self.models = new
+            self.reloads += 1
+            self.error = self._failed = None
+            print(f"🔄 Models reloaded ({new.loaded_at})")
+            return True
+
+    def serving(self, client_digest):
+        """
+        Models matching the client's view of the model files, reloaded
+        here when the files changed; None when this server cannot serve
+        that set (files still changing, or the new set fails to load).
+        """
+        models = self.models
+        if models.digest == client_digest:
+            return models
+        with self._lock:
+            if self.models.digest == client_digest:
+                return self.models
+            sig = signature(self.files)
+            if digest(sig) != client_digest or sig == self._failed:
+                return None
+            if not self.reload(sig) or self.models.digest != client_digest:
+                return None
+            return self.models
+
+# ==================================================
+# HTTP
+# ==================================================
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _send(self, code, body=b"", ctype="application/octet-stream"):
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Feature-Hash", feature_registry.FEATURE_HASH)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send(404, b"Not Found", "text/plain")
+        holder = self.server.holder
+        body = {
+            "feature_hash": feature_registry.FEATURE_HASH,
+            "features": feature_registry.FEATURE_NAMES,
+            "kinds": list(KINDS),
+            "reloads": holder.reloads,
+            "last_error": holder.error,
+            **holder.models.describe(),
+        }
+        self._send(200, json.dumps(body).encode(), "application/json")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        kind = self.path.rpartition("/")[2]
+        if not self.path.startswith("/predict/") or kind not in KINDS:
+            return self._send(404, b"Not Found", "text/plain")
+        if self.headers.get("X-Feature-Hash") != feature_registry.FEATURE_HASH:
+            return self._send(409, f"server feature set is {feature_registry.FEATURE_HASH}".encode(),
+                              "text/plain")
+
+        holder = self.server.holder
+        models = holder.models
+        client_sig = self.headers.get("X-Model-Signature")
+        if client_sig is not None:
+            models = holder.serving(client_sig)
+            if models is None:
+                return self._send(409, f"server models ({holder.models.digest}) are not the client's "
+                                       f"model files ({client_sig})".encode(), "text/plain")
+
+        n = len(feature_registry.FEATURE_NAMES)
+        if len(body) % (8 * n):
+            return self._send(400, f"body is not float64 rows of {n} features".encode(), "text/plain")
+        X = np.frombuffer(body, dtype=np.float64).reshape(-1, n)
+        try:
+            prob = models.score(X, kind)
+        except Exception as e:
+            return self._send(500, f"{type(e).__name__}: {e}".encode(), "text/plain")
+        self._send(200, np.ascontiguousarray(prob, dtype=np.float64).tobytes())
+
+    def log_message(self, fmt, *args):
+        if not self.server.quiet:
+            super().log_message(fmt, *args)
+
+
+def serve(port=None, host=None, quiet=True, poll=RELOAD_POLL):
+    """
+    Started server (not yet serving): loads and validates the models,
+    starts the reloader.
+    """
+    default_host, default_port = address() or DEFAULT_ADDRESS.split(":")
+    holder = ModelHolder(poll=poll)
+    httpd = ThreadingHTTPServer((host or default_host, int(port or default_port)), Handler)
+    httpd.daemon_threads = True
+    httpd.holder = holder
+    httpd.quiet = quiet
+    holder.start()
+    return httpd
+
+
+def serve_forever(port=None, host=None, quiet=True):
+    httpd = serve(port, host, quiet)
+    h, p = httpd.server_address[:2]
+    models = httpd.holder.models.describe()["models"]
+    print("NIFTY-LAB | MODEL SERVER")
+    print(f"🛰  http://{h}:{p} | feature set {feature_registry.FEATURE_HASH}")
+    for name, path in models.items():
+        print(f"📦 {name:<5}: {path}")
+    print(f"🔄 Hot reload every {RELOAD_POLL:g}s (Ctrl-C to stop)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.holder.stop()
+        httpd.server_close()
+
+# ==================================================
+# CLIENT
+# ==================================================
+_local = threading.local()
+_down_until = 0.0
+
+
+def _connection(addr):
+    conn = getattr(_local, "conn", None)
+    if conn is None or (conn.host, conn.port) != addr:
+        conn = http.client.HTTPConnection(*addr, timeout=TIMEOUT)
+        _local.conn = conn
+    return conn
+
+
+def _request(method, path, body=None, headers=None):
+    """
+    (status, body) from the server, None when it cannot be reached.
+    """
+    global _down_until
+    addr = address()
+    if addr is None or time.monotonic() < _down_until:
+        return None
+    conn = _connection(addr)
+    for _ in range(2):              # a kept-alive connection may have been closed
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            r = conn.getresponse()
+            return r.status, r.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+    _down_until = time.monotonic() + RETRY_AFTER
+    return None
+
+
+def health():
+    """
+    /health of the server when it runs this feature set, else None.
+    """
+    res = _request("GET", "/health")
+    if res is None or res[0] != 200:
+        return None
+    info = json.loads(res[1])
+    return info if info.get("feature_hash") == feature_registry.FEATURE_HASH else None
+
+
+def score(X, kind="daily"):
+    """
+    PROB_UP per row from the server, None when no server answers (or it
+    refuses the rows, or cannot serve the model files on disk now): the
+    caller scores in-process instead.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    res = _request("POST", f"/predict/{kind}", body=X.tobytes(), headers={
+        "Content-Type": "application/octet-stream",
+        "X-Feature-Hash": feature_registry.FEATURE_HASH,
+        "X-Model-Signature": digest(signature(model_files())),
+    })
+    if res is None:
+        return None
+    status, body = res
+    if status != 200:
+        print(f"⚠ Model server answered {status} ({body.decode(errors='replace')}): scoring in-process")
+        return None
+    return np.frombuffer(body, dtype=np.float64).copy()
+
+# ==================================================
+# CLI
+# ==================================================
+def main():
+    parser = argparse.ArgumentParser(description="Warm model server on localhost")
+    parser.add_argument("--port", type=int, help=f"default from NIFTY_MODEL_SERVER or {DEFAULT_ADDRESS}")
+    parser.add_argument("--host")
+    parser.add_argument("--log", action="store_true", help="log every request")
+    args = parser.parse_args()
+    serve_forever(args.port, args.host, quiet=not args.log)
+
+
+if __name__ == "__main__":
+    main()
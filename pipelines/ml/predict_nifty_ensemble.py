@@ -4,18 +4,21 @@
 """
 NIFTY-LAB | DAILY XGBOOST ENSEMBLE PREDICTION (PRODUCTION SAFE)
 
-✔ Exact feature alignment with training
-✔ Auto-fills missing one-hot regime columns
-✔ Drops extra columns safely
+✔ Features + order from the registry (pipelines/ml/feature_registry.py),
+  model checked against the registry feature set at load
 ✔ Uses calibrated probabilities
+✔ Fast path: native booster + fused temperature scaling
+  (pipelines/ml/fast_inference.py)
 ✔ Backtest = Daily = Live compatible
+✔ predict(features) usable in-process; models loaded once per process
+✔ Scored by the warm model server when one runs (pipelines/ml/
+  model_server.py), in-process otherwise
 """
 
 import sys
 from pathlib import Path
 import pandas as pd
 import joblib
-import warnings
 import numpy as np
 
 # ==================================================
@@ -25,100 +28,105 @@ ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from configs.paths import PROC_DIR
+from configs.paths import MODEL_DIR, PROC_DIR
+from pipelines.ml import fast_inference, feature_registry, model_server
+from pipelines.storage import bus, outputs
 
 # ==================================================
 # PATHS
 # ==================================================
 FEAT_FILE = PROC_DIR / "ml" / "nifty_inference_features.parquet"
 
-MODEL_DIR = ROOT / "models"
 XGB_MODEL = MODEL_DIR / "nifty_xgb_gpu.joblib"
 CALIB    = MODEL_DIR / "nifty_xgb_temp_scaler.joblib"
 
 OUT_DIR = PROC_DIR / "ml"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
 OUT_CSV = OUT_DIR / "nifty_ml_daily_prediction.csv"
 OUT_PQ  = OUT_DIR / "nifty_ml_daily_prediction.parquet"
 
-# ==================================================
-# LOAD INFERENCE FEATURES
-# ==================================================
-print("📥 Loading inference features...")
-df = pd.read_parquet(FEAT_FILE)
-
-if "date" not in df.columns:
-    raise RuntimeError("❌ 'date' column missing in inference features")
-
-dates = df["date"].copy()
-X_raw = df.drop(columns=["date"], errors="ignore")
+_models = {}
 
 # ==================================================
 # LOAD MODEL & CALIBRATOR
 # ==================================================
-print("📦 Loading XGBoost model & calibrator...")
-xgb = joblib.load(XGB_MODEL)
-cal = joblib.load(CALIB)
+def load_models(xgb_model=XGB_MODEL, calib=CALIB):
+    """
+    (xgb, calibrator), cached per path pair.
+    """
+    key = (str(xgb_model), str(calib))
+    if key not in _models:
+        print("📦 Loading XGBoost model & calibrator...")
+        xgb = joblib.load(xgb_model)
+        feature_registry.check_model(xgb_model, xgb)
+        feature_registry.check_model(calib)
+        _models[key] = (xgb, joblib.load(calib))
+    return _models[key]
 
 # ==================================================
-# ENFORCE EXACT FEATURE SET (CRITICAL FIX)
+# PREDICT (SAFE)
 # ==================================================
-expected_features = xgb.get_booster().feature_names
+def score(X: np.ndarray, xgb, cal) -> np.ndarray:
+    """
+    Calibrated PROB_UP per row of the registry matrix.
+    """
+    return fast_inference.compile_scorer(xgb, cal)(X)
 
-print(f"🧠 Features used ({len(expected_features)}):")
-print(expected_features)
 
-# --------------------------------------------------
-# FIX MISSING / EXTRA FEATURES
-# --------------------------------------------------
-missing = set(expected_features) - set(X_raw.columns)
-extra   = set(X_raw.columns) - set(expected_features)
+def predict(df: pd.DataFrame, xgb=None, cal=None) -> pd.DataFrame:
+    """
+    DATE / PROB_UP / PROB_DOWN for each row of the inference features.
+    Without models: the model server's, else loaded here.
+    """
+    if "date" not in df.columns:
+        raise RuntimeError("❌ 'date' column missing in inference features")
 
-# ➕ Add missing one-hot columns as ZERO
-for col in missing:
-    X_raw[col] = 0.0
+    print(f"🧠 Features used ({len(feature_registry.FEATURE_NAMES)}, set {feature_registry.FEATURE_HASH})")
+    X = feature_registry.matrix(df)
 
-# ➖ Drop extra columns
-if extra:
-    X_raw = X_raw.drop(columns=list(extra))
+    prob_up = None
+    if xgb is None or cal is None:
+        prob_up = model_server.score(X, "daily")
+        if prob_up is not None:
+            print("🛰 Scored by the model server")
+        else:
+            xgb, cal = load_models()
 
-# 🔁 Enforce strict column order
-X = X_raw[expected_features]
+    if prob_up is None:
+        print("🤖 Predicting daily probabilities...")
+        prob_up = score(X, xgb, cal)
 
-# ==================================================
-# PREDICT (SAFE)
-# ==================================================
-print("🤖 Predicting daily probabilities...")
+    return pd.DataFrame({
+        "DATE": df["date"].values,
+        "PROB_UP": prob_up,
+        "PROB_DOWN": 1.0 - prob_up
+    })
 
-with warnings.catch_warnings():
-    warnings.simplefilter("ignore")
-    raw_prob = xgb.predict_proba(X)[:, 1]
 
-# ==================================================
-# CALIBRATION (LOGITS → PROB)
-# ==================================================
-eps = 1e-6
-logits = np.log((raw_prob + eps) / (1 - raw_prob + eps))
-prob_up = cal.transform(logits).ravel()
+def run(feat_file=FEAT_FILE, out_pq=OUT_PQ, out_csv=OUT_CSV) -> pd.DataFrame:
+    """
+    Stage entry: read the features (data bus first), predict, save
+    (out_pq=None skips).
+    """
+    print("📥 Loading inference features...")
+    out = predict(bus.read_parquet(feat_file))
+
+    if out_pq is not None:
+        Path(out_pq).parent.mkdir(parents=True, exist_ok=True)
+        outputs.write(out, out_pq, out_csv)
+    return out
 
 # ==================================================
-# OUTPUT
+# CLI
 # ==================================================
-out = pd.DataFrame({
-    "DATE": dates,
-    "PROB_UP": prob_up,
-    "PROB_DOWN": 1.0 - prob_up
-})
+def main():
+    out = run()
 
-out.to_csv(OUT_CSV, index=False)
-out.to_parquet(OUT_PQ, index=False)
+    print("\n✅ DAILY XGBOOST PREDICTION READY")
+    print(f"📦 CSV     : {OUT_CSV}")
+    print(f"📦 Parquet : {OUT_PQ}")
+    print("\nSignal:")
+    print(out.tail(1).T)
 
-# ==================================================
-# SUMMARY
-# ==================================================
-print("\n✅ DAILY XGBOOST PREDICTION READY")
-print(f"📦 CSV     : {OUT_CSV}")
-print(f"📦 Parquet : {OUT_PQ}")
-print("\nSignal:")
-print(out.tail(1).T)
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,20 @@
 """
 NIFTY-LAB | HISTORICAL ENSEMBLE PREDICTION (XGBOOST SAFE)
 
-✔ Exact feature name match
-✔ Exact feature order match
-✔ Case sensitive safe
+✔ Features + order from the registry (pipelines/ml/feature_registry.py),
+  read from the feature store (registry columns only)
+✔ Models checked against the registry feature set at load
+✔ Fast path: native boosters (pipelines/ml/fast_inference.py)
+✔ Scored by the warm model server when one runs (pipelines/ml/
+  model_server.py), in-process otherwise
 ✔ CSV + Parquet output
 ✔ Production ready
+✔ predict(features) / run() importable
 """
 
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import joblib
 
@@ -23,100 +28,99 @@ ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from configs.paths import PROC_DIR, MODEL_DIR
+from configs.paths import LGBM_MODEL_FILE, PROC_DIR, MODEL_DIR
+from pipelines.ml import fast_inference, feature_registry, feature_store, model_server
+from pipelines.storage import outputs
 
 # ==================================================
 # PATHS
 # ==================================================
-DATA_FILE = PROC_DIR / "ml" / "nifty_ml_features_hist_no_pcr.csv"
+XGB_MODEL  = MODEL_DIR / "nifty_xgb_gpu.joblib"
+LGBM_MODEL = LGBM_MODEL_FILE
 
 OUT_DIR = PROC_DIR / "ml"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
 OUT_CSV = OUT_DIR / "nifty_ml_prediction.csv"
 OUT_PQ  = OUT_DIR / "nifty_ml_prediction.parquet"
 
-# ==================================================
-# LOAD DATA
-# ==================================================
-print("📥 Loading historical ML features...")
-df = pd.read_csv(DATA_FILE)
-
-# normalize column names
-df.columns = df.columns.str.lower()
-
-# ==================================================
-# 🔒 RENAME → EXACT TRAINING SCHEMA
-# ==================================================
-df = df.rename(columns={
-    "regime_long_buildup": "regime_LONG_BUILDUP",
-    "regime_short_covering": "regime_SHORT_COVERING",
-    "regime_no_data": "regime_NO_DATA",
-})
-
-# ==================================================
-# 🔒 EXACT FEATURE ORDER (THIS IS THE KEY FIX)
-# ==================================================
-FEATURES = [
-    "close",
-    "ret_1d",
-    "ret_3d",
-    "atr_pct",
-    "trend_up",
-    "oi_change_pct",
-    "regime_LONG_BUILDUP",
-    "regime_NO_DATA",            # ⚠ ORDER MATTERS
-    "regime_SHORT_COVERING",     # ⚠ ORDER MATTERS
-]
-
-missing = set(FEATURES) - set(df.columns)
-if missing:
-    raise RuntimeError(f"❌ Missing required features: {missing}")
-
-# FORCE ORDER
-X = df.loc[:, FEATURES].copy()
-
 # ==================================================
 # LOAD MODELS
 # ==================================================
-print("📦 Loading models...")
-
-xgb = joblib.load(MODEL_DIR / "nifty_xgb_gpu.joblib")
-
-lgbm_path = MODEL_DIR / "nifty_lgbm.joblib"
-lgbm = joblib.load(lgbm_path) if lgbm_path.exists() else None
+def load_models(xgb_model=XGB_MODEL, lgbm_model=LGBM_MODEL):
+    """
+    (xgb, lgbm or None when that model was never trained).
+    """
+    print("📦 Loading models...")
+    xgb = joblib.load(xgb_model)
+    feature_registry.check_model(xgb_model, xgb)
+    lgbm = None
+    if Path(lgbm_model).exists():
+        lgbm = joblib.load(lgbm_model)
+        feature_registry.check_model(lgbm_model, lgbm)
+    return xgb, lgbm
 
 # ==================================================
 # PREDICT
 # ==================================================
-print("🤖 Predicting historical probabilities...")
-
-p_xgb = xgb.predict_proba(X)[:, 1]
-
-if lgbm:
-    p_lgbm = lgbm.predict_proba(X)[:, 1]
-    p_ens = (p_xgb + p_lgbm) / 2
-else:
-    p_ens = p_xgb
-
-# ==================================================
-# OUTPUT
-# ==================================================
-out = pd.DataFrame({
-    "DATE": pd.to_datetime(df["date"]),
-    "PROB_UP": p_ens,
-    "PROB_DOWN": 1 - p_ens,
-})
-
-out.to_csv(OUT_CSV, index=False)
-out.to_parquet(OUT_PQ, index=False)
-
-# ==================================================
-# SUMMARY
-# ==================================================
-print("\n✅ HISTORICAL ENSEMBLE PREDICTIONS READY")
-print(f"📦 CSV     : {OUT_CSV}")
-print(f"📦 Parquet : {OUT_PQ}")
-print(f"📊 Rows    : {len(out):,}")
-print("\nSample:")
-print(out.head(3))
+def score(X: np.ndarray, xgb, lgbm=None) -> np.ndarray:
+    """
+    Ensemble PROB_UP per row of the registry matrix (XGB alone without
+    lgbm).
+    """
+    return fast_inference.compile_scorer(xgb, lgbm=lgbm)(X)
+
+
+def predict(df: pd.DataFrame, xgb=None, lgbm=None) -> pd.DataFrame:
+    """
+    DATE / PROB_UP / PROB_DOWN for every row of the feature history.
+    Without models: the model server's, else loaded here.
+    """
+    X = feature_registry.matrix(df)
+
+    p_ens = None
+    if xgb is None:
+        p_ens = model_server.score(X, "historical")
+        if p_ens is not None:
+            print("🛰 Scored by the model server")
+        else:
+            xgb, lgbm = load_models()
+
+    if p_ens is None:
+        print("🤖 Predicting historical probabilities...")
+        p_ens = score(X, xgb, lgbm)
+
+    return pd.DataFrame({
+        "DATE": pd.to_datetime(df["date"]).values,
+        "PROB_UP": p_ens,
+        "PROB_DOWN": 1 - p_ens,
+    })
+
+
+def run(watermark=None, out_pq=OUT_PQ, out_csv=OUT_CSV) -> pd.DataFrame:
+    """
+    Stage entry: read the feature history (up to watermark, default the
+    store's), predict, save (out_pq=None skips).
+    """
+    print("📥 Loading historical ML features...")
+    out = predict(feature_store.read(columns=feature_registry.FEATURE_NAMES, watermark=watermark))
+
+    if out_pq is not None:
+        Path(out_pq).parent.mkdir(parents=True, exist_ok=True)
+        outputs.write(out, out_pq, out_csv)
+    return out
+
+# ==================================================
+# CLI
+# ==================================================
+def main():
+    out = run()
+
+    print("\n✅ HISTORICAL ENSEMBLE PREDICTIONS READY")
+    print(f"📦 CSV     : {OUT_CSV}")
+    print(f"📦 Parquet : {OUT_PQ}")
+    print(f"📊 Rows    : {len(out):,}")
+    print("\nSample:")
+    print(out.head(3))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,8 @@
 """
 NIFTY-LAB | HISTORICAL ML PREDICTION (CANONICAL SAFE)
 
-✔ Uses CANONICAL features
-✔ Strict feature alignment
+✔ Uses the historical ML features (feature store, registry columns)
+✔ Model checked against the registry feature set
 ✔ No leakage
 ✔ Backtest ready
 """
@@ -15,35 +15,32 @@ import pandas as pd
 from pathlib import Path
 
 from configs.paths import BASE_DIR
+from pipelines.ml import feature_registry, feature_store
 
 print("🚀 Building historical ML predictions (canonical aligned)")
 
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-FEATURE_FILE = BASE_DIR / "data/processed/ml/nifty_ml_features_CANONICAL.parquet"
 MODEL_FILE   = BASE_DIR / "models/nifty_xgb_gpu.joblib"
 OUT_FILE     = BASE_DIR / "data/processed/ml/nifty_ml_prediction_historical.parquet"
 
 # --------------------------------------------------
 # LOAD
 # --------------------------------------------------
-if not FEATURE_FILE.exists():
-    raise FileNotFoundError(f"Missing features: {FEATURE_FILE}")
-
 if not MODEL_FILE.exists():
     raise FileNotFoundError(f"Missing model: {MODEL_FILE}")
 
-df = pd.read_parquet(FEATURE_FILE)
+df = feature_store.read(columns=feature_registry.FEATURE_NAMES)
 model = joblib.load(MODEL_FILE)
 
 # --------------------------------------------------
-# FEATURE ALIGNMENT (CRITICAL)
+# FEATURES (REGISTRY ORDER)
 # --------------------------------------------------
-feature_names = model.get_booster().feature_names
-print(f"✔ Model expects {len(feature_names)} features")
+feature_registry.check_model(MODEL_FILE, model)
+print(f"✔ Feature set {feature_registry.FEATURE_HASH} ({len(feature_registry.FEATURE_NAMES)} features)")
 
-X = df[feature_names].copy()
+X = feature_registry.matrix(df)
 
 # --------------------------------------------------
 # PREDICT
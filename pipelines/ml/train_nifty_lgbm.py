@@ -5,7 +5,8 @@
 NIFTY-LAB | LIGHTGBM TRAINING (PRODUCTION SAFE)
 
 ✔ Drop-in replacement for XGBoost
-✔ Uses canonical ML features
+✔ Uses the historical ML features (feature store, registry columns)
+✔ Feature set hash saved next to the model
 ✔ Time-safe split
 ✔ No API issues
 """
@@ -15,28 +16,27 @@ import lightgbm as lgb
 import joblib
 from pathlib import Path
 
-from configs.paths import BASE_DIR
+from configs.paths import LGBM_MODEL_FILE, MODEL_DIR
+from pipelines.ml import feature_registry, feature_store
 
 print("🚀 TRAINING LIGHTGBM (NIFTY)")
 
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-DATA_FILE = BASE_DIR / "data/processed/ml/nifty_ml_features_CANONICAL.parquet"
-MODEL_DIR = BASE_DIR / "models"
 MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
-MODEL_FILE = MODEL_DIR / "nifty_lgbm_model.joblib"
+MODEL_FILE = LGBM_MODEL_FILE
 
 # --------------------------------------------------
 # LOAD DATA
 # --------------------------------------------------
-df = pd.read_parquet(DATA_FILE).dropna()
+WATERMARK = feature_store.key()[1]
+df = feature_store.training_set(WATERMARK).dropna()
 
 TARGET = "target"
-DROP_COLS = ["date", "next_ret", TARGET]
 
-X = df.drop(columns=DROP_COLS)
+X = df[feature_registry.FEATURE_NAMES]
 y = df[TARGET].astype(int)
 
 # --------------------------------------------------
@@ -80,6 +80,7 @@ model.fit(
 # SAVE MODEL
 # --------------------------------------------------
 joblib.dump(model, MODEL_FILE)
+feature_registry.save_model_meta(MODEL_FILE, watermark=WATERMARK)
 
 print("✅ LIGHTGBM MODEL TRAINED")
 print(f"💾 Saved → {MODEL_FILE}")
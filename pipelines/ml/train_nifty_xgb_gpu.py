@@ -4,27 +4,31 @@
 """
 NIFTY-LAB | XGBOOST GPU TRAINING (HISTORICAL)
 
-✔ Uses full historical ML dataset
-✔ PCR + OI + Regime aware
+✔ Uses the full historical ML features (feature store, rows with a target)
+✔ OI + Regime aware, features from the registry
+✔ Feature set hash saved next to the model
 ✔ Time-safe split
 ✔ RTX 3080 Ti (CUDA)
 ✔ Production ready
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 import joblib
 from xgboost import XGBClassifier
 from sklearn.metrics import accuracy_score, roc_auc_score
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import MODEL_DIR
+from pipelines.ml import feature_registry, feature_store
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-
-DATA_FILE = BASE / "data" / "processed" / "ml" / "nifty_ml_features_train.parquet"
-
-MODEL_DIR = BASE / "models"
 MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
 MODEL_FILE = MODEL_DIR / "nifty_xgb_gpu.joblib"
@@ -34,16 +38,16 @@ MODEL_FILE = MODEL_DIR / "nifty_xgb_gpu.joblib"
 # --------------------------------------------------
 print("📥 Loading historical ML dataset...")
 
-df = pd.read_parquet(DATA_FILE)
-print(f"📊 Total rows : {len(df):,}")
+WATERMARK = feature_store.key()[1]
+df = feature_store.training_set(WATERMARK)    # last day: no target yet, dropped
+print(f"📊 Total rows : {len(df):,} | watermark {WATERMARK}")
 
 # --------------------------------------------------
 # FEATURES / TARGET
 # --------------------------------------------------
 TARGET = "target"
-DROP_COLS = ["date", "next_close", "next_ret", TARGET]
 
-X = df.drop(columns=DROP_COLS)
+X = df[feature_registry.FEATURE_NAMES]
 y = df[TARGET].astype(int)
 
 # --------------------------------------------------
@@ -97,9 +101,11 @@ print(f"AUC      : {auc:.4f}")
 # SAVE MODEL
 # --------------------------------------------------
 joblib.dump(model, MODEL_FILE)
+feature_registry.save_model_meta(MODEL_FILE, watermark=WATERMARK)
 
 print("\n✅ MODEL TRAINED & SAVED")
 print(f"💾 Model : {MODEL_FILE}")
+print(f"🧬 Feature set : {feature_registry.FEATURE_HASH}")
 
 # --------------------------------------------------
 # FEATURE IMPORTANCE
@@ -4,31 +4,39 @@
 """
 NIFTY-LAB | APPEND DAILY NIFTY OPTIONS TO MASTER (LOCKED)
 
-✔ Append-only
-✔ Date-aware
+✔ Append-only, one partition per new trade date
+✔ Date-aware (dates the master does not have yet)
+✔ Ledger: only new / changed daily files are opened
 ✔ MASTER SAFETY LOCK
-✔ Auto-backup before write
+✔ Existing partitions rewritten only for changed / healing daily files
 ✔ NIFTY OPTIDX only
-✔ Deduplicated & sorted
+✔ Deduplicated & sorted per partition
+✔ CSV mirror per configs/outputs.py: rows of new files appended (eager);
+  rows of changed / healing files queue a full re-export instead
+✔ Whole run holds the options master lock
 ✔ Scheduler-safe
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
-import shutil
-from datetime import datetime
 
 # --------------------------------------------------
-# PATHS
+# PROJECT ROOT
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-DAILY_DIR  = BASE / "data" / "processed" / "daily" / "options"
-CONTINUOUS = BASE / "data" / "continuous"
-CONTINUOUS.mkdir(parents=True, exist_ok=True)
+from configs.paths import PROC_OPT_DAILY, MASTER_OPTIONS_DS, MASTER_OPTIONS_CSV
+from pipelines.options import master_store
+from pipelines.storage import ledger, outputs
 
-MASTER_PQ  = CONTINUOUS / "master_options.parquet"
-MASTER_CSV = CONTINUOUS / "master_options.csv"
+# --------------------------------------------------
+# PATHS
+# --------------------------------------------------
+DAILY_DIR  = PROC_OPT_DAILY
+MASTER_CSV = MASTER_OPTIONS_CSV
 
 # --------------------------------------------------
 # FINAL MASTER SCHEMA
@@ -87,14 +95,15 @@ def ensure_numeric(df):
     ]
     for c in numeric_cols:
         if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
+            # float64 everywhere → one schema across partitions
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype("float64")
     return df
 
 
 # --------------------------------------------------
 # MAIN
 # --------------------------------------------------
-def main():
+def update_master():
     print("NIFTY-LAB | APPEND DAILY NIFTY OPTIONS TO MASTER")
     print("-" * 60)
 
@@ -105,106 +114,102 @@ def main():
 
     print(f"Daily files found : {len(daily_files)}")
 
-    # ---------- Load master with HARD LOCK ----------
-    if MASTER_PQ.exists():
-        master = pd.read_parquet(MASTER_PQ)
-        master = normalize_columns(master)
-        master = fix_dates(master)
-        master = ensure_numeric(master)
-        master = master[COLUMNS]
+    # ---------- Master state with HARD LOCK (manifest only) ----------
+    m = master_store.load_manifest()
+    last_date = master_store.latest_date()
 
-        print(f"Loaded master rows : {len(master):,}")
+    if last_date is not None:
+        print(f"Master rows      : {m['rows']:,}")
 
         # 🔒 SAFETY LOCK
-        if len(master) < 100_000:
+        if m["rows"] < 100_000:
             raise RuntimeError(
                 "MASTER OPTIONS TOO SMALL — POSSIBLE CORRUPTION. "
                 "REFUSING TO MODIFY."
             )
 
-        last_date = master["TRADE_DATE"].max()
-        print(f"Last master date : {last_date.date()}")
+        print(f"Last master date : {last_date}")
 
     else:
-        master = pd.DataFrame(columns=COLUMNS)
-        last_date = None
+        m = None
         print("Master does not exist — creating new")
 
-    # ---------- Load only NEW daily data ----------
+    # ---------- Open only new / changed / healing daily files ----------
+    led = ledger.Ledger(MASTER_OPTIONS_DS)
+    todo = led.pending(daily_files, m)
+    print(f"Files to open     : {len(todo)} (ledger skipped {len(daily_files) - len(todo)})")
+
     daily_frames = []
+    seen = []
+    restated = False          # rows the CSV mirror may already hold
 
-    for f in daily_files:
+    for f, status in todo:
         df = pd.read_parquet(f)
         df = normalize_columns(df)
         df = fix_dates(df)
         df = ensure_numeric(df)
 
-        if last_date is not None and df["TRADE_DATE"].max() <= last_date:
-            continue
-
         missing = [c for c in COLUMNS if c not in df.columns]
         if missing:
+            seen.append((f, 0, set()))
             continue
 
         df = df[COLUMNS]
 
         # OPTIDX only
         df = df[df["INSTRUMENT"] == "OPTIDX"]
+        seen.append((f, len(df), ledger.file_dates(df, "TRADE_DATE")))
 
-        if last_date is not None:
-            df = df[df["TRADE_DATE"] > last_date]
-
+        df = ledger.new_rows(df, "TRADE_DATE", status, m)
         if not df.empty:
             daily_frames.append(df)
+            restated |= status != ledger.NEW
 
     if not daily_frames:
+        for f, rows, dates in seen:
+            led.record(f, rows, dates)
+        led.save()
         print("No new options data to append")
         return
 
     daily_new = pd.concat(daily_frames, ignore_index=True)
+    daily_new = daily_new.dropna(subset=["TRADE_DATE"])
     print(f"New rows appended : {len(daily_new):,}")
 
-    # ---------- Combine & dedupe ----------
-    combined = (
-        pd.concat([master, daily_new], ignore_index=True)
-        .drop_duplicates(
-            subset=[
-                "INSTRUMENT",
-                "TRADE_DATE",
-                "EXP_DATE",
-                "STR_PRICE",
-                "OPT_TYPE",
-            ],
-            keep="last",
-        )
-        .sort_values(
-            ["TRADE_DATE", "EXP_DATE", "STR_PRICE", "OPT_TYPE"]
-        )
-        .reset_index(drop=True)
-    )
+    # ---------- Write new partitions (dedupe + sort inside each) ----------
+    written = master_store.append(daily_new)
 
-    # ---------- Backup before save ----------
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    shutil.copy2(
-        MASTER_PQ,
-        MASTER_PQ.with_name(f"master_options_backup_{ts}.parquet")
-    )
-    shutil.copy2(
+    # ---------- CSV mirror: append new rows (eager) or queue export ----------
+    outputs.append_mirror(
+        daily_new
+        .drop_duplicates(subset=master_store.KEYS, keep="last")
+        .sort_values(master_store.SORT_BY),
         MASTER_CSV,
-        MASTER_CSV.with_name(f"master_options_backup_{ts}.csv")
+        MASTER_OPTIONS_DS,
+        restated=restated,
     )
 
-    # ---------- Save ----------
-    combined.to_parquet(MASTER_PQ, index=False)
-    combined.to_csv(MASTER_CSV, index=False)
+    # ---------- Ledger: only after the master write succeeded ----------
+    for f, rows, dates in seen:
+        led.record(f, rows, dates)
+    led.save()
+
+    dates = master_store.trade_dates()
 
     print("-" * 60)
     print("MASTER OPTIONS UPDATED SAFELY")
-    print(f"Rows : {len(combined):,}")
-    print(f"From : {combined['TRADE_DATE'].min().date()}")
-    print(f"To   : {combined['TRADE_DATE'].max().date()}")
+    print(f"Partitions written : {len(written)}")
+    print(f"Rows : {master_store.row_count():,}")
+    print(f"From : {dates[0]}")
+    print(f"To   : {dates[-1]}")
+    print(f"Store: {MASTER_OPTIONS_DS}")
     print("DONE")
 
 
+def main():
+    with master_store.lock():
+        update_master()
+
+
 if __name__ == "__main__":
     main()
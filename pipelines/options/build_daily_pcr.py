@@ -4,24 +4,30 @@
 """
 NIFTY-LAB | DAILY PCR BUILDER (PROD SAFE)
 
-✔ Uses master_options.parquet
+✔ Uses master options store (latest partition only)
 ✔ OPTIDX only
 ✔ Latest trade date
 ✔ Smart expiry selection
 ✔ Robust string normalization
-✔ Parquet + CSV output
+✔ Parquet output (+ CSV mirror per configs/outputs.py)
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import OPTIONS_ML_DIR
+from pipelines.storage.masters import load_options
+from pipelines.storage import outputs
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-
-MASTER_OPT = BASE / "data" / "continuous" / "master_options.parquet"
-OUT_DIR    = BASE / "data" / "processed" / "options_ml"
+OUT_DIR    = OPTIONS_ML_DIR
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 OUT_PQ  = OUT_DIR / "nifty_pcr_daily.parquet"
@@ -33,7 +39,11 @@ print("-" * 60)
 # --------------------------------------------------
 # LOAD
 # --------------------------------------------------
-df = pd.read_parquet(MASTER_OPT)
+# Only the newest TRADE_DATE partition + needed columns are read
+df = load_options(
+    latest=True,
+    columns=["INSTRUMENT", "TRADE_DATE", "EXP_DATE", "OPT_TYPE", "OPEN_INT"],
+)
 
 # --------------------------------------------------
 # NORMALIZE (CRITICAL)
@@ -117,8 +127,7 @@ else:
 # --------------------------------------------------
 # SAVE
 # --------------------------------------------------
-out.to_parquet(OUT_PQ, index=False)
-out.to_csv(OUT_CSV, index=False)
+outputs.write(out, OUT_PQ, OUT_CSV)
 
 print(" PCR BUILD COMPLETE")
 print(out)
@@ -9,6 +9,9 @@ and merges it with existing daily PCR.
 
 Output:
 - data/processed/options_ml/nifty_pcr_daily.parquet
+
+Importable: daily_pcr(df) for one options table, build(files),
+merge_pcr(existing, new), run() for the whole stage.
 """
 
 # =================================================
@@ -17,7 +20,7 @@ Output:
 import sys
 from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[2]  # H:\NIFTY-LAB
+ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
@@ -26,38 +29,23 @@ if str(ROOT) not in sys.path:
 # =================================================
 import pandas as pd
 from configs.paths import RAW_DIR, PROC_DIR
+from pipelines.storage import outputs
 
 # =================================================
 # PATHS
 # =================================================
 HIST_DIR = RAW_DIR / "historical" / "options"
 OUT_DIR = PROC_DIR / "options_ml"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
 OUT_FILE = OUT_DIR / "nifty_pcr_daily.parquet"
 
 # =================================================
-# LOAD HISTORICAL FILES
-# =================================================
-files = list(HIST_DIR.glob("*.parquet")) + list(HIST_DIR.glob("*.csv"))
-
-if not files:
-    raise FileNotFoundError("❌ No historical options files found")
-
-records = []
-
-print(f"📥 Processing {len(files)} historical options files...")
-
-# =================================================
-# PROCESS EACH FILE
+# PCR OF ONE OPTIONS TABLE
 # =================================================
-for file in files:
-    print(f"   → {file.name}")
-
-    if file.suffix == ".parquet":
-        df = pd.read_parquet(file)
-    else:
-        df = pd.read_csv(file)
+def daily_pcr(df: pd.DataFrame, name="") -> list:
+    """
+    One PCR record per trade date (nearest expiry only).
+    """
+    df = df.copy()
 
     # ---------------- DATE ----------------
     if "TRADE_DATE" in df.columns:
@@ -100,11 +88,10 @@ for file in files:
             df.loc[pe_mask, "opt_type"] = "PE"
 
     if df["opt_type"].isna().all():
-        raise ValueError(f"❌ Could not detect CE/PE in {file.name}")
+        raise ValueError(f"❌ Could not detect CE/PE in {name}")
 
-    # =================================================
-    # BUILD PCR PER DAY
-    # =================================================
+    # ---------------- PCR PER DAY ----------------
+    records = []
     for date, dfd in df.groupby("date"):
         dfd = dfd.sort_values("expiry")
         nearest_expiry = dfd["expiry"].iloc[0]
@@ -123,35 +110,67 @@ for file in files:
             "total_call_oi": call_oi,
             "pcr": round(put_oi / call_oi, 3),
         })
+    return records
 
 # =================================================
 # BUILD HISTORICAL PCR DF
 # =================================================
-hist_df = pd.DataFrame(records)
-hist_df = hist_df.sort_values("date").drop_duplicates("date")
+def build(files) -> pd.DataFrame:
+    records = []
+    print(f"📥 Processing {len(files)} historical options files...")
+    for file in files:
+        print(f"   → {file.name}")
+        df = pd.read_parquet(file) if file.suffix == ".parquet" else pd.read_csv(file)
+        records.extend(daily_pcr(df, file.name))
 
-# =================================================
-# MERGE WITH EXISTING DAILY PCR
-# =================================================
-if OUT_FILE.exists():
-    daily_df = pd.read_parquet(OUT_FILE)
+    hist_df = pd.DataFrame(records)
+    return hist_df.sort_values("date").drop_duplicates("date")
+
+
+def merge_pcr(daily_df, hist_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Existing daily PCR (or None) + historical PCR, one row per date.
+    """
+    if daily_df is None:
+        return hist_df
     final_df = pd.concat([daily_df, hist_df], ignore_index=True)
-    final_df = final_df.sort_values("date").drop_duplicates("date")
-else:
-    final_df = hist_df
+    return final_df.sort_values("date").drop_duplicates("date")
 
-# =================================================
-# SAVE
-# =================================================
-final_df.to_parquet(OUT_FILE, index=False)
-final_df.to_csv(OUT_FILE.with_suffix(".csv"), index=False)
+
+def run(hist_dir=HIST_DIR, out_file=OUT_FILE) -> pd.DataFrame:
+    """
+    Stage entry: historical options files in, merged PCR parquet out
+    (out_file=None skips saving).
+    """
+    hist_dir = Path(hist_dir)
+    files = list(hist_dir.glob("*.parquet")) + list(hist_dir.glob("*.csv"))
+    if not files:
+        raise FileNotFoundError("❌ No historical options files found")
+
+    hist_df = build(files)
+
+    # MERGE WITH EXISTING DAILY PCR
+    existing = OUT_FILE if out_file is None else Path(out_file)
+    final_df = merge_pcr(pd.read_parquet(existing) if existing.exists() else None, hist_df)
+
+    if out_file is not None:
+        Path(out_file).parent.mkdir(parents=True, exist_ok=True)
+        outputs.write(final_df, out_file)
+    return final_df
 
 # =================================================
-# SUMMARY
+# CLI
 # =================================================
-print("\n✅ HISTORICAL PCR BUILD COMPLETE")
-print(f"📦 File: {OUT_FILE}")
-print("📅 Date range:", final_df['date'].min().date(), "→", final_df['date'].max().date())
-print("📊 Total PCR days:", len(final_df))
-print("\n📊 PCR Stats")
-print(final_df["pcr"].describe().round(3))
+def main():
+    final_df = run()
+
+    print("\n✅ HISTORICAL PCR BUILD COMPLETE")
+    print(f"📦 File: {OUT_FILE}")
+    print("📅 Date range:", final_df['date'].min().date(), "→", final_df['date'].max().date())
+    print("📊 Total PCR days:", len(final_df))
+    print("\n📊 PCR Stats")
+    print(final_df["pcr"].describe().round(3))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,54 +4,67 @@
 """
 NIFTY-LAB | CLEAN DAILY OPTIONS (AUTO | NIFTY ONLY)
 
+✔ Single-pass shared FO parser
 ✔ Holiday / delay safe
 ✔ Scheduler-safe
 ✔ Never fails pipeline
 """
 
+import sys
 from pathlib import Path
-from datetime import datetime, timedelta
-import zipfile
 import pandas as pd
-from io import StringIO
+
+# --------------------------------------------------
+# PROJECT ROOT
+# --------------------------------------------------
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import PROC_OPT_DAILY
+from pipelines.fo import raw_store
+from pipelines.fo.bhavcopy_parser import parse_fo_zip
+from pipelines.storage import outputs
 
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
-RAW_DIR = BASE / "data" / "raw" / "options"
-OUT_DIR = BASE / "data" / "processed" / "daily" / "options"
+OUT_DIR = PROC_OPT_DAILY
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # --------------------------------------------------
 # HELPERS
 # --------------------------------------------------
 def find_latest_fo_zip(max_lookback=7):
-    today = datetime.today().date()
-    for i in range(max_lookback):
-        d = today - timedelta(days=i)
-        f = RAW_DIR / f"fo_{d:%Y-%m-%d}.zip"
-        if f.exists():
-            return d, f
-    return None, None
-
-
-def read_nse_csv(f):
-    lines = f.read().decode("utf-8", errors="ignore").splitlines()
-    for i, line in enumerate(lines):
-        if line.strip().startswith("INSTRUMENT"):
-            return pd.read_csv(StringIO("\n".join(lines[i:])))
-    return None
-
-
-def normalize_columns(df):
-    df.columns = (
-        df.columns.astype(str)
-        .str.strip()
-        .str.upper()
-        .str.replace(" ", "_")
-    )
-    return df
+    return raw_store.latest(max_lookback)
+
+
+def clean_options(frames: dict, trade_date):
+    """
+    NIFTY index options from parsed FO frames (see parse_fo_zip).
+    Returns None when the day has no usable rows.
+    """
+    df = frames["OPTIDX"]
+    df = df[df["SYMBOL"] == "NIFTY"].copy()
+
+    if df.empty:
+        return None
+
+    df["TRADE_DATE"] = pd.to_datetime(trade_date)
+    df["EXP_DATE"] = pd.to_datetime(df["EXP_DATE"], dayfirst=True)
+
+    numeric_cols = [
+        "STR_PRICE", "OPEN_PRICE", "HI_PRICE", "LO_PRICE",
+        "CLOSE_PRICE", "OPEN_INT", "TRD_QTY"
+    ]
+
+    for c in numeric_cols:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+
+    df = df.dropna().drop_duplicates()
+
+    return df if not df.empty else None
 
 # --------------------------------------------------
 # MAIN
@@ -76,66 +89,14 @@ def main():
     print(f"Using FO ZIP : {zip_file.name}")
     print(f"Trade Date  : {trade_date}")
 
-    frames = []
-
-    with zipfile.ZipFile(zip_file) as z:
-        for name in z.namelist():
-            if not name.lower().endswith(".csv"):
-                continue
+    frames = parse_fo_zip(zip_file, trade_date)
+    df = clean_options(frames, trade_date)
 
-            with z.open(name) as f:
-                df = read_nse_csv(f)
-                if df is None or df.empty:
-                    continue
-
-                df = normalize_columns(df)
-
-                if not {"INSTRUMENT", "SYMBOL"}.issubset(df.columns):
-                    continue
-
-                df["INSTRUMENT"] = df["INSTRUMENT"].astype(str).str.strip()
-                df["SYMBOL"] = df["SYMBOL"].astype(str).str.strip()
-
-                df = df[
-                    (df["INSTRUMENT"] == "OPTIDX") &
-                    (df["SYMBOL"] == "NIFTY")
-                ]
-
-                if df.empty:
-                    continue
-
-                for c in ("EXP_DATE", "EXPIRY", "EXPIRY_DATE", "EXP_DT"):
-                    if c in df.columns:
-                        df.rename(columns={c: "EXP_DATE"}, inplace=True)
-                        break
-                else:
-                    continue
-
-                df["TRADE_DATE"] = trade_date
-                frames.append(df)
-
-    if not frames:
+    if df is None:
         print("No valid NIFTY options found — skipping")
         return  #  SOFT EXIT
 
-    df = pd.concat(frames, ignore_index=True)
-
-    df["TRADE_DATE"] = pd.to_datetime(df["TRADE_DATE"])
-    df["EXP_DATE"] = pd.to_datetime(df["EXP_DATE"], dayfirst=True)
-
-    numeric_cols = [
-        "STR_PRICE", "OPEN_PRICE", "HI_PRICE", "LO_PRICE",
-        "CLOSE_PRICE", "OPEN_INT", "TRD_QTY"
-    ]
-
-    for c in numeric_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-
-    df = df.dropna().drop_duplicates()
-
-    df.to_parquet(out_pq, index=False)
-    df.to_csv(out_csv, index=False)
+    outputs.write(df, out_pq, out_csv)
 
     print(f"Saved : {out_pq.name}")
     print(f"Rows  : {len(df)}")
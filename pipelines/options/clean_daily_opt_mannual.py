@@ -5,55 +5,30 @@
 NIFTY-LAB | CLEAN DAILY OPTIONS (NIFTY ONLY - FINAL FIX)
 
 ✅ NSE-safe spacing fix
-✅ Handles junk headers
-✅ ZIP filename → TRADE_DATE
+✅ Handles junk headers (shared single-pass FO parser)
+✅ Raw FO store day → TRADE_DATE
 ✅ OPTIDX + NIFTY only
 ✅ Keeps dates as datetime64[ns] (NO int64 nanoseconds)
 """
 
+import sys
 from pathlib import Path
-import zipfile
 import pandas as pd
-import re
-from io import StringIO
 
-# --------------------------------------------------
-# PATHS
-# --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-RAW_DIR = BASE / "data" / "raw" / "options"
-OUT_DIR = BASE / "data" / "processed" / "daily" / "options"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+from configs.paths import PROC_OPT_DAILY
+from pipelines.fo import raw_store
+from pipelines.fo.bhavcopy_parser import parse_fo_zip
+from pipelines.storage import outputs
 
 # --------------------------------------------------
-# HELPERS
+# PATHS
 # --------------------------------------------------
-def extract_trade_date(fname: str):
-    m = re.search(r"(\d{4}-\d{2}-\d{2})", fname)
-    return pd.to_datetime(m.group(1)) if m else None
-
-
-def read_nse_csv(f):
-    """Skip junk header lines until the INSTRUMENT row."""
-    lines = f.read().decode("utf-8", errors="ignore").splitlines()
-    for i, line in enumerate(lines):
-        if line.strip().startswith("INSTRUMENT"):
-            return pd.read_csv(StringIO("\n".join(lines[i:])))
-    return None
-
-
-def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df.columns = (
-        df.columns
-        .astype(str)
-        .str.strip()
-        .str.upper()
-        .str.replace(" ", "_")
-        .str.replace("*", "", regex=False)
-    )
-    return df
-
+OUT_DIR = PROC_OPT_DAILY
+OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # --------------------------------------------------
 # MAIN
@@ -62,15 +37,13 @@ def main():
     print("🧹 NIFTY-LAB | CLEAN DAILY OPTIONS (NIFTY ONLY)")
     print("-" * 60)
 
-    zip_files = sorted(RAW_DIR.glob("fo_*.zip"))
+    zip_files = raw_store.list_days()
     if not zip_files:
         print("⚠️ No FO ZIP files found")
         return
 
-    for zpath in zip_files:
-        trade_date = extract_trade_date(zpath.name)
-        if trade_date is None:
-            continue
+    for day, zpath in zip_files.items():
+        trade_date = pd.Timestamp(day)
 
         out = OUT_DIR / f"OPTIONS_NIFTY_{trade_date.date()}.parquet"
         if out.exists():
@@ -78,54 +51,14 @@ def main():
             continue
 
         print(f"\n📦 Processing: {zpath.name}")
-        frames = []
-
-        with zipfile.ZipFile(zpath) as z:
-            for name in z.namelist():
-                if not name.lower().endswith(".csv"):
-                    continue
-
-                with z.open(name) as f:
-                    df = read_nse_csv(f)
-                    if df is None or df.empty:
-                        continue
-
-                    df = normalize_columns(df)
-
-                    if not {"INSTRUMENT", "SYMBOL"}.issubset(df.columns):
-                        continue
-
-                    # --- strong filters ---
-                    df["INSTRUMENT"] = df["INSTRUMENT"].astype(str).str.strip().str.upper()
-                    df["SYMBOL"]     = df["SYMBOL"].astype(str).str.strip().str.upper()
+        frames = parse_fo_zip(zpath, trade_date)
+        df = frames["OPTIDX"]
+        df = df[df["SYMBOL"] == "NIFTY"].copy()
 
-                    df = df[
-                        (df["INSTRUMENT"] == "OPTIDX") &
-                        (df["SYMBOL"] == "NIFTY")
-                    ]
-                    if df.empty:
-                        continue
-
-                    # --- expiry column normalisation ---
-                    for c in ("EXP_DATE", "EXPIRY", "EXPIRY_DATE", "EXP_DT"):
-                        if c in df.columns:
-                            df.rename(columns={c: "EXP_DATE"}, inplace=True)
-                            break
-                    else:
-                        # no expiry column
-                        continue
-
-                    # add trade date
-                    df["TRADE_DATE"] = trade_date
-
-                    frames.append(df)
-
-        if not frames:
+        if df.empty:
             print("⚠️ No valid NIFTY options found")
             continue
 
-        df = pd.concat(frames, ignore_index=True)
-
         # ---- dates as datetime ----
        # ✅ FINAL DATE NORMALIZATION (CRITICAL)
         df["EXP_DATE"] = pd.to_datetime(df["EXP_DATE"], errors="coerce")
@@ -160,8 +93,7 @@ def main():
               .drop_duplicates()
         )
 
-        df.to_parquet(out, index=False)
-        df.to_csv(out.with_suffix(".csv"), index=False)
+        outputs.write(df, out)
 
         print(f"✅ Saved {out.name} | rows: {len(df):,}")
 
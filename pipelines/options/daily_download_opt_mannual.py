@@ -3,35 +3,24 @@
 
 """
 NIFTY-LAB | DAILY OPTIONS DOWNLOAD (FO ZIP)
+Saves into the shared raw FO store (data/raw/fo).
 RAW DATA ONLY — DO NOT CLEAN HERE
 """
 
+import sys
 from pathlib import Path
 from datetime import datetime
 import requests
 
 # --------------------------------------------------
-# PATHS
+# PROJECT ROOT
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB")
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-OUT_DIR = BASE / "data" / "raw" / "options"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
-# --------------------------------------------------
-# NSE CONFIG
-# --------------------------------------------------
-BASE_URL = "https://nsearchives.nseindia.com/archives/fo/mkt/fo{date}.zip"
-
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/121.0.0.0 Safari/537.36"
-    ),
-    "Accept": "*/*",
-    "Referer": "https://www.nseindia.com/",
-}
+from pipelines.fo import raw_store
+from pipelines.fo.daily_download_fo_auto import fetch_fo_zip, fo_url
 
 # --------------------------------------------------
 # MAIN
@@ -47,28 +36,26 @@ def main():
     else:
         trade_date = datetime.strptime(inp, "%Y-%m-%d")
 
-    tag = trade_date.strftime("%d%m%Y")
-    out = OUT_DIR / f"fo_{trade_date.date()}.zip"
-    url = BASE_URL.format(date=tag)
+    trade_date = trade_date.date()
+    url = fo_url(trade_date)
 
     print(f"🌐 URL  : {url}")
 
-    if out.exists():
-        print(f"⏩ Already downloaded: {out.name}")
+    if raw_store.has(trade_date):
+        print(f"⏩ Already downloaded: {trade_date}")
         return
 
     try:
-        r = requests.get(url, headers=HEADERS, timeout=20)
+        out = fetch_fo_zip(trade_date)
 
-        if r.status_code == 200 and len(r.content) > 50_000:
-            out.write_bytes(r.content)
+        if out is not None:
             print("✅ Download successful")
-            print(f"📅 Date  : {trade_date.date()}")
+            print(f"📅 Date  : {trade_date}")
             print(f"💾 Saved : {out}")
         else:
             print("❌ Bhavcopy not available (Holiday / Not released yet)")
 
-    except Exception as e:
+    except requests.RequestException as e:
         print(f"⚠️ Download failed: {e}")
 
     print("🎉 DONE ✅")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | MASTER OPTIONS STORE
+
+✔ Partitioned by TRADE_DATE (set PARTITION_BY_EXPIRY for EXP_DATE below it)
+✔ Dedupe key: INSTRUMENT, TRADE_DATE, EXP_DATE, STR_PRICE, OPT_TYPE
+✔ Metadata: latest_date / trade_dates / row_count (reads: storage.masters)
+✔ Row counts + dates answered from the sidecar manifest
+✔ Compact storage types from configs/schema.py (strike in paise)
+✔ Migrates the legacy master_options.parquet on first use
+✔ Writes under the master lock; partition files replaced atomically
+✔ Hard-link snapshot before every append (storage.versions)
+"""
+
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+# --------------------------------------------------
+# PROJECT ROOT
+# --------------------------------------------------
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import CONT_DIR, MASTER_OPTIONS_DS
+from configs.schema import OPTIONS_MASTER_STORAGE, OPTIONS_STORAGE_VERSION, SCALED_COLS
+from pipelines.storage import atomic, manifest, partitioned, versions
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+LEGACY_PQ = CONT_DIR / "master_options.parquet"
+STORAGE_MARKER = MASTER_OPTIONS_DS / "_storage.json"
+
+# Only applies when the dataset is first created
+PARTITION_BY_EXPIRY = False
+PARTITION_COLS = ["TRADE_DATE", "EXP_DATE"] if PARTITION_BY_EXPIRY else ["TRADE_DATE"]
+
+KEYS    = ["INSTRUMENT", "TRADE_DATE", "EXP_DATE", "STR_PRICE", "OPT_TYPE"]
+SORT_BY = ["TRADE_DATE", "EXP_DATE", "STR_PRICE", "OPT_TYPE"]
+
+# --------------------------------------------------
+# API
+# --------------------------------------------------
+def storage_version():
+    if not STORAGE_MARKER.exists():
+        return None
+    return json.loads(STORAGE_MARKER.read_text(encoding="utf-8"))["storage"]
+
+
+def _mark_storage():
+    atomic.write_text(
+        STORAGE_MARKER,
+        json.dumps(
+            {
+                "storage": OPTIONS_STORAGE_VERSION,
+                "types": OPTIONS_MASTER_STORAGE,
+                "scaled": SCALED_COLS,
+            },
+            indent=2,
+        ),
+    )
+
+
+def migrate():
+    """
+    Split legacy master_options.parquet into partitions and bring
+    partitions written before the compact schema up to date (once).
+    """
+    if LEGACY_PQ.exists() or storage_version() != OPTIONS_STORAGE_VERSION:
+        with lock():
+            return _migrate()
+    return 0
+
+
+def _migrate():
+    rows = partitioned.migrate_monolithic(
+        LEGACY_PQ, MASTER_OPTIONS_DS, PARTITION_COLS, KEYS, SORT_BY,
+        use_compact=True,
+    )
+    if rows:
+        print(f"Migrated legacy master → {MASTER_OPTIONS_DS.name}/ | rows: {rows:,}")
+        _mark_storage()
+
+    if storage_version() != OPTIONS_STORAGE_VERSION:
+        if partitioned.list_partitions(MASTER_OPTIONS_DS):
+            n = partitioned.rewrite_compact(MASTER_OPTIONS_DS)
+            print(f"Re-encoded {n} partitions → {OPTIONS_STORAGE_VERSION}")
+        _mark_storage()
+
+    return rows
+
+
+def lock():
+    """
+    Exclusive lock on the options master (re-entrant in one process).
+    """
+    return atomic.master_lock(MASTER_OPTIONS_DS)
+
+
+def append(df):
+    with lock():
+        migrate()
+        versions.snapshot(MASTER_OPTIONS_DS, note="append")
+        written = partitioned.write_partitions(
+            MASTER_OPTIONS_DS, df, PARTITION_COLS, KEYS, SORT_BY, use_compact=True
+        )
+        manifest.record_partitions(MASTER_OPTIONS_DS, written)
+    return written
+
+
+def load_manifest():
+    """
+    Sidecar manifest (rebuilt first if missing/stale), None if no master.
+    """
+    migrate()
+    return manifest.ensure(MASTER_OPTIONS_DS, "TRADE_DATE")
+
+
+def integrity_problems(deep=False):
+    return manifest.check(MASTER_OPTIONS_DS, deep=deep)
+
+
+def row_count() -> int:
+    m = load_manifest()
+    return m["rows"] if m else 0
+
+
+def trade_dates():
+    m = load_manifest()
+    if not m:
+        return []
+    return [date.fromisoformat(d) for d in m["rows_per_date"]]
+
+
+def latest_date():
+    m = load_manifest()
+    if not m or not m["max_date"]:
+        return None
+    return date.fromisoformat(m["max_date"])
+
@@ -14,15 +14,21 @@ AUTO • HOLIDAY SAFE • SYMBOL-LESS
 ✔ Scheduler / cron safe
 """
 
+import sys
 from pathlib import Path
 from datetime import date
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import PROC_OPT_DAILY
+
 # ==================================================
 # PATHS
 # ==================================================
-BASE = Path(r"H:\NIFTY-LAB")
-OPT_DAILY_DIR = BASE / "data" / "processed" / "daily" / "options"
+OPT_DAILY_DIR = PROC_OPT_DAILY
 
 REQUIRED_COLS = {
     "INSTRUMENT",
@@ -8,12 +8,18 @@ NIFTY-LAB | MARKET REGIME DETECTION (NIFTY)
 ✔ Volatility regime
 ✔ No look-ahead
 ✔ Production safe
+✔ build_regime(continuous) importable (as-of a date: pass rows up to it)
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
 from configs.paths import CONT_DIR
 
 # --------------------------------------------------
@@ -22,31 +28,6 @@ from configs.paths import CONT_DIR
 NIFTY_CONT = CONT_DIR / "nifty_continuous.parquet"
 OUT_FILE   = CONT_DIR / "nifty_regime.parquet"
 
-# --------------------------------------------------
-# LOAD DATA
-# --------------------------------------------------
-df = pd.read_parquet(NIFTY_CONT).sort_values("DATE").reset_index(drop=True)
-
-# --------------------------------------------------
-# BASIC RETURNS
-# --------------------------------------------------
-df["RET_1D"] = df["CLOSE"].pct_change()
-
-# --------------------------------------------------
-# TREND FEATURES
-# --------------------------------------------------
-df["SMA_20"] = df["CLOSE"].rolling(20).mean()
-df["SMA_50"] = df["CLOSE"].rolling(50).mean()
-
-df["TREND_UP"] = (df["SMA_20"] > df["SMA_50"]).astype(int)
-
-# --------------------------------------------------
-# VOLATILITY FEATURES
-# --------------------------------------------------
-df["RANGE"] = (df["HIGH"] - df["LOW"]) / df["CLOSE"]
-df["VOL_20"] = df["RANGE"].rolling(20).mean()
-df["VOL_PCTL"] = df["VOL_20"].rank(pct=True)
-
 # --------------------------------------------------
 # REGIME LABELS
 # --------------------------------------------------
@@ -62,23 +43,62 @@ def vol_regime(p):
         return "LOW_VOL"
     return "MID_VOL"
 
-df["TREND_REGIME"] = df.apply(trend_regime, axis=1)
-df["VOL_REGIME"]   = df["VOL_PCTL"].apply(vol_regime)
+# --------------------------------------------------
+# BUILD
+# --------------------------------------------------
+def build_regime(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    DATE / TREND_REGIME / VOL_REGIME / SMA_20 / SMA_50 / VOL_20 from
+    the NIFTY continuous series. VOL_PCTL ranks over the rows given.
+    """
+    df = df.sort_values("DATE").reset_index(drop=True)
+
+    # BASIC RETURNS
+    df["RET_1D"] = df["CLOSE"].pct_change()
+
+    # TREND FEATURES
+    df["SMA_20"] = df["CLOSE"].rolling(20).mean()
+    df["SMA_50"] = df["CLOSE"].rolling(50).mean()
+
+    df["TREND_UP"] = (df["SMA_20"] > df["SMA_50"]).astype(int)
+
+    # VOLATILITY FEATURES
+    df["RANGE"] = (df["HIGH"] - df["LOW"]) / df["CLOSE"]
+    df["VOL_20"] = df["RANGE"].rolling(20).mean()
+    df["VOL_PCTL"] = df["VOL_20"].rank(pct=True)
+
+    df["TREND_REGIME"] = df.apply(trend_regime, axis=1)
+    df["VOL_REGIME"]   = df["VOL_PCTL"].apply(vol_regime)
+
+    return df[[
+        "DATE",
+        "TREND_REGIME",
+        "VOL_REGIME",
+        "SMA_20",
+        "SMA_50",
+        "VOL_20"
+    ]].dropna()
+
+
+def run(cont_file=NIFTY_CONT, out_file=OUT_FILE) -> pd.DataFrame:
+    """
+    Stage entry: continuous series in, regime parquet out.
+    """
+    out = build_regime(pd.read_parquet(cont_file))
+
+    Path(out_file).parent.mkdir(parents=True, exist_ok=True)
+    out.to_parquet(out_file, index=False)
+    return out
 
 # --------------------------------------------------
-# FINAL OUTPUT
+# CLI
 # --------------------------------------------------
-out = df[[
-    "DATE",
-    "TREND_REGIME",
-    "VOL_REGIME",
-    "SMA_20",
-    "SMA_50",
-    "VOL_20"
-]].dropna()
-
-OUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-out.to_parquet(OUT_FILE, index=False)
-
-print("✅ NIFTY REGIME FEATURES BUILT")
-print(out.tail())
+def main():
+    out = run()
+
+    print("✅ NIFTY REGIME FEATURES BUILT")
+    print(out.tail())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | STAGE CACHE (MAKE-STYLE SKIPPING)
+
+✔ Fingerprint per stage = its input files (content hash) + its
+  parameters (CLI args, run-wide settings) + its code: the script and
+  every project module it imports, transitively (imports read from the
+  source, function-level ones included)
+✔ Same fingerprint as the last successful run and outputs untouched
+  since → stage skipped, previous outputs reused
+✔ Stages with no declared inputs (downloads) always run
+✔ File hashes memoised by (size, mtime): unchanged files are not re-read
+✔ Every hit / miss is logged with the reason
+
+State: data/audit/stage_cache.json
+"""
+
+import ast
+import glob
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from pipelines.storage import atomic
+
+ROOT = Path(__file__).resolve().parents[2]
+
+HIT  = "hit"
+MISS = "miss"
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _sha_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _skip(path: Path) -> bool:
+    # temp files of atomic writes, lock files
+    return path.name.startswith(".") or path.suffix == ".lock"
+
+
+def expand(data_dir: Path, patterns) -> list:
+    """
+    Files matched by globs (relative to data_dir, or absolute);
+    matched directories are walked.
+    """
+    files = set()
+    for pat in patterns:
+        for hit in glob.glob(str(Path(data_dir) / pat)):
+            p = Path(hit)
+            if p.is_dir():
+                files.update(f for f in p.rglob("*") if f.is_file() and not _skip(f))
+            elif p.is_file() and not _skip(p):
+                files.add(p)
+    return sorted(files)
+
+
+# --------------------------------------------------
+# CODE (import closure)
+# --------------------------------------------------
+def _module_file(name: str, bases):
+    rel = Path(*name.split("."))
+    for base in bases:
+        for f in (base / rel.with_suffix(".py"), base / rel / "__init__.py"):
+            if f.is_file():
+                return f
+    return None
+
+
+_import_memo = {}     # (file, size, mtime, bases) -> imported project files
+
+
+def _imports(path: Path, bases) -> set:
+    """
+    Project files imported anywhere in path (+ the __init__.py of their
+    packages).
+    """
+    try:
+        st = path.stat()
+        key = (str(path), st.st_size, st.st_mtime_ns, tuple(map(str, bases)))
+        if key in _import_memo:
+            return _import_memo[key]
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return set()
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+            names += [f"{node.module}.{a.name}" for a in node.names]   # submodules
+    found = set()
+    for name in names:
+        parts = name.split(".")
+        for i in range(1, len(parts) + 1):
+            f = _module_file(".".join(parts[:i]), bases)
+            if f is not None:
+                found.add(f)
+    _import_memo[key] = found
+    return found
+
+
+def code_files(script: Path, root: Path = ROOT) -> list:
+    """
+    The script and the project modules (under root) it imports,
+    transitively. Modules next to the script resolve too (its folder is
+    on sys.path when it runs).
+    """
+    script = Path(script).resolve()
+    root = Path(root).resolve()
+    bases = [root, script.parent]
+    seen, todo = set(), [script]
+    while todo:
+        f = todo.pop()
+        if f in seen or root not in f.parents:
+            continue
+        seen.add(f)
+        todo.extend(_imports(f, bases) - seen)
+    return sorted(seen)
+
+
+# --------------------------------------------------
+# CACHE
+# --------------------------------------------------
+class StageCache:
+    """
+    Fingerprints of the last successful run of each stage.
+    force=True: every check misses, fingerprints are still recorded.
+    """
+
+    def __init__(self, state_file: Path, data_dir: Path, params=None, force=False):
+        self.state_file = Path(state_file)
+        self.data_dir = Path(data_dir)
+        self.params = dict(params or {})
+        self.force = force
+        self.lock = threading.Lock()
+
+        state = {}
+        if self.state_file.exists():
+            try:
+                state = json.loads(self.state_file.read_text(encoding="utf-8"))
+            except ValueError:
+                print(f"⚠ Unreadable stage cache, starting empty: {self.state_file}")
+        self.stages = state.get("stages", {})
+        self.hashes = state.get("hashes", {})
+
+    # ---------- fingerprints ----------
+    def _rel(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.data_dir).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _file_hash(self, path: Path) -> str:
+        st = path.stat()
+        key = str(path)
+        memo = self.hashes.get(key)
+        if memo and memo[0] == st.st_size and memo[1] == st.st_mtime_ns:
+            return memo[2]
+        digest = _sha_file(path)
+        with self.lock:
+            self.hashes[key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def _inputs(self, stage) -> str:
+        lines = [f"{self._rel(f)}\0{self._file_hash(f)}"
+                 for f in expand(self.data_dir, stage.inputs)]
+        return _sha("\n".join(lines).encode())
+
+    def _outputs(self, stage) -> str:
+        # Outputs are only checked for outside edits: stat is enough
+        lines = []
+        for f in expand(self.data_dir, stage.outputs):
+            st = f.stat()
+            lines.append(f"{self._rel(f)}\0{st.st_size}\0{st.st_mtime_ns}")
+        return _sha("\n".join(lines).encode())
+
+    def _code(self, stage) -> str:
+        lines = [f"{f.relative_to(ROOT).as_posix()}\0{self._file_hash(f)}"
+                 for f in code_files(stage.script)]
+        return _sha("\n".join(lines).encode())
+
+    def fingerprint(self, stage) -> dict:
+        params = {"args": stage.args, **self.params}
+        return {
+            "code":   self._code(stage),
+            "params": _sha(json.dumps(params, sort_keys=True, default=str).encode()),
+            "inputs": self._inputs(stage),
+        }
+
+    # ---------- check / record ----------
+    def check(self, stage):
+        """
+        (HIT | MISS, reason, fingerprint). Fingerprint is None for
+        stages that are never cached.
+        """
+        if not stage.inputs:
+            return MISS, "no declared inputs", None
+
+        fp = self.fingerprint(stage)
+        if self.force:
+            return MISS, "cache disabled for this run", fp
+
+        last = self.stages.get(stage.name)
+        if last is None:
+            return MISS, "first run", fp
+
+        changed = [k for k in ("code", "params", "inputs") if fp[k] != last.get(k)]
+        if changed:
+            return MISS, " + ".join(changed) + " changed", fp
+        if self._outputs(stage) != last.get("outputs"):
+            return MISS, "outputs changed since last run", fp
+        return HIT, "inputs, params and code unchanged", fp
+
+    def record(self, stage, fp):
+        """
+        Store the fingerprint of a successful run (with its outputs).
+        """
+        if fp is None:
+            return
+        entry = dict(fp, outputs=self._outputs(stage))
+        with self.lock:
+            self.stages[stage.name] = entry
+            self._save()
+
+    def _save(self):
+        # Drop memo entries for files that no longer exist
+        self.hashes = {k: v for k, v in self.hashes.items() if Path(k).exists()}
+        state = {"stages": self.stages, "hashes": self.hashes}
+        atomic.write_text(self.state_file, json.dumps(state, indent=1, sort_keys=True))
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | IN-PROCESS DAG RUNNER
+
+✔ Each stage declares its inputs / outputs (globs under data/)
+✔ Edges derived from them (+ explicit `after` for ordering only)
+✔ Independent branches run concurrently (thread pool)
+✔ Stages run in-process (runpy): imports paid once per run
+✔ Stages with CLI args, or isolate=True, run as subprocesses
+✔ Fail-soft: a failed stage skips only its dependents, the rest
+  of the run continues; summary at the end
+✔ Output of concurrent stages prefixed with the stage name
+✔ Optional StageCache (cache.py): unchanged stages are skipped
+✔ Per-stage metrics (metrics.py): CPU, peak RSS, rows, bytes
+✔ Opt-in profiling of chosen stages (profiling.py), each in its own
+  subprocess
+✔ Optional DataBus (storage/bus.py): in-process stages hand tables
+  on in memory, parquet writes happen in the background (shared
+  masters: synchronously, under their lock); a stage waits for
+  pending writes of its inputs unless it reads via the bus
+"""
+
+import os
+import runpy
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from pathlib import Path
+
+from pipelines.runner import metrics, profiling
+from pipelines.runner.cache import HIT, MISS
+from pipelines.storage import bus as storage_bus
+
+OK      = "ok"
+CACHED  = "cached"
+FAILED  = "failed"
+SKIPPED = "skipped"
+
+DONE = (OK, CACHED)
+
+# --------------------------------------------------
+# STAGE
+# --------------------------------------------------
+class Stage:
+    """
+    One pipeline step: a script plus what it reads and writes.
+    inputs / outputs are globs relative to the data directory.
+    """
+
+    def __init__(self, name, script, inputs=(), outputs=(), after=(), args=(),
+                 isolate=False, reads_bus=False):
+        self.name = name
+        self.script = Path(script)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+        self.args = [str(a) for a in args]
+        self.isolate = isolate or bool(self.args)
+        # Reads its inputs through storage.bus: no need to wait for disk
+        self.reads_bus = reads_bus
+
+    def __repr__(self):
+        return f"Stage({self.name})"
+
+
+def dependencies(stages) -> dict:
+    """
+    {stage name: set of stage names it waits for}. Raises ValueError
+    on unknown names, duplicate outputs or cycles.
+    """
+    names = [s.name for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names in {names}")
+
+    producers = {}
+    for s in stages:
+        for out in s.outputs:
+            if out in producers:
+                raise ValueError(f"{out} produced by both {producers[out]} and {s.name}")
+            producers[out] = s.name
+
+    deps = {}
+    for s in stages:
+        d = {producers[i] for i in s.inputs if i in producers} | set(s.after)
+        d.discard(s.name)
+        unknown = d - set(names)
+        if unknown:
+            raise ValueError(f"{s.name}: unknown stages {sorted(unknown)}")
+        deps[s.name] = d
+
+    # Kahn: every stage must become ready at some point
+    left = {k: set(v) for k, v in deps.items()}
+    while left:
+        ready = [k for k, v in left.items() if not v]
+        if not ready:
+            raise ValueError(f"Dependency cycle among {sorted(left)}")
+        for k in ready:
+            del left[k]
+        for v in left.values():
+            v.difference_update(ready)
+    return deps
+
+
+def order(stages):
+    """
+    Stage names in a valid sequential order (declaration order kept
+    where the graph allows).
+    """
+    deps = dependencies(stages)
+    done, out = set(), []
+    while len(out) < len(stages):
+        for s in stages:
+            if s.name not in done and deps[s.name] <= done:
+                done.add(s.name)
+                out.append(s.name)
+                break
+    return out
+
+
+# --------------------------------------------------
+# OUTPUT (prefix lines with the running stage)
+# --------------------------------------------------
+class _PrefixedStream:
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def _buf(self):
+        if not hasattr(self.local, "buf"):
+            self.local.buf = ""
+            self.local.name = None
+        return self.local
+
+    def set_stage(self, name):
+        self._buf().name = name
+
+    def write(self, text):
+        loc = self._buf()
+        loc.buf += text
+        while "\n" in loc.buf:
+            line, loc.buf = loc.buf.split("\n", 1)
+            prefix = f"[{loc.name}] " if loc.name else ""
+            with self.lock:
+                self.stream.write(f"{prefix}{line}\n")
+        return len(text)
+
+    def flush(self):
+        loc = self._buf()
+        if loc.buf:
+            self.write("\n")
+        self.stream.flush()
+
+    def __getattr__(self, attr):
+        return getattr(self.stream, attr)
+
+
+# --------------------------------------------------
+# EXECUTION
+# --------------------------------------------------
+def _run_inprocess(stage, usage):
+    cpu0 = time.thread_time()
+    try:
+        runpy.run_path(str(stage.script), run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise RuntimeError(f"exit code {e.code}") from None
+    finally:
+        usage["cpu_secs"] = time.thread_time() - cpu0
+
+
+def _run_subprocess(stage, usage, profile_dir=None):
+    if profile_dir is not None:
+        cmd = profiling.launcher_cmd(stage, profile_dir)
+    else:
+        cmd = [sys.executable, str(stage.script), *stage.args]
+    p = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, encoding="utf-8", errors="replace",
+    )
+    for line in p.stdout:
+        print(line.rstrip("\n"))
+
+    if hasattr(os, "wait4"):
+        # Reap it ourselves to get the child's own rusage
+        _, status, ru = os.wait4(p.pid, 0)
+        p.returncode = os.waitstatus_to_exitcode(status)
+        usage["cpu_secs"] = ru.ru_utime + ru.ru_stime
+        # ru_maxrss: KiB on Linux, bytes on macOS
+        usage["peak_rss"] = ru.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    else:
+        p.wait()
+    if p.returncode != 0:
+        raise RuntimeError(f"exit code {p.returncode}")
+
+
+def _patterns(data_dir, globs):
+    if data_dir is None:
+        return None
+    return [str(Path(data_dir).resolve() / g) for g in globs]
+
+
+def _execute(stage, out, isolate, cache, sampler, data_dir, profile_dir, bus):
+    if out is not None:
+        out.set_stage(stage.name)
+    t0 = time.perf_counter()
+    started = time.time()
+    usage = {}
+    # Profiled: alone in a process (cProfile hooks the whole process on
+    # 3.12+, a second profile in it fails and each would see every thread)
+    mode = "subprocess" if (isolate or stage.isolate or profile_dir is not None) else "in-process"
+
+    hit, fp, error = None, None, None
+    from_bus = False
+    if bus is not None:
+        bus.set_stage(stage.name)
+        inputs = _patterns(data_dir, stage.inputs)
+        try:
+            if mode == "subprocess":
+                bus.wait()
+            elif not stage.reads_bus:
+                bus.wait(patterns=inputs)
+        except Exception as e:
+            error = f"input write failed: {e}"
+        from_bus = bool(stage.inputs) and bus.pending(patterns=inputs)
+
+    if error is None and cache is not None:
+        if from_bus:
+            # On-disk inputs are still the old ones: never a hit
+            hit, reason = MISS, "inputs updated in memory this run"
+        else:
+            hit, reason, fp = cache.check(stage)
+        if hit == HIT and profile_dir is not None:
+            hit, reason = MISS, "profiling requested"
+        if hit == HIT:
+            print(f"✔ CACHE HIT : {stage.name} ({reason}) — outputs reused")
+        else:
+            print(f"✖ CACHE MISS: {stage.name} ({reason})")
+
+    deferred = False
+    if error is not None:
+        print(f"✖ {error}")
+        status = FAILED
+    elif hit == HIT:
+        status = CACHED
+    else:
+        print(f"▶ RUNNING: {stage.script.name} ({mode})")
+        sampler.begin(stage.name)
+        try:
+            if mode == "subprocess":
+                _run_subprocess(stage, usage, profile_dir)
+                if bus is not None:
+                    bus.drop_stale()        # files it rewrote: tables no longer match
+            else:
+                _run_inprocess(stage, usage)
+            status = OK
+            # Outputs still being written: fingerprint / measure at the end
+            deferred = bus is not None and (from_bus or bus.pending(stage=stage.name))
+            if cache is not None and not deferred:
+                cache.record(stage, fp)
+        except Exception as e:
+            traceback.print_exc(file=sys.stdout)
+            status, error = FAILED, str(e) or type(e).__name__
+        process_peak = sampler.end(stage.name)
+        usage.setdefault("peak_rss", process_peak)
+
+    secs = time.perf_counter() - t0
+    cpu = usage.get("cpu_secs")
+    result = {"status": status, "seconds": round(secs, 3), "error": error, "cache": hit,
+              "cpu_secs": None if cpu is None else round(cpu, 3), "peak_rss_mb": None}
+    if usage.get("peak_rss") is not None:
+        result["peak_rss_mb"] = round(usage["peak_rss"] / 2**20, 1)
+    if deferred:
+        result["_deferred"] = started
+    elif data_dir is not None and status == OK:
+        result.update(metrics.io_stats(stage, data_dir, started))
+
+    print(f"■ {status.upper()}: {stage.name} ({secs:.1f}s)")
+    if out is not None:
+        sys.stdout.flush()
+        out.set_stage(None)
+    return result
+
+
+def _finish_writes(bus, by_name, results, cache, data_dir):
+    """
+    Wait for the bus writes; fail stages whose write failed, then
+    record cache / io stats of stages that were waiting for theirs.
+    """
+    t0 = time.perf_counter()
+    issued = len(bus.jobs)
+    failed = bus.close()
+    for name, err in failed:
+        print(f"✖ Background write failed: {name}: {err}")
+        if name in results:
+            results[name].update(status=FAILED, error=f"background write failed: {err}")
+
+    for name, r in results.items():
+        started = r.pop("_deferred", None)
+        if started is None or r["status"] != OK:
+            continue
+        stage = by_name[name]
+        if cache is not None and stage.inputs and not failed:
+            cache.record(stage, cache.fingerprint(stage))
+        if data_dir is not None:
+            r.update(metrics.io_stats(stage, data_dir, started))
+    if issued:
+        print(f"💾 Background writes flushed: {issued} "
+              f"({time.perf_counter() - t0:.1f}s after the last stage)")
+
+
+def run_dag(stages, jobs=4, isolate=False, cache=None, data_dir=None,
+            profile=(), profile_dir=None, bus=None):
+    """
+    Run stages respecting dependencies, up to jobs at a time. With a
+    StageCache, stages whose fingerprint is unchanged are skipped.
+    With data_dir, rows / bytes of the declared files are measured.
+    Stages named in profile are profiled into profile_dir.
+    With a DataBus (ignored when isolate), in-process stages share
+    tables in memory; all writes are on disk when this returns.
+    Returns {name: {"status", "seconds", "error", "cache", "cpu_secs",
+    "peak_rss_mb", ...io stats}} in completion order.
+    """
+    deps = dependencies(stages)
+    by_name = {s.name: s for s in stages}
+    waiting = {k: set(v) for k, v in deps.items()}
+    results = {}
+
+    # In-process stages take no CLI args: they must not see run.py's
+    saved_argv, saved_out = sys.argv, sys.stdout
+    sys.argv = [saved_argv[0]]
+    out = _PrefixedStream(saved_out) if jobs > 1 else None
+    if out is not None:
+        sys.stdout = out
+    sampler = metrics.RssSampler().start()
+    bus = None if isolate else bus
+    session = storage_bus.session(bus) if bus is not None else nullcontext()
+
+    def skip_dependents(failed):
+        for name, d in list(waiting.items()):
+            if failed in deps[name] and name not in results:
+                results[name] = {"status": SKIPPED, "seconds": 0.0,
+                                 "error": f"needs {failed}", "cache": None,
+                                 "cpu_secs": None, "peak_rss_mb": None}
+                del waiting[name]
+                print(f"■ SKIPPED: {name} (needs {failed})")
+                skip_dependents(name)
+
+    try:
+        with session, ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            running = {}
+            while waiting or running:
+                for name in [n for n in sorted(waiting, key=list(by_name).index)
+                             if not waiting[n]]:
+                    if len(running) >= max(1, jobs):
+                        break
+                    del waiting[name]
+                    prof = profile_dir if name in profile else None
+                    running[pool.submit(_execute, by_name[name], out, isolate, cache,
+                                        sampler, data_dir, prof, bus)] = name
+
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    name = running.pop(fut)
+                    results[name] = fut.result()
+                    if results[name]["status"] in DONE:
+                        for d in waiting.values():
+                            d.discard(name)
+                    else:
+                        skip_dependents(name)
+    finally:
+        if bus is not None:
+            _finish_writes(bus, by_name, results, cache, data_dir)
+        sampler.stop()
+        sys.argv = saved_argv
+        sys.stdout = saved_out
+
+    return results
+
+
+def summary(results) -> bool:
+    """
+    Print one line per stage. True when nothing failed or was skipped.
+    """
+    def num(v, fmt):
+        return "-" if v is None else format(v, fmt)
+
+    print("\n" + "-" * 76)
+    print(f"{'stage':<24}{'status':<9}{'wall s':>8}{'cpu s':>8}{'rss MB':>9}{'rows out':>12}")
+    for name, r in results.items():
+        note = f"  {r['error']}" if r["error"] else ""
+        print(f"{name:<24}{r['status']:<9}{r['seconds']:>8.1f}"
+              f"{num(r.get('cpu_secs'), '.1f'):>8}{num(r.get('peak_rss_mb'), '.0f'):>9}"
+              f"{num(r.get('rows_out'), ','):>12}{note}")
+    print("-" * 76)
+    hits = sum(r.get("cache") == HIT for r in results.values())
+    if any(r.get("cache") for r in results.values()):
+        print(f"Cache : {hits} hit / {len(results) - hits} run or skipped")
+    return all(r["status"] in DONE for r in results.values())
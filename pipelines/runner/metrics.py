@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | STAGE METRICS + JSON RUN REPORT
+
+✔ Per stage: wall time, CPU time, peak RSS, rows in / out,
+  bytes read / written
+✔ CPU: thread CPU time for in-process stages (work done in native
+  threads, e.g. pyarrow, is not included), rusage for subprocesses
+✔ Peak RSS: child's max RSS for subprocesses; sampled process RSS
+  for in-process stages (shared by stages running at the same time)
+✔ Rows / bytes from the stage's declared files: all inputs, and
+  outputs written during the stage (parquet footer, CSV line count)
+✔ One report per run: data/audit/runs/<run id>.json
+✔ One line per run appended to data/audit/run_history.jsonl
+
+psutil is used when installed (RSS on Windows); otherwise /proc.
+"""
+
+import json
+import os
+import platform
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from pipelines.runner.cache import expand
+from pipelines.storage import atomic
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+SAMPLE_SECS = 0.05
+
+# --------------------------------------------------
+# RSS
+# --------------------------------------------------
+def _rss_now():
+    """
+    Current RSS of this process in bytes, or None when unknown.
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class RssSampler:
+    """
+    Background thread tracking the peak process RSS seen while each
+    registered stage is running.
+    """
+
+    def __init__(self, interval=SAMPLE_SECS):
+        self.interval = interval
+        self.peaks = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if _rss_now() is None:
+            return self
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def _loop(self):
+        while not self.stop_event.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        rss = _rss_now()
+        with self.lock:
+            for name, peak in self.peaks.items():
+                if rss > peak:
+                    self.peaks[name] = rss
+
+    def begin(self, name):
+        rss = _rss_now()
+        with self.lock:
+            self.peaks[name] = rss
+
+    def end(self, name):
+        if self.thread is not None:
+            self._sample()
+        with self.lock:
+            return self.peaks.pop(name, None)
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+
+
+# --------------------------------------------------
+# ROWS / BYTES
+# --------------------------------------------------
+def count_rows(path: Path):
+    """
+    Rows in a parquet / CSV file (None for other formats).
+    """
+    try:
+        if path.suffix == ".parquet":
+            return pq.ParquetFile(path).metadata.num_rows
+        if path.suffix == ".csv":
+            lines = 0
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    lines += chunk.count(b"\n")
+            return max(lines - 1, 0)  # header
+    except Exception:
+        return None
+    return None
+
+
+def file_stats(files) -> dict:
+    rows, size, counted = 0, 0, 0
+    for f in files:
+        size += f.stat().st_size
+        n = count_rows(f)
+        if n is not None:
+            rows += n
+            counted += 1
+    return {"files": len(files), "rows": rows if counted else None, "bytes": size}
+
+
+def io_stats(stage, data_dir: Path, since: float) -> dict:
+    """
+    Rows / bytes of the stage's inputs, and of the outputs modified
+    at or after `since` (epoch seconds).
+    """
+    ins = file_stats(expand(data_dir, stage.inputs))
+    written = [f for f in expand(data_dir, stage.outputs) if f.stat().st_mtime >= since]
+    outs = file_stats(written)
+    return {
+        "rows_in": ins["rows"],
+        "rows_out": outs["rows"],
+        "bytes_read": ins["bytes"],
+        "bytes_written": outs["bytes"],
+        "files_in": ins["files"],
+        "files_out": outs["files"],
+    }
+
+
+# --------------------------------------------------
+# REPORT
+# --------------------------------------------------
+def run_id(mode: str, started_at: datetime) -> str:
+    """
+    Key shared by the run report and the run's profiles.
+    """
+    return f"{started_at:%Y%m%d_%H%M%S}_{mode}"
+
+
+def write_report(audit_dir: Path, mode: str, results: dict, started_at: datetime,
+                 wall: float, settings=None) -> Path:
+    """
+    Write the JSON run report and append its summary to run_history.jsonl.
+    Returns the report path.
+    """
+    audit_dir = Path(audit_dir)
+    rid = run_id(mode, started_at)
+    report = {
+        "run_id": rid,
+        "mode": mode,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "wall_secs": round(wall, 3),
+        "ok": all(r["status"] in ("ok", "cached") for r in results.values()),
+        "settings": settings or {},
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "stages": [{"stage": name, **r} for name, r in results.items()],
+    }
+    path = audit_dir / "runs" / f"{rid}.json"
+    atomic.write_text(path, json.dumps(report, indent=1, default=str))
+
+    line = {
+        "run_id": rid,
+        "started_at": report["started_at"],
+        "mode": mode,
+        "ok": report["ok"],
+        "wall_secs": report["wall_secs"],
+        "report": path.name,
+        "stages": {name: {"status": r["status"], "seconds": r["seconds"],
+                          "peak_rss_mb": r.get("peak_rss_mb")}
+                   for name, r in results.items()},
+    }
+    with open(audit_dir / "run_history.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(line) + "\n")
+    return path
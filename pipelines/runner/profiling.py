@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | OPT-IN STAGE PROFILING
+
+✔ Enabled per stage: run.py --profile STAGE, or NIFTY_PROFILE=a,b
+  (NIFTY_PROFILE=all for every stage); no script edits needed
+✔ cProfile        → <stage>.prof (snakeviz / pstats) + <stage>_cprofile.txt
+✔ tracemalloc     → <stage>_alloc.txt (top-N allocation sites, NIFTY_PROFILE_TOP)
+✔ Stack sampling  → <stage>.collapsed (flamegraph.pl / speedscope format)
+✔ Written under data/audit/profiles/<run id>/
+✔ Profiled stages always run in their own process, with this file as
+  the launcher (the DAG does it, also for in-process stages):
+    python pipelines/runner/profiling.py --stage NAME --out DIR script.py [args]
+  cProfile (sys.monitoring on 3.12+), tracemalloc and the sampler are
+  process-wide: two profiled stages in one process would fail ("another
+  profiling tool is already active") or mix each other's calls.
+
+tracemalloc slows allocation-heavy pure-Python code a lot and
+inflates the cProfile times with it; NIFTY_PROFILE_MEMORY=0 turns it
+off for timing-only runs.
+"""
+
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import runpy
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+PROFILE_ENV = "NIFTY_PROFILE"
+TOP_N = int(os.environ.get("NIFTY_PROFILE_TOP", "25"))
+MEMORY = os.environ.get("NIFTY_PROFILE_MEMORY", "1") != "0"
+SAMPLE_SECS = 0.01
+TRACE_FRAMES = int(os.environ.get("NIFTY_PROFILE_FRAMES", "5"))
+
+_trace_lock = threading.Lock()
+_trace_users = 0
+
+# --------------------------------------------------
+# SELECTION
+# --------------------------------------------------
+def selected(stages, cli=()):
+    """
+    Stage names to profile: --profile values (must name a stage, else
+    ValueError) plus NIFTY_PROFILE (names not in this run are ignored,
+    so one setting can serve every mode). "all" selects every stage.
+    """
+    known = [s.name for s in stages]
+    cli = set(cli or ())
+    env = {n.strip() for n in os.environ.get(PROFILE_ENV, "").split(",") if n.strip()}
+
+    if "all" in cli | env:
+        return set(known)
+    unknown = sorted(cli - set(known))
+    if unknown:
+        raise ValueError(f"Unknown stage(s) to profile: {unknown} (stages: {known})")
+    return cli | (env & set(known))
+
+
+# --------------------------------------------------
+# STACK SAMPLER (collapsed stacks)
+# --------------------------------------------------
+class _StackSampler:
+    """
+    Samples one thread's Python stack every SAMPLE_SECS.
+    """
+
+    def __init__(self, thread_id):
+        self.thread_id = thread_id
+        self.counts = Counter()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self):
+        while not self.stop_event.wait(SAMPLE_SECS):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        self.thread.join()
+
+    def write(self, path: Path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, n in self.counts.most_common():
+                f.write(f"{stack} {n}\n")
+
+
+# --------------------------------------------------
+# TRACEMALLOC (shared, ref-counted)
+# --------------------------------------------------
+def _trace_start():
+    global _trace_users
+    with _trace_lock:
+        if _trace_users == 0:
+            tracemalloc.start(TRACE_FRAMES)
+        _trace_users += 1
+
+
+def _trace_stop():
+    global _trace_users
+    with _trace_lock:
+        _trace_users -= 1
+        if _trace_users == 0:
+            tracemalloc.stop()
+
+
+def _write_alloc(snapshot, peak, path: Path, top=TOP_N):
+    stats = snapshot.statistics("traceback")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"Traced peak : {peak / 2**20:.1f} MB\n")
+        f.write(f"Live at end : {sum(s.size for s in stats) / 2**20:.1f} MB\n\n")
+        for i, s in enumerate(stats[:top], 1):
+            f.write(f"#{i}  {s.size / 2**20:.2f} MB in {s.count:,} blocks\n")
+            for line in s.traceback.format(limit=TRACE_FRAMES, most_recent_first=True):
+                f.write(f"    {line}\n")
+            f.write("\n")
+
+
+def _write_cprofile(prof, path: Path, top=TOP_N):
+    prof.dump_stats(path.with_suffix(".prof"))
+    buf = io.StringIO()
+    st = pstats.Stats(prof, stream=buf).strip_dirs()
+    st.sort_stats("cumulative").print_stats(top)
+    st.sort_stats("tottime").print_stats(top)
+    path.with_name(f"{path.stem}_cprofile.txt").write_text(buf.getvalue(), encoding="utf-8")
+
+
+# --------------------------------------------------
+# PROFILE A BLOCK
+# --------------------------------------------------
+@contextmanager
+def profiled(name, out_dir: Path):
+    """
+    Profile the code run in this thread inside the block; files are
+    written even when it raises. One at a time per process (see above).
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    if MEMORY:
+        _trace_start()
+        tracemalloc.reset_peak()
+    prof = cProfile.Profile()
+    sampler = _StackSampler(threading.get_ident())
+    try:
+        with sampler:
+            prof.enable()
+            try:
+                yield
+            finally:
+                prof.disable()
+    finally:
+        if MEMORY:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            _trace_stop()
+            _write_alloc(snapshot, peak, out_dir / f"{name}_alloc.txt")
+
+        _write_cprofile(prof, out_dir / name)
+        sampler.write(out_dir / f"{name}.collapsed")
+        extra = "_cprofile.txt, _alloc.txt, .collapsed" if MEMORY else "_cprofile.txt, .collapsed"
+        print(f"🔬 Profile   : {out_dir / name}.prof (+ {extra})")
+
+
+def launcher_cmd(stage, out_dir: Path):
+    """
+    Command line running a subprocess stage under this profiler.
+    """
+    return [sys.executable, str(Path(__file__).resolve()),
+            "--stage", stage.name, "--out", str(out_dir),
+            str(stage.script), *stage.args]
+
+
+# ==================================================
+# LAUNCHER (subprocess stages)
+# ==================================================
+def main():
+    parser = argparse.ArgumentParser(description="Run a script under the stage profiler")
+    parser.add_argument("--stage", required=True)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    # Look like `python script.py args` to the stage
+    sys.argv = [args.script, *args.args]
+    here = str(Path(__file__).resolve().parent)
+    sys.path = [p for p in sys.path if p != here]
+    sys.path.insert(0, str(Path(args.script).resolve().parent))
+    with profiled(args.stage, Path(args.out)):
+        runpy.run_path(args.script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
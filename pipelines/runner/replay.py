@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | HISTORICAL REPLAY OF THE DAILY PIPELINE
+
+✔ python run.py --mode replay --from 2024-01-01 [--to 2024-06-30]
+✔ Daily code path per date: features → predict → regime → signal →
+  option chain → options execution (the same functions daily mode runs)
+✔ As-of each date: every input cut at that date before the daily code
+  sees it (no look-ahead, regime percentile included)
+✔ Dates replayed in parallel (--jobs), masters / model loaded once
+  (or scored by the model server when one runs: run.py --mode serve)
+✔ Output: data/replay/<run id>/
+    signals.csv   one row per date (signal + option trade)
+    latency.csv   seconds per stage per date
+    summary.json  latency p50 / p95 / max per stage, parity with the
+                  backtest predictions (nifty_ml_prediction.parquet)
+
+Stage output is muted unless --verbose (it is per date).
+"""
+
+import json
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import MASTER_EQUITY_PQ, ML_DIR, NIFTY_CONTINUOUS, PROC_DIR, REPLAY_DIR
+from pipelines.runner import metrics
+from pipelines.storage import atomic
+
+FUT_FILE      = PROC_DIR / "futures_ml" / "nifty_fut_oi_historical.parquet"
+BACKTEST_PRED = ML_DIR / "nifty_ml_prediction.parquet"
+
+STAGES = ["features", "predict", "regime", "signal", "chain", "execution"]
+
+# --------------------------------------------------
+# OUTPUT (mute worker threads)
+# --------------------------------------------------
+class _MainThreadOnly:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        if threading.current_thread() is threading.main_thread():
+            return self.stream.write(text)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, attr):
+        return getattr(self.stream, attr)
+
+
+# --------------------------------------------------
+# INPUTS (loaded once)
+# --------------------------------------------------
+def _date_col(df):
+    for c in ["date", "DATE", "TRADE_DATE"]:
+        if c in df.columns:
+            return c
+    raise RuntimeError(f"❌ No date column: {df.columns.tolist()}")
+
+
+class Inputs:
+    """
+    Full histories + model, shared read-only by every replayed date.
+    No model loaded when the model server answers (xgb / cal None).
+    """
+
+    def __init__(self):
+        from pipelines.ml import model_server, predict_nifty_ensemble
+
+        self.eq = pd.read_parquet(MASTER_EQUITY_PQ)
+        self.eq["DATE"] = pd.to_datetime(self.eq["DATE"])
+
+        self.fut = pd.read_parquet(FUT_FILE)
+        self.fut_date = _date_col(self.fut)
+        self.fut[self.fut_date] = pd.to_datetime(self.fut[self.fut_date])
+
+        self.cont = None
+        if NIFTY_CONTINUOUS.exists():
+            self.cont = pd.read_parquet(NIFTY_CONTINUOUS)
+            self.cont["DATE"] = pd.to_datetime(self.cont["DATE"])
+
+        self.server = model_server.health()
+        self.xgb = self.cal = None
+        if self.server is None:
+            self.xgb, self.cal = predict_nifty_ensemble.load_models()
+
+    def dates(self, start, end):
+        d = self.eq["DATE"]
+        return sorted(d[(d >= start) & (d <= end)].dt.normalize().unique())
+
+
+# --------------------------------------------------
+# ONE DATE
+# --------------------------------------------------
+def replay_day(ts: pd.Timestamp, inp: Inputs):
+    """
+    Daily code path as of ts. Returns (signal row, {stage: seconds}).
+    """
+    from pipelines.ml.build_nifty_inference_features import build_features
+    from pipelines.ml.predict_nifty_ensemble import predict
+    from pipelines.regime.build_nifty_regime_features import build_regime
+    from pipelines.storage.masters import load_options
+    from strategies.final.nifty_ml_oi_pcr_final_strategy import build_signal
+    from strategies.options.build_nifty_option_chain import CHAIN_COLUMNS, build_chain
+    from strategies.options.options_execution_engine import build_trade
+
+    secs = {}
+    row = {"DATE": ts.date(), "STATUS": "ok"}
+    t = time.perf_counter()
+
+    def lap(stage):
+        nonlocal t
+        now = time.perf_counter()
+        secs[stage] = round(now - t, 6)
+        t = now
+
+    # FEATURES (inputs cut at ts)
+    feat = build_features(inp.eq[inp.eq["DATE"] <= ts],
+                          inp.fut[inp.fut[inp.fut_date] <= ts])
+    lap("features")
+    if feat.empty or feat["date"].iloc[-1] != ts:
+        row["STATUS"] = "no features (futures OI missing)"
+        return row, secs
+    row["CLOSE"] = float(feat["close"].iloc[-1])
+
+    # PREDICT
+    pred = predict(feat, inp.xgb, inp.cal)
+    row["PROB_UP"] = float(pred["PROB_UP"].iloc[-1])
+    lap("predict")
+
+    # REGIME (percentile ranked over history up to ts only)
+    regime = None
+    if inp.cont is not None:
+        regime = build_regime(inp.cont[inp.cont["DATE"] <= ts])
+        if regime.empty:
+            regime = None
+    lap("regime")
+
+    # SIGNAL
+    signal = build_signal(pred, regime, today=ts.to_pydatetime())
+    row.update(signal)
+    row["DATE"] = ts.date()
+    lap("signal")
+
+    if signal["ACTION"] not in ("LONG", "SHORT"):
+        return row, secs
+    if regime is None:
+        row["STATUS"] = "no regime (nifty_continuous missing)"
+        return row, secs
+
+    # OPTION CHAIN (that day's partition only)
+    chain = build_chain(load_options(dates=[ts.date()], columns=CHAIN_COLUMNS))
+    lap("chain")
+    if chain.empty:
+        row["STATUS"] = "no option chain"
+        return row, secs
+
+    # EXECUTION
+    last = regime.iloc[-1]
+    exec_signal = {
+        "date": ts,
+        "signal": signal["ACTION"],
+        "trend_regime": last["TREND_REGIME"],
+        "vol_regime": last["VOL_REGIME"],
+        "close": row["CLOSE"],
+    }
+    try:
+        trade = build_trade(exec_signal, chain)
+        row.update({f"TRADE_{k.upper()}": v for k, v in trade.items() if k != "date"})
+    except RuntimeError as e:
+        row["STATUS"] = f"blocked: {e}"
+    lap("execution")
+    return row, secs
+
+
+# --------------------------------------------------
+# PARITY WITH BACKTEST
+# --------------------------------------------------
+def compare_backtest(signals: pd.DataFrame, pred_file=BACKTEST_PRED):
+    """
+    Daily-path PROB_UP vs the backtest predictions on the same dates.
+    """
+    if not Path(pred_file).exists() or "PROB_UP" not in signals:
+        return None
+    bt = pd.read_parquet(pred_file, columns=["DATE", "PROB_UP"])
+    bt["DATE"] = pd.to_datetime(bt["DATE"]).dt.date
+    both = signals[["DATE", "PROB_UP"]].dropna().merge(bt, on="DATE", suffixes=("", "_BT"))
+    if both.empty:
+        return {"dates": 0}
+    diff = (both["PROB_UP"] - both["PROB_UP_BT"]).abs()
+    same_side = ((both["PROB_UP"] > 0.5) == (both["PROB_UP_BT"] > 0.5)).mean()
+    return {
+        "dates": len(both),
+        "prob_up_max_abs_diff": round(float(diff.max()), 6),
+        "prob_up_mean_abs_diff": round(float(diff.mean()), 6),
+        "same_direction_pct": round(float(same_side) * 100, 2),
+    }
+
+
+def latency_stats(latency: pd.DataFrame) -> dict:
+    out = {}
+    for stage in STAGES + ["total"]:
+        if stage not in latency:
+            continue
+        s = latency[stage].dropna()
+        if s.empty:
+            continue
+        out[stage] = {
+            "n": int(len(s)),
+            "p50_ms": round(float(np.percentile(s, 50)) * 1000, 2),
+            "p95_ms": round(float(np.percentile(s, 95)) * 1000, 2),
+            "max_ms": round(float(s.max()) * 1000, 2),
+        }
+    return out
+
+
+# --------------------------------------------------
+# REPLAY
+# --------------------------------------------------
+def replay(start, end=None, jobs=4, verbose=False, out_root=REPLAY_DIR) -> Path:
+    """
+    Replay every date of the equity master in [start, end]. Returns
+    the output directory.
+    """
+    started_at = datetime.now()
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end) if end else pd.Timestamp(started_at.date())
+
+    print("NIFTY-LAB | DAILY PIPELINE REPLAY")
+    print("-" * 60)
+    t0 = time.perf_counter()
+    inp = Inputs()
+    dates = inp.dates(start, end)
+    print(f"Dates    : {len(dates)} ({start.date()} → {end.date()}) | jobs {jobs}")
+    model = "model server" if inp.server else "model"
+    print(f"Loaded   : masters + {model} in {time.perf_counter() - t0:.1f}s")
+
+    def one(ts):
+        t = time.perf_counter()
+        try:
+            row, secs = replay_day(ts, inp)
+        except Exception as e:
+            if verbose:
+                traceback.print_exc(file=sys.stdout)
+            row, secs = {"DATE": ts.date(), "STATUS": f"error: {e}"}, {}
+        secs["total"] = round(time.perf_counter() - t, 6)
+        return row, secs
+
+    saved = sys.stdout
+    if not verbose:
+        sys.stdout = _MainThreadOnly(saved)
+    t1 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            results = list(pool.map(one, dates))
+    finally:
+        sys.stdout = saved
+    wall = time.perf_counter() - t1
+
+    signals = pd.DataFrame([r for r, _ in results])
+    latency = pd.DataFrame([{"DATE": r["DATE"], **s} for r, s in results])
+
+    out_dir = Path(out_root) / metrics.run_id("replay", started_at)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    atomic.write_csv(signals, out_dir / "signals.csv")
+    atomic.write_csv(latency, out_dir / "latency.csv")
+
+    stats = latency_stats(latency)
+    parity = compare_backtest(signals)
+    summary = {
+        "from": str(start.date()),
+        "to": str(end.date()),
+        "dates": len(dates),
+        "jobs": jobs,
+        "wall_secs": round(wall, 3),
+        "status": signals["STATUS"].value_counts().to_dict() if len(signals) else {},
+        "actions": signals["ACTION"].value_counts().to_dict() if "ACTION" in signals else {},
+        "latency": stats,
+        "backtest_parity": parity,
+    }
+    atomic.write_text(out_dir / "summary.json", json.dumps(summary, indent=1, default=str))
+
+    print("-" * 60)
+    print(f"{'stage':<12}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for stage, s in stats.items():
+        print(f"{stage:<12}{s['n']:>6}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['max_ms']:>10.1f}")
+    print("-" * 60)
+    print(f"Status   : {summary['status']}")
+    print(f"Actions  : {summary['actions']}")
+    if parity:
+        print(f"Backtest : {parity}")
+    print(f"Wall     : {wall:.1f}s for {len(dates)} dates")
+    print(f"📁 Saved → {out_dir}")
+    return out_dir
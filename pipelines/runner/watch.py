@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | WATCH MODE (INGEST THE DAY AS SOON AS IT IS PUBLISHED)
+
+✔ Long-running: python run.py --mode watch
+✔ Polls for each missing trading day (after the market closes) until
+  both the FO bhavcopy and the NIFTY index file are in data/raw
+✔ Pluggable fetcher: nse (default, --base-url for a stand-in),
+  files (only wait for files dropped by another job), or
+  module:Class with a fetch(kind, date) -> bool method
+✔ On arrival: clean → append → futures OI → features → predict → signal
+  for that date only, in this process (no re-imports, no re-reads)
+✔ Futures OI history still behind the day: the pass stops before
+  predict (no stale signal) and is marked stale; retried once the OI
+  source file changes (stale passes do not use up attempts)
+✔ Warm: masters held in the data bus between passes (storage/bus.py),
+  model loaded once; tables changed on disk by other jobs are dropped
+✔ Latency from file arrival to signal logged per pass:
+  data/audit/watch_log.jsonl (+ state in data/audit/watch_state.json)
+✔ A failing pass is retried on later polls, MAX_ATTEMPTS times
+
+Days already in the equity master when the watch starts are not
+replayed (use --mode daily / backfill for those).
+"""
+
+import importlib
+import json
+import sys
+import time
+import traceback
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.holidays import is_trading_day
+from configs.paths import AUDIT_DIR, MASTER_EQUITY_PQ, MASTER_FUTURES_PQ, PROC_DIR
+from pipelines.fo import raw_store
+from pipelines.historical.backfill_download import (
+    FETCHERS, NSE_ARCHIVES, OK, RateLimiter, equity_out, make_session,
+)
+from pipelines.storage import atomic, manifest
+from pipelines.storage import bus as storage_bus
+
+KINDS = ("fo", "equity")
+
+STATE_FILE = AUDIT_DIR / "watch_state.json"
+LOG_FILE   = AUDIT_DIR / "watch_log.jsonl"
+
+DEFAULT_INTERVAL = 60        # seconds between polls
+DEFAULT_LOOKBACK = 3         # calendar days checked behind today
+DEFAULT_AFTER    = "15:30"   # no probing for today before the close
+MAX_ATTEMPTS     = 3
+
+DONE, FAILED, STALE = "ok", "failed", "stale"     # pass status
+
+FUT_OI_SOURCE  = PROC_DIR / "futures_ml" / "nifty_fut_oi_daily.csv"
+FUT_OI_HISTORY = PROC_DIR / "futures_ml" / "nifty_fut_oi_historical.parquet"
+
+# Kept in the bus between passes
+WARM_FILES = [
+    MASTER_EQUITY_PQ,
+    MASTER_FUTURES_PQ,
+    FUT_OI_HISTORY,
+]
+
+
+class StalePass(Exception):
+    """
+    An input of the day is not there yet: stop before predicting.
+    """
+
+# --------------------------------------------------
+# FETCHERS
+# --------------------------------------------------
+class NseFetcher:
+    """
+    Downloads into data/raw with the backfill fetchers (one session).
+    """
+
+    def __init__(self, base_url=None, rps=1.0):
+        self.base_url = base_url or NSE_ARCHIVES
+        self.session = make_session(1)
+        self.limiter = RateLimiter(rps)
+
+    def fetch(self, kind, d) -> bool:
+        return FETCHERS[kind](self.session, self.limiter, self.base_url, d) == OK
+
+
+class FileFetcher:
+    """
+    Fetches nothing: raw files are dropped by another job.
+    """
+
+    def __init__(self, base_url=None):
+        pass
+
+    def fetch(self, kind, d) -> bool:
+        return False
+
+
+FETCHER_TYPES = {
+    "nse": NseFetcher,
+    "files": FileFetcher,
+}
+
+
+def load_fetcher(spec="nse", base_url=None):
+    """
+    Fetcher by name, or "package.module:Class" (built with base_url).
+    """
+    if spec in FETCHER_TYPES:
+        return FETCHER_TYPES[spec](base_url=base_url)
+    if ":" not in spec:
+        raise ValueError(f"Unknown fetcher {spec!r} (known: {sorted(FETCHER_TYPES)} or module:Class)")
+    module, name = spec.split(":", 1)
+    return getattr(importlib.import_module(module), name)(base_url=base_url)
+
+
+# --------------------------------------------------
+# ARRIVALS
+# --------------------------------------------------
+def arrival(kind, d):
+    """
+    When the raw file for (kind, d) appeared, or None while it has not.
+    """
+    if kind == "fo":
+        if raw_store.get(d) is None:
+            return None
+        e = raw_store.entry(d)
+        return datetime.fromisoformat(e["fetched_at"])
+    f = equity_out(d)
+    if not f.exists():
+        return None
+    return datetime.fromtimestamp(f.stat().st_mtime)
+
+
+def candidate_days(state, lookback, after, now=None):
+    """
+    Trading days in the lookback window newer than the equity master,
+    not done yet and not given up on. Today only once past `after`.
+    """
+    now = now or datetime.now()
+    m = manifest.ensure(MASTER_EQUITY_PQ, "DATE")
+    last = manifest.max_date(m)
+    cutoff = datetime.strptime(after, "%H:%M").time()
+
+    days = []
+    for i in range(lookback, -1, -1):
+        d = now.date() - timedelta(days=i)
+        if not is_trading_day(d):
+            continue
+        rec = state.get(d.isoformat(), {})
+        # Already in the master and never seen here: not ours to replay
+        if last is not None and d <= last.date() and not rec:
+            continue
+        if d == now.date() and now.time() < cutoff:
+            continue
+        if rec.get("status") == DONE or rec.get("attempts", 0) >= MAX_ATTEMPTS:
+            continue
+        # Stale: nothing to gain until the futures OI source changes
+        if rec.get("status") == STALE and rec.get("fut_oi") == fut_oi_signature():
+            continue
+        days.append(d)
+    return days
+
+
+# --------------------------------------------------
+# STEPS (imported on first use, then stay loaded)
+# --------------------------------------------------
+def step_clean(d):
+    from pipelines.equity import clean_daily_equ
+    from pipelines.fo import clean_daily_fo
+
+    clean_daily_equ.clean_day(d, equity_out(d))
+    clean_daily_fo.clean_day(d, raw_store.get(d))
+    # The appends pick their daily files (and ledger state) up from disk
+    storage_bus.active().wait()
+
+
+def step_append(d):
+    from pipelines.equity import append_master_equ
+    from pipelines.futures import append_master_futures
+    from pipelines.options import append_master_options
+
+    append_master_equ.main()
+    append_master_futures.main()
+    append_master_options.main()
+
+
+def fut_oi_signature():
+    """
+    (mtime, size) of the futures OI source, None while it does not exist.
+    """
+    try:
+        st = FUT_OI_SOURCE.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def step_fut_oi(d):
+    from pipelines.futures import build_nifty_fut_oi_historical
+
+    if not FUT_OI_SOURCE.exists():
+        print(f"⚠ No {FUT_OI_SOURCE.name}: keeping {FUT_OI_HISTORY.name} as it is")
+        return
+    df = build_nifty_fut_oi_historical.run(in_file=FUT_OI_SOURCE, out_file=None)
+    storage_bus.write_parquet(df, FUT_OI_HISTORY)
+    print(f"📈 Futures OI history up to {df['DATE'].iloc[-1].date() if not df.empty else None}")
+
+
+def step_features(d):
+    from pipelines.ml import build_nifty_inference_features
+
+    df = build_nifty_inference_features.run()
+    latest = df["date"].iloc[-1].date() if not df.empty else None
+    if latest != d:
+        raise StalePass(f"latest inference row is {latest}, not {d} (futures OI history behind)")
+
+
+def step_predict(d):
+    from pipelines.ml import predict_nifty_ensemble
+
+    predict_nifty_ensemble.run()
+
+
+def step_signal(d):
+    from pipelines.ml import predict_nifty_ensemble
+    from strategies.final import nifty_ml_oi_pcr_final_strategy
+
+    nifty_ml_oi_pcr_final_strategy.run(pred_file=predict_nifty_ensemble.OUT_PQ)
+
+
+STEPS = [
+    ("clean", step_clean),
+    ("append", step_append),
+    ("fut_oi", step_fut_oi),
+    ("features", step_features),
+    ("predict", step_predict),
+    ("signal", step_signal),
+]
+
+
+def warm_up(bus):
+    """
+    Load the masters into the bus and the model into memory.
+    """
+    for f in WARM_FILES:
+        if Path(f).exists():
+            bus.load(f)
+            print(f"🔥 Warm : {Path(f).name}")
+    try:
+        from pipelines.ml import predict_nifty_ensemble
+        predict_nifty_ensemble.load_models()
+        print("🔥 Warm : model + calibrator")
+    except Exception as e:
+        print(f"⚠ Model not preloaded ({e}) — loaded on first pass")
+
+
+# --------------------------------------------------
+# ONE PASS
+# --------------------------------------------------
+def run_pass(d, arrived_at, bus, steps=STEPS) -> dict:
+    """
+    All steps for trading day d. Returns the log record.
+    """
+    detected_at = datetime.now()
+    print("\n" + "=" * 60)
+    print(f"⚡ PASS {d} | files complete at {arrived_at:%H:%M:%S}")
+    print("=" * 60)
+
+    for key in bus.drop_stale():
+        print(f"♻ Changed on disk, dropped from memory: {Path(key).name}")
+
+    timings, status, error = {}, DONE, None
+    with storage_bus.session(bus):
+        for name, step in steps:
+            print(f"\n▶ {name.upper()}")
+            bus.set_stage(name)
+            t0 = time.perf_counter()
+            try:
+                step(d)
+            except StalePass as e:
+                print(f"⏸ {e}")
+                status, error = STALE, f"{name}: {e}"
+            except Exception as e:
+                traceback.print_exc(file=sys.stdout)
+                status, error = FAILED, f"{name}: {e}"
+            timings[name] = round(time.perf_counter() - t0, 3)
+            if error:
+                break
+    done_at = datetime.now()
+
+    # Durable before the next pass (not part of the measured latency)
+    t0 = time.perf_counter()
+    for name, err in bus.flush():
+        status, error = FAILED, error or f"{name}: background write failed: {err}"
+    flush_secs = time.perf_counter() - t0
+
+    return {
+        "date": d.isoformat(),
+        "status": status,
+        "error": error,
+        "arrived_at": arrived_at.isoformat(timespec="seconds"),
+        "detected_at": detected_at.isoformat(timespec="seconds"),
+        "done_at": done_at.isoformat(timespec="seconds"),
+        # arrival → signal: only when a signal was produced
+        "latency_secs": round((done_at - arrived_at).total_seconds(), 3) if status == DONE else None,
+        "pass_secs": round((done_at - detected_at).total_seconds(), 3),
+        "flush_secs": round(flush_secs, 3),
+        "steps": timings,
+    }
+
+
+# --------------------------------------------------
+# STATE / LOG
+# --------------------------------------------------
+def load_state() -> dict:
+    if STATE_FILE.exists():
+        return json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    return {}
+
+
+def save_state(state):
+    atomic.write_text(STATE_FILE, json.dumps(state, indent=1, sort_keys=True))
+
+
+def log_pass(rec):
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOG_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(rec) + "\n")
+
+
+# --------------------------------------------------
+# LOOP
+# --------------------------------------------------
+def poll(fetcher, state, bus, lookback, after):
+    """
+    One polling round: fetch what is missing, run complete days.
+    """
+    for d in candidate_days(state, lookback, after):
+        for kind in KINDS:
+            if arrival(kind, d) is None:
+                try:
+                    if fetcher.fetch(kind, d):
+                        print(f"📥 Arrived : {kind} {d}")
+                except Exception as e:
+                    print(f"⚠ Fetch {kind} {d}: {e}")
+
+        arrivals = [arrival(kind, d) for kind in KINDS]
+        if None in arrivals:
+            missing = [k for k, a in zip(KINDS, arrivals) if a is None]
+            print(f"⏳ {d}: waiting for {', '.join(missing)}")
+            continue
+
+        rec = run_pass(d, max(arrivals), bus)
+        log_pass(rec)
+
+        prev = state.get(d.isoformat(), {})
+        state[d.isoformat()] = {
+            "status": rec["status"],
+            "attempts": prev.get("attempts", 0) + (rec["status"] == FAILED),
+            "latency_secs": rec["latency_secs"],
+            "error": rec["error"],
+        }
+        if rec["status"] == STALE:
+            state[d.isoformat()]["fut_oi"] = fut_oi_signature()
+        save_state(state)
+
+        if rec["status"] == DONE:
+            print(f"\n✅ {d} DONE | latency from arrival {rec['latency_secs']:.1f}s "
+                  f"(pass {rec['pass_secs']:.1f}s, flush {rec['flush_secs']:.1f}s)")
+        elif rec["status"] == STALE:
+            print(f"\n⏸ {d} STALE ({rec['error']}) — no signal; retried when "
+                  f"{FUT_OI_SOURCE.name} changes")
+        else:
+            print(f"\n⚠ {d} FAILED ({rec['error']}) — attempt "
+                  f"{state[d.isoformat()]['attempts']}/{MAX_ATTEMPTS}")
+
+
+def watch(interval=DEFAULT_INTERVAL, fetcher="nse", base_url=None,
+          lookback=DEFAULT_LOOKBACK, after=DEFAULT_AFTER, once=False):
+    print("NIFTY-LAB | WATCH MODE")
+    print("-" * 60)
+    print(f"Fetcher  : {fetcher}  | poll every {interval}s | lookback {lookback}d | after {after}")
+
+    fetcher = load_fetcher(fetcher, base_url)
+    state = load_state()
+    bus = storage_bus.DataBus()
+    warm_up(bus)
+
+    try:
+        while True:
+            poll(fetcher, state, bus, lookback, after)
+            if once:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n■ Watch stopped")
+    finally:
+        for name, err in bus.close():
+            print(f"✖ Background write failed: {name}: {err}")
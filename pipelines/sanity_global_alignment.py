@@ -7,20 +7,32 @@ NIFTY-LAB | GLOBAL MASTER ALIGNMENT (PROD SAFE)
 ✔ Aligns on latest COMMON trading date
 ✔ Weekend / holiday safe
 ✔ Fails only on real data mismatch
+✔ Reads master manifests only (no data files)
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
-BASE = Path(r"H:\NIFTY-LAB")
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-eq = pd.read_parquet(BASE / "data/continuous/master_equity.parquet")
-fu = pd.read_parquet(BASE / "data/continuous/master_futures.parquet")
-op = pd.read_parquet(BASE / "data/continuous/master_options.parquet")
+from configs.paths import MASTER_EQUITY_PQ, MASTER_FUTURES_PQ
+from pipelines.options import master_store
+from pipelines.storage import manifest
 
-eq_max = eq["DATE"].max()
-fu_max = fu["TRADE_DATE"].max()
-op_max = op["TRADE_DATE"].max()
+
+eq_m = manifest.ensure(MASTER_EQUITY_PQ, "DATE")
+fu_m = manifest.ensure(MASTER_FUTURES_PQ, "TRADE_DATE")
+op_m = master_store.load_manifest()
+
+if eq_m is None or fu_m is None or op_m is None:
+    raise RuntimeError("❌ One or more masters are missing")
+
+eq_max = manifest.max_date(eq_m)
+fu_max = manifest.max_date(fu_m)
+op_max = manifest.max_date(op_m)
 
 print("GLOBAL ALIGNMENT CHECK")
 print("-" * 60)
@@ -28,12 +40,12 @@ print("EQUITY  :", eq_max)
 print("FUTURES :", fu_max)
 print("OPTIONS :", op_max)
 
+if None in (eq_max, fu_max, op_max):
+    raise RuntimeError("❌ One or more masters are empty")
+
 # Latest COMMON date
 common = min(eq_max, fu_max, op_max)
 
-if common is None:
-    raise RuntimeError("❌ One or more masters are empty")
-
 print(f"✅ Latest common trading date: {common.date()}")
 
 # Sanity: no dataset lags more than 1 trading day
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | ATOMIC WRITES + MASTER LOCKS
+
+✔ Write to a temp file next to the target, fsync, then os.replace
+✔ Readers see the old file or the new file, never half of one
+✔ Crash mid-write leaves the master untouched (temp file removed)
+✔ CSV appends rolled back to the old size on failure
+✔ One advisory lock per master (fcntl on Linux, msvcrt on Windows)
+✔ Lock is re-entrant inside one process
+✔ holds_lock(master): whether the calling thread holds it
+
+Lock location:
+  master_equity.parquet      → master_equity.lock
+  master_options/  (dataset) → master_options.lock
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Seconds to wait for another job holding the same master
+LOCK_TIMEOUT = float(os.environ.get("NIFTY_LOCK_TIMEOUT", "3600"))
+LOCK_POLL    = 0.5
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+def _fsync_dir(path: Path):
+    # Persist the rename itself (no-op where directories cannot be opened)
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_file(path: Path):
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
+
+# --------------------------------------------------
+# ATOMIC WRITES
+# --------------------------------------------------
+@contextmanager
+def replacing(path: Path):
+    """
+    Yield a temp path in the target's directory. On success the temp
+    file is fsynced and renamed over path; on error it is removed and
+    path is left as it was.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp{os.getpid()}.{threading.get_ident()}")
+    try:
+        yield tmp
+        _fsync_file(tmp)
+        os.replace(tmp, path)
+        _fsync_dir(path.parent)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def write_parquet(df, path: Path):
+    with replacing(path) as tmp:
+        df.to_parquet(tmp, index=False)
+
+
+def write_table(table, path: Path):
+    import pyarrow.parquet as pq
+
+    with replacing(path) as tmp:
+        pq.write_table(table, tmp)
+
+
+def write_csv(df, path: Path):
+    with replacing(path) as tmp:
+        df.to_csv(tmp, index=False)
+
+
+def write_text(path: Path, text: str):
+    with replacing(path) as tmp:
+        tmp.write_text(text, encoding="utf-8")
+
+
+def append_csv(df, path: Path):
+    """
+    Append rows to a CSV mirror in place (no full rewrite). If the
+    append fails the file is truncated back to its previous size.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    exists = path.exists()
+    size = path.stat().st_size if exists else 0
+    try:
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            df.to_csv(f, header=not exists or size == 0, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        if exists:
+            with open(path, "rb+") as f:
+                f.truncate(size)
+        elif path.exists():
+            path.unlink()
+        raise
+
+
+# --------------------------------------------------
+# MASTER LOCKS
+# --------------------------------------------------
+_held = {}
+_held_guard = threading.Lock()
+
+
+def lock_path(master: Path) -> Path:
+    master = Path(master)
+    if master.suffix == ".parquet":
+        return master.with_suffix(".lock")
+    return master.with_name(f"{master.name}.lock")
+
+
+def _try_lock(f) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def master_lock(master: Path, timeout=None, quiet=False):
+    """
+    Exclusive advisory lock on one master for a whole read-modify-write.
+    Other jobs wait (up to timeout seconds) instead of clobbering it.
+    Nested use for the same master in one process does not deadlock.
+    quiet: wait without printing (background writers).
+    """
+    path = lock_path(master)
+    key = str(path.resolve())
+    timeout = LOCK_TIMEOUT if timeout is None else timeout
+
+    with _held_guard:
+        entry = _held.get(key)
+        if entry is not None and entry["thread"] == threading.get_ident():
+            entry["depth"] += 1
+            reentered = True
+        else:
+            reentered = False
+
+    if reentered:
+        try:
+            yield path
+        finally:
+            with _held_guard:
+                _held[key]["depth"] -= 1
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = open(path, "a+")
+    waited = False
+    deadline = time.monotonic() + timeout
+    while not _try_lock(f):
+        if not waited and not quiet:
+            print(f"Waiting for lock  : {path.name}")
+            waited = True
+        if time.monotonic() > deadline:
+            f.close()
+            raise TimeoutError(f"Could not lock {path} within {timeout:.0f}s")
+        time.sleep(LOCK_POLL)
+
+    f.seek(0)
+    f.truncate()
+    f.write(f"{os.getpid()}\n")
+    f.flush()
+
+    with _held_guard:
+        _held[key] = {"thread": threading.get_ident(), "depth": 1}
+    try:
+        yield path
+    finally:
+        with _held_guard:
+            del _held[key]
+        _unlock(f)
+        f.close()
+
+
+def holds_lock(master: Path) -> bool:
+    """
+    True when the calling thread holds master_lock(master).
+    """
+    with _held_guard:
+        entry = _held.get(str(lock_path(master).resolve()))
+    return entry is not None and entry["thread"] == threading.get_ident()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | IN-MEMORY DATA BUS (ONE PIPELINE RUN)
+
+✔ Registry of Arrow tables keyed by the file they belong to
+✔ write_parquet(df, path): table published at once, parquet written
+  by a background writer (atomic, + follow-up work such as manifest /
+  ledger / CSV mirror, in order, after the file has landed)
+✔ lock=True (shared masters, read-modify-write under master_lock):
+  written synchronously in the calling stage, before it lets go of
+  the lock — the master write stays on the critical path; only the
+  table hand-over to later stages is in memory
+✔ Warm tables read under their master lock are re-checked against
+  the file (reloaded when another job changed it since drop_stale)
+✔ read_parquet(path): the published table when there is one, the
+  file otherwise, always converted to pandas (a copy); table(path)
+  hands out the Arrow table itself (zero-copy, shared: treat it as
+  read-only)
+✔ So the background writes and zero-copy hand-over pay off for
+  features / predictions; the append_master_* stages gain only
+  the skipped re-read
+✔ dataset(path): pyarrow dataset over the same (filters pushed down
+  to the table or the parquet file) + its row count
+✔ Without an active bus (CLI runs, --isolate) all fall back to the
+  plain synchronous disk read / write
+✔ The runner waits for pending writes before anything reads the
+  files from disk (subprocess stages, cache, metrics, end of run)
+✔ Long-lived use (watch mode): load() keeps a file warm, flush()
+  between passes, drop_stale() forgets tables whose file was
+  changed on disk by someone else
+
+A frame handed to write_parquet is snapshotted into Arrow right away,
+but follow-up callbacks see the frame itself: do not modify it after
+the call.
+"""
+
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from fnmatch import fnmatch
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pipelines.storage import atomic
+
+WRITERS = 2
+
+_active = None
+
+# --------------------------------------------------
+# BUS
+# --------------------------------------------------
+def _key(path) -> str:
+    return str(Path(path).resolve())
+
+
+def _stat(path):
+    st = Path(path).stat()
+    return st.st_size, st.st_mtime_ns
+
+
+class DataBus:
+    """
+    Tables published during one run, and the background writes that
+    make them durable.
+    """
+
+    def __init__(self, writers=WRITERS):
+        self.tables = {}
+        self.stats = {}         # key -> (size, mtime_ns) of the file the table matches
+        self.jobs = []          # (stage, keys, future)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.pool = ThreadPoolExecutor(max_workers=writers, thread_name_prefix="bus-writer")
+
+    # ---------- stage attribution ----------
+    def set_stage(self, name):
+        self.local.stage = name
+
+    def _stage(self):
+        return getattr(self.local, "stage", None)
+
+    # ---------- tables ----------
+    def publish(self, path, data) -> pa.Table:
+        table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+        with self.lock:
+            self.tables[_key(path)] = table
+        return table
+
+    def table(self, path):
+        """
+        Published table of path, None when there is none. Under the
+        path's master lock (read-modify-write of a shared master) a
+        warm table is first checked against the file: another job may
+        have updated it since the last drop_stale().
+        """
+        key = _key(path)
+        with self.lock:
+            table, st = self.tables.get(key), self.stats.get(key)
+        if table is None or st is None or not atomic.holds_lock(path):
+            return table
+        try:
+            now = _stat(path)
+        except OSError:
+            now = None
+        if now == st:
+            return table
+        with self.lock:
+            self.tables.pop(key, None)
+            self.stats.pop(key, None)
+        if now is None:
+            return None
+        print(f"♻ Changed on disk, reloaded: {Path(path).name}")
+        return self.load(path)
+
+    def load(self, path) -> pa.Table:
+        """
+        Read path into the bus (kept until the file changes on disk).
+        """
+        table = pq.read_table(path)
+        st = _stat(path)
+        with self.lock:
+            self.tables[_key(path)] = table
+            self.stats[_key(path)] = st
+        return table
+
+    def drop_stale(self):
+        """
+        Forget tables whose file no longer matches what the bus wrote /
+        loaded. Returns the dropped paths.
+        """
+        dropped = []
+        with self.lock:
+            for key, st in list(self.stats.items()):
+                try:
+                    same = _stat(key) == st
+                except OSError:
+                    same = False
+                if not same:
+                    self.tables.pop(key, None)
+                    del self.stats[key]
+                    dropped.append(key)
+        return dropped
+
+    # ---------- background writes ----------
+    def write(self, path, data, then=None, lock=False, also=()):
+        """
+        Publish data under path and write it to disk in the background:
+        atomic parquet, then `then()`. lock: written here instead, under
+        the master lock, which the caller holds from its read on (a
+        deferred write could land after another process's update and
+        overwrite it). also: other files the follow-up writes (waited
+        on like path).
+        """
+        table = self.publish(path, data)
+
+        def job():
+            atomic.write_table(table, path)
+            with self.lock:
+                self.stats[_key(path)] = _stat(path)
+            if then is not None:
+                then()
+
+        if lock:
+            with atomic.master_lock(path):
+                job()
+            fut = Future()
+            fut.set_result(None)
+            return fut
+
+        keys = [_key(path), *(_key(p) for p in also)]
+        fut = self.pool.submit(job)
+        with self.lock:
+            self.jobs.append((self._stage(), keys, fut))
+        return fut
+
+    def _select(self, stage=None, patterns=None):
+        with self.lock:
+            jobs = list(self.jobs)
+        out = []
+        for st, keys, fut in jobs:
+            if stage is not None and st != stage:
+                continue
+            if patterns is not None and not any(fnmatch(k, p) for k in keys for p in patterns):
+                continue
+            out.append(fut)
+        return out
+
+    def pending(self, stage=None, patterns=None) -> bool:
+        """
+        True while a matching write (by stage, or by file glob over
+        absolute paths) has not finished.
+        """
+        return any(not f.done() for f in self._select(stage, patterns))
+
+    def wait(self, stage=None, patterns=None):
+        """
+        Block until matching writes are on disk; raises the first
+        write error among them.
+        """
+        for fut in self._select(stage, patterns):
+            fut.result()
+
+    def flush(self):
+        """
+        Wait for every write issued so far and forget them. Returns
+        [(stage, error)] for writes that failed; their tables are
+        dropped (memory no longer matches disk).
+        """
+        with self.lock:
+            jobs, self.jobs = self.jobs, []
+        failed = []
+        for st, keys, fut in jobs:
+            err = fut.exception()
+            if err is not None:
+                failed.append((st, err))
+                with self.lock:
+                    for k in keys:
+                        self.tables.pop(k, None)
+                        self.stats.pop(k, None)
+        return failed
+
+    def close(self):
+        """
+        Finish every write and drop the tables. Returns [(stage, error)]
+        for writes that failed.
+        """
+        failed = self.flush()
+        self.pool.shutdown(wait=True)
+        with self.lock:
+            self.tables.clear()
+            self.stats.clear()
+        return failed
+
+
+# --------------------------------------------------
+# ACTIVE BUS (one per run)
+# --------------------------------------------------
+def active():
+    return _active
+
+
+@contextmanager
+def session(bus):
+    """
+    Make bus the one stage code talks to for the duration of the block.
+    """
+    global _active
+    previous, _active = _active, bus
+    try:
+        yield bus
+    finally:
+        _active = previous
+
+
+# --------------------------------------------------
+# STAGE-FACING API
+# --------------------------------------------------
+def read_parquet(path, columns=None) -> pd.DataFrame:
+    """
+    Published table of path as a DataFrame, else the file.
+    """
+    table = _active.table(path) if _active is not None else None
+    if table is None:
+        return pd.read_parquet(path, columns=columns)
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
+
+
+def read_table(path, columns=None) -> pa.Table:
+    """
+    Published Arrow table of path (shared, no copy), else the file.
+    """
+    table = _active.table(path) if _active is not None else None
+    if table is None:
+        return pq.read_table(path, columns=columns)
+    return table.select(columns) if columns is not None else table
+
+
+def dataset(path):
+    """
+    (pyarrow dataset, rows) over the published table of path, else the
+    file (row count from the parquet footer).
+    """
+    table = _active.table(path) if _active is not None else None
+    if table is not None:
+        return ds.dataset(table), table.num_rows
+    return ds.dataset(str(path), format="parquet"), pq.ParquetFile(path).metadata.num_rows
+
+
+def write_parquet(df, path, then=None, lock=False, also=()):
+    """
+    Parquet write + follow-up. In a bus run: published now, written in
+    the background. Otherwise: written here, synchronously.
+    """
+    if _active is not None:
+        _active.write(path, df, then=then, lock=lock, also=also)
+        return
+    with atomic.master_lock(path) if lock else nullcontext():
+        atomic.write_parquet(df, path)
+        if then is not None:
+            then()
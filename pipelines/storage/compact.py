@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | COMPACT COLUMNAR ENCODING
+
+✔ Storage types driven by configs/schema.py
+✔ Dictionary strings → pandas category
+✔ Scaled integers (strike in paise) → float32 rupees on read
+✔ float32 / int32 / int64 kept as-is in pandas (no float64 upcast)
+
+encode(df)    : pandas → arrow table in storage types
+decode(table) : arrow  → pandas with compact dtypes
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.schema import OPTIONS_MASTER_STORAGE, SCALED_COLS
+
+# --------------------------------------------------
+# TYPES
+# --------------------------------------------------
+def arrow_type(name: str) -> pa.DataType:
+    if name == "dictionary":
+        return pa.dictionary(pa.int32(), pa.string())
+    if name == "date32":
+        return pa.date32()
+    return pa.type_for_alias(name)
+
+
+def _encode_col(s: pd.Series, kind: str, scale=None) -> pa.Array:
+    if kind == "dictionary":
+        arr = pa.array(s.astype(object).where(s.notna(), None), type=pa.string())
+        return arr.dictionary_encode().cast(arrow_type(kind))
+
+    if kind == "date32":
+        return pa.array(pd.to_datetime(s, errors="coerce"), from_pandas=True).cast(pa.date32())
+
+    v = pd.to_numeric(s, errors="coerce")
+    if scale is not None:
+        v = (v * scale).round()
+
+    t = arrow_type(kind)
+    if pa.types.is_integer(t):
+        # counts: missing → 0 so pandas keeps a plain integer dtype
+        return pa.array(v.fillna(0).round().to_numpy(dtype="int64")).cast(t)
+    return pa.array(v.to_numpy(dtype="float64"), from_pandas=True).cast(t, safe=False)
+
+
+# --------------------------------------------------
+# PUBLIC API
+# --------------------------------------------------
+def encode(df: pd.DataFrame, spec=OPTIONS_MASTER_STORAGE, scaled=SCALED_COLS) -> pa.Table:
+    """
+    Frame in user units → arrow table in storage types.
+    Columns missing from spec are passed through unchanged.
+    """
+    arrays, names = [], []
+    for c in df.columns:
+        kind = spec.get(c)
+        if kind is None:
+            arrays.append(pa.array(df[c], from_pandas=True))
+        else:
+            arrays.append(_encode_col(df[c], kind, scaled.get(c)))
+        names.append(c)
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def decode(table: pa.Table, scaled=SCALED_COLS) -> pd.DataFrame:
+    """
+    Arrow table in storage types → frame with compact pandas dtypes.
+    """
+    df = table.to_pandas(date_as_object=False)
+
+    for c in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[c]):
+            df[c] = df[c].astype("datetime64[ns]")
+
+    for c, scale in scaled.items():
+        if c in df.columns:
+            df[c] = df[c].to_numpy(dtype="float32") / np.float32(scale)
+
+    return df
+
+
+def is_encoded(schema: pa.Schema, spec=OPTIONS_MASTER_STORAGE) -> bool:
+    """
+    True when every spec column present in schema already has its storage type.
+    """
+    for f in schema:
+        kind = spec.get(f.name)
+        if kind is not None and f.type != arrow_type(kind):
+            return False
+    return True
+
+
+def roundtrip(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Same values, same dtypes as a loader would return them.
+    """
+    return decode(encode(df))
+
+
+def scale_values(col: str, values):
+    """
+    User-unit filter values → stored integers (e.g. strike rupees → paise).
+    """
+    scale = SCALED_COLS.get(col)
+    if scale is None:
+        return values
+    return [int(round(float(v) * scale)) for v in values]
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=False).sum())
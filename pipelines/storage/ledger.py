@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | PROCESSED-FILE LEDGER (APPEND WATERMARK)
+
+✔ One ledger per master, next to its manifest
+✔ Per daily file: size, mtime, sha256, rows, trade dates, appended_at
+✔ Unchanged files are skipped on stat alone (never opened)
+✔ Touched-but-identical files detected by hash, not re-read
+✔ Self-healing: a ledger date missing from the master manifest
+  makes its file pending again
+
+Sidecar location:
+  master_equity.parquet      → master_equity.ledger.json
+  master_options/  (dataset) → master_options/_ledger.json
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from pipelines.storage import atomic
+from pipelines.storage.manifest import sha256_file
+
+NEW     = "new"
+CHANGED = "changed"
+HEAL    = "heal"
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+def ledger_path(master: Path) -> Path:
+    master = Path(master)
+    if master.suffix == ".parquet":
+        return master.with_name(f"{master.stem}.ledger.json")
+    return master / "_ledger.json"
+
+
+# --------------------------------------------------
+# LEDGER
+# --------------------------------------------------
+class Ledger:
+    """
+    {"files": {name: {size, mtime, sha256, rows, dates, appended_at}}}
+    """
+
+    def __init__(self, master: Path):
+        self.path = ledger_path(master)
+        if self.path.exists():
+            self.data = json.loads(self.path.read_text(encoding="utf-8"))
+        else:
+            self.data = {"files": {}}
+        self.files = self.data["files"]
+
+    def _status(self, f: Path):
+        rec = self.files.get(f.name)
+        if rec is None:
+            return NEW
+
+        st = f.stat()
+        if st.st_size == rec["size"] and st.st_mtime_ns == rec["mtime"]:
+            return None
+
+        if st.st_size == rec["size"] and sha256_file(f) == rec["sha256"]:
+            rec["mtime"] = st.st_mtime_ns  # touched, same bytes
+            return None
+
+        return CHANGED
+
+    def pending(self, files, manifest=None):
+        """
+        [(path, status)] for files to open: new, changed, or already
+        appended but with a trade date the master no longer has.
+        Pass the master manifest (None if the master does not exist).
+        """
+        # No manifest → master gone: every recorded date needs healing
+        have = set(manifest["rows_per_date"]) if manifest else set()
+
+        out = []
+        for f in files:
+            status = self._status(f)
+            if status is None:
+                dates = self.files[f.name].get("dates", [])
+                if any(d not in have for d in dates):
+                    status = HEAL
+            if status is not None:
+                out.append((f, status))
+        return out
+
+    def record(self, f: Path, rows: int, dates):
+        st = f.stat()
+        self.files[f.name] = {
+            "size": st.st_size,
+            "mtime": st.st_mtime_ns,
+            "sha256": sha256_file(f),
+            "rows": int(rows),
+            "dates": sorted(dates),
+            "appended_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def save(self):
+        atomic.write_text(self.path, json.dumps(self.data, indent=1, sort_keys=True))
+
+
+def new_rows(df, date_col, status, manifest=None):
+    """
+    Rows of one pending file that belong in the master: every row of a
+    changed file, otherwise only dates the master does not have yet.
+    """
+    if status == CHANGED or not manifest:
+        return df
+    have = set(manifest["rows_per_date"])
+    return df[~df[date_col].dt.strftime("%Y-%m-%d").isin(have)]
+
+
+def file_dates(df, date_col):
+    return set(df[date_col].dropna().dt.strftime("%Y-%m-%d"))
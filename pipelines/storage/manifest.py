@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | MASTER TABLE MANIFEST (SIDECAR)
+
+✔ rows, rows per date, min/max date
+✔ schema hash (parquet footer)
+✔ file size / mtime / sha256
+✔ Refreshed by every master writer
+✔ "Last date?" + "intact?" without opening data files
+
+Sidecar location:
+  master_equity.parquet      → master_equity.manifest.json
+  master_options/  (dataset) → master_options/_manifest.json
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from pipelines.storage import atomic
+
+VERSION = 1
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+def sidecar(master: Path) -> Path:
+    master = Path(master)
+    if master.suffix == ".parquet":
+        return master.with_name(f"{master.stem}.manifest.json")
+    # "_" prefix → skipped by pyarrow dataset discovery
+    return master / "_manifest.json"
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def schema_hash(path: Path) -> str:
+    schema = pq.read_schema(path).remove_metadata()
+    text = ";".join(f"{f.name}:{f.type}" for f in schema)
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def file_record(path: Path, rows=None) -> dict:
+    st = path.stat()
+    rec = {
+        "size": st.st_size,
+        "mtime": st.st_mtime_ns,
+        "sha256": sha256_file(path),
+    }
+    if rows is not None:
+        rec["rows"] = int(rows)
+    return rec
+
+
+def _rows_per_date(dates: pd.Series) -> dict:
+    d = pd.to_datetime(dates, errors="coerce").dropna().dt.strftime("%Y-%m-%d")
+    return {k: int(v) for k, v in d.value_counts().sort_index().items()}
+
+
+def _finish(m: dict) -> dict:
+    per_date = dict(sorted(m["rows_per_date"].items()))
+    m["rows_per_date"] = per_date
+    m["rows"] = sum(per_date.values())
+    m["min_date"] = next(iter(per_date), None)
+    m["max_date"] = next(reversed(per_date), None)
+    m["updated_at"] = datetime.now().isoformat(timespec="seconds")
+    return m
+
+
+def _save(master: Path, m: dict) -> dict:
+    atomic.write_text(sidecar(master), json.dumps(m, indent=1))
+    return m
+
+
+# --------------------------------------------------
+# WRITE SIDE
+# --------------------------------------------------
+def record_table(master: Path, df: pd.DataFrame, date_col: str) -> dict:
+    """
+    Refresh the manifest of a single-file master right after it was
+    written from df (no re-read of the data file).
+    """
+    master = Path(master)
+    m = {
+        "version": VERSION,
+        "table": master.stem,
+        "layout": "file",
+        "date_col": date_col,
+        "rows_per_date": _rows_per_date(df[date_col]),
+        "schema_hash": schema_hash(master),
+        "files": {master.name: file_record(master, len(df))},
+    }
+    return _save(master, _finish(m))
+
+
+def record_partitions(root: Path, partition_dirs, date_col="TRADE_DATE") -> dict:
+    """
+    Refresh the manifest of a partitioned master for the partitions just
+    written. Row counts come from parquet footers of those files only.
+    """
+    root = Path(root)
+    m = load(root) or {
+        "version": VERSION,
+        "table": root.name,
+        "layout": "hive",
+        "date_col": date_col,
+        "rows_per_date": {},
+        "files": {},
+    }
+
+    touched = set()
+    for pdir in partition_dirs:
+        for f in Path(pdir).rglob("*.parquet"):
+            rel = f.relative_to(root).as_posix()
+            m["files"][rel] = file_record(f, pq.read_metadata(f).num_rows)
+            m["schema_hash"] = schema_hash(f)
+            touched.add(rel.split("/", 1)[0].split("=", 1)[1])
+
+    # rows per date = sum over that date's files (expiry sub-partitions)
+    for day in touched:
+        m["rows_per_date"][day] = sum(
+            rec["rows"]
+            for rel, rec in m["files"].items()
+            if rel.startswith(f"{date_col}={day}/")
+        )
+
+    return _save(root, _finish(m))
+
+
+def rebuild(master: Path, date_col: str) -> dict:
+    """
+    Full scan (once): used when the sidecar is missing or stale.
+    """
+    master = Path(master)
+    if master.suffix == ".parquet":
+        df = pd.read_parquet(master, columns=[date_col])
+        return record_table(master, df, date_col)
+
+    sc = sidecar(master)
+    if sc.exists():
+        sc.unlink()
+    dirs = [p for p in master.iterdir() if p.is_dir() and "=" in p.name]
+    return record_partitions(master, dirs, date_col)
+
+
+# --------------------------------------------------
+# READ SIDE
+# --------------------------------------------------
+def load(master: Path):
+    sc = sidecar(master)
+    if not sc.exists():
+        return None
+    return json.loads(sc.read_text(encoding="utf-8"))
+
+
+def check(master: Path, m=None, deep=False) -> list:
+    """
+    Problems found comparing the manifest with the files on disk.
+    Stat-only by default; deep=True re-hashes every file.
+    """
+    master = Path(master)
+    m = m or load(master)
+    if m is None:
+        return ["manifest missing"]
+
+    base = master.parent if m["layout"] == "file" else master
+    problems = []
+
+    for rel, rec in m["files"].items():
+        f = base / rel
+        if not f.exists():
+            problems.append(f"{rel}: missing")
+            continue
+        st = f.stat()
+        if st.st_size != rec["size"]:
+            problems.append(f"{rel}: size {st.st_size} != {rec['size']}")
+        elif st.st_mtime_ns != rec["mtime"] and not deep:
+            problems.append(f"{rel}: modified since manifest")
+        elif deep and sha256_file(f) != rec["sha256"]:
+            problems.append(f"{rel}: sha256 mismatch")
+
+    if m["layout"] == "hive" and master.exists():
+        on_disk = {
+            f.relative_to(master).as_posix() for f in master.rglob("*.parquet")
+        }
+        for rel in sorted(on_disk - set(m["files"])):
+            problems.append(f"{rel}: not in manifest")
+
+    return problems
+
+
+def ensure(master: Path, date_col: str):
+    """
+    Current manifest, rebuilt first if missing or out of date with the
+    files on disk. None when the master does not exist.
+    """
+    master = Path(master)
+    if not master.exists():
+        return None
+
+    m = load(master)
+    if m is not None and not check(master, m):
+        return m
+
+    print(f"Manifest refresh → {sidecar(master).name} ({master.name})")
+    return rebuild(master, date_col)
+
+
+def max_date(m):
+    return pd.Timestamp(m["max_date"]) if m and m.get("max_date") else None
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | MASTER DATA ACCESS (PREDICATE PUSHDOWN)
+
+✔ load_options / load_futures / load_equity
+✔ Filters pushed to partitions + parquet row groups (pyarrow dataset)
+✔ Column projection → only requested columns decoded
+✔ Memory ~ rows selected, not table size
+✔ Options come back in compact dtypes (category / float32 / int)
+
+Examples:
+  load_options(latest=True, columns=["STR_PRICE", "OPT_TYPE", "OPEN_INT"])
+  load_options(dates=["2025-01-02"], expiries=["2025-01-09"], opt_type="CE")
+  load_futures(start="2024-01-01", end="2024-12-31")
+  load_equity(columns=["DATE", "CLOSE"])
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# --------------------------------------------------
+# PROJECT ROOT
+# --------------------------------------------------
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import MASTER_EQUITY_PQ, MASTER_FUTURES_PQ, MASTER_OPTIONS_DS
+from pipelines.storage import compact, manifest, partitioned
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+def _listify(v):
+    if v is None:
+        return None
+    if isinstance(v, (list, tuple, set, pd.Index, pd.Series)):
+        return list(v)
+    return [v]
+
+
+def _typed(values, ftype):
+    """
+    Python values → arrow array of the column's storage type, so the
+    comparison is evaluated against parquet statistics without casts.
+    """
+    if pa.types.is_dictionary(ftype):
+        ftype = ftype.value_type
+    if pa.types.is_date(ftype) or pa.types.is_timestamp(ftype):
+        ts = pa.array([pd.Timestamp(v).to_pydatetime() for v in values])
+        return ts.cast(ftype)
+    return pa.array(values).cast(ftype)
+
+
+def build_filter(schema: pa.Schema, equals=None, start=None, end=None, date_col=None):
+    """
+    AND of  col IN values  for each equals item, plus an optional
+    start <= date_col <= end range. Unknown columns raise KeyError.
+    """
+    expr = None
+
+    def _and(e):
+        nonlocal expr
+        expr = e if expr is None else expr & e
+
+    for col, values in (equals or {}).items():
+        values = _listify(values)
+        if values is None:
+            continue
+        ftype = schema.field(col).type
+        _and(ds.field(col).isin(_typed(values, ftype)))
+
+    if date_col is not None:
+        ftype = schema.field(date_col).type
+        if start is not None:
+            _and(ds.field(date_col) >= _typed([start], ftype)[0])
+        if end is not None:
+            _and(ds.field(date_col) <= _typed([end], ftype)[0])
+
+    return expr
+
+
+def scan(dataset, columns=None, equals=None, start=None, end=None, date_col=None,
+         use_compact=False):
+    if dataset is None:
+        return pd.DataFrame(columns=columns or [])
+    f = build_filter(dataset.schema, equals, start, end, date_col)
+    table = dataset.to_table(columns=columns, filter=f)
+    if use_compact:
+        return compact.decode(table)
+    return partitioned.to_pandas(table)
+
+
+def _file_dataset(path: Path):
+    return ds.dataset(str(path), format="parquet") if path.exists() else None
+
+
+def _latest(master: Path, date_col: str):
+    m = manifest.ensure(master, date_col)
+    return [m["max_date"]] if m and m["max_date"] else None
+
+
+# --------------------------------------------------
+# PUBLIC API
+# --------------------------------------------------
+def load_options(dates=None, expiries=None, strikes=None, opt_type=None,
+                 columns=None, start=None, end=None, latest=False):
+    """
+    NIFTY OPTIDX rows from the partitioned options master.
+
+    dates / expiries / strikes / opt_type accept a scalar or a list;
+    strikes are in rupees. latest=True reads only the newest TRADE_DATE
+    partition. Dtypes follow configs/schema.py OPTIONS_MASTER_STORAGE.
+    """
+    from pipelines.options import master_store
+
+    master_store.migrate()
+    if latest:
+        dates = _latest(MASTER_OPTIONS_DS, "TRADE_DATE")
+
+    if opt_type is not None:
+        opt_type = [t.strip().upper() for t in _listify(opt_type)]
+    if strikes is not None:
+        strikes = compact.scale_values("STR_PRICE", _listify(strikes))
+
+    return scan(
+        partitioned.dataset(MASTER_OPTIONS_DS),
+        columns,
+        {
+            "TRADE_DATE": dates,
+            "EXP_DATE": expiries,
+            "STR_PRICE": strikes,
+            "OPT_TYPE": opt_type,
+        },
+        start,
+        end,
+        "TRADE_DATE",
+        use_compact=True,
+    )
+
+
+def load_futures(dates=None, expiries=None, symbols=None, columns=None,
+                 start=None, end=None, latest=False):
+    if latest:
+        dates = _latest(MASTER_FUTURES_PQ, "TRADE_DATE")
+
+    return scan(
+        _file_dataset(MASTER_FUTURES_PQ),
+        columns,
+        {"TRADE_DATE": dates, "EXP_DATE": expiries, "SYMBOL": symbols},
+        start,
+        end,
+        "TRADE_DATE",
+    )
+
+
+def load_equity(dates=None, symbols=None, columns=None,
+                start=None, end=None, latest=False):
+    if latest:
+        dates = _latest(MASTER_EQUITY_PQ, "DATE")
+
+    return scan(
+        _file_dataset(MASTER_EQUITY_PQ),
+        columns,
+        {"DATE": dates, "SYMBOL": symbols},
+        start,
+        end,
+        "DATE",
+    )
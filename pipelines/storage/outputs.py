@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | OUTPUT LAYER (PARQUET + OPTIONAL CSV MIRROR)
+
+✔ Parquet written atomically, always
+✔ CSV mirror per configs/outputs.py: off / lazy / eager
+✔ Lazy: CSV queued, exported later from the parquet (export_pending)
+✔ CSVs read by pipeline code (CSV_REQUIRED) always written eagerly
+✔ Inside a bus run (bus.py) write() publishes the table and the files
+  are written in the background
+
+write(df, parquet)           : parquet + mirror
+mirror(df, csv, source)      : mirror only (parquet already written)
+append_mirror(df, csv, src)  : append-only mirror (options master CSV)
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.outputs import CSV_PENDING, csv_mode, csv_required
+from pipelines.storage import atomic, bus
+
+# Sources that are not a single parquet file
+OPTIONS_MASTER = "options_master"
+
+# --------------------------------------------------
+# QUEUE (lazy mode)
+# --------------------------------------------------
+def _load_queue() -> dict:
+    if not CSV_PENDING.exists():
+        return {}
+    return json.loads(CSV_PENDING.read_text(encoding="utf-8"))
+
+
+def _save_queue(q: dict):
+    atomic.write_text(CSV_PENDING, json.dumps(q, indent=1, sort_keys=True))
+
+
+def queue_export(csv_path: Path, source: Path, kind="parquet", columns=None):
+    """
+    Mark csv_path stale: export_pending() rewrites it from source.
+    """
+    with atomic.master_lock(CSV_PENDING):
+        q = _load_queue()
+        q[str(csv_path)] = {
+            "source": str(source),
+            "kind": kind,
+            "columns": list(columns) if columns is not None else None,
+            "stamp": time.time_ns(),
+            "queued_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        _save_queue(q)
+
+
+def _dequeue(csv_path: Path, stamp=None):
+    """
+    Drop csv_path from the queue (only if still at stamp, when given:
+    a newer write queued during export keeps it pending).
+    """
+    if not CSV_PENDING.exists():
+        return
+    with atomic.master_lock(CSV_PENDING):
+        q = _load_queue()
+        rec = q.get(str(csv_path))
+        if rec is None or (stamp is not None and rec["stamp"] != stamp):
+            return
+        del q[str(csv_path)]
+        _save_queue(q)
+
+
+def pending() -> dict:
+    return _load_queue()
+
+
+def mode_for(csv_path: Path) -> str:
+    return "eager" if csv_required(Path(csv_path).name) else csv_mode()
+
+
+# --------------------------------------------------
+# WRITE SIDE
+# --------------------------------------------------
+def mirror(df: pd.DataFrame, csv_path: Path, source: Path):
+    """
+    CSV mirror of a parquet that was just written from df.
+    """
+    csv_path = Path(csv_path)
+    mode = mode_for(csv_path)
+    if mode == "eager":
+        atomic.write_csv(df, csv_path)
+        _dequeue(csv_path)
+    elif mode == "lazy":
+        queue_export(csv_path, source)
+
+
+def write(df: pd.DataFrame, parquet_path: Path, csv_path=None):
+    """
+    Authoritative parquet (atomic) + CSV mirror per the output policy.
+    """
+    parquet_path = Path(parquet_path)
+    csv_path = Path(csv_path or parquet_path.with_suffix(".csv"))
+    bus.write_parquet(df, parquet_path, then=lambda: mirror(df, csv_path, parquet_path),
+                      also=[csv_path])
+
+
+def append_mirror(df: pd.DataFrame, csv_path: Path, source: Path, kind=OPTIONS_MASTER,
+                  restated=False):
+    """
+    Mirror of an append-only master: new rows appended in eager mode,
+    full re-export queued in lazy mode (or while a re-export is pending,
+    so rows are never appended to a stale file).
+    restated: df replaces rows the mirror may already hold (re-cleaned
+    daily files) → full re-export queued, never appended.
+    """
+    csv_path = Path(csv_path)
+    mode = mode_for(csv_path)
+    if mode == "off":
+        return
+    if mode == "lazy" or restated or str(csv_path) in pending():
+        queue_export(csv_path, source, kind, df.columns)
+        if restated and mode == "eager":
+            print(f"  CSV mirror queued for re-export (restated rows) : {csv_path.name}")
+        return
+    atomic.append_csv(df, csv_path)
+
+
+# --------------------------------------------------
+# EXPORT (lazy mode)
+# --------------------------------------------------
+def _read_source(rec) -> pd.DataFrame:
+    if rec["kind"] == OPTIONS_MASTER:
+        from pipelines.storage.masters import load_options
+        df = load_options()
+    else:
+        df = pd.read_parquet(rec["source"])
+    # Same column order as rows appended later in eager mode
+    if rec.get("columns"):
+        df = df[rec["columns"]]
+    return df
+
+
+def export_pending(limit=None):
+    """
+    Write every queued CSV from its parquet source. Returns
+    [(csv_path, rows, seconds)].
+    """
+    done = []
+    for csv_path, rec in list(pending().items())[:limit]:
+        if rec["kind"] != OPTIONS_MASTER and not Path(rec["source"]).exists():
+            print(f"  Source gone, dropped : {csv_path}")
+            _dequeue(csv_path, rec["stamp"])
+            continue
+
+        t0 = time.perf_counter()
+        df = _read_source(rec)
+        atomic.write_csv(df, csv_path)
+        _dequeue(csv_path, rec["stamp"])
+        done.append((csv_path, len(df), time.perf_counter() - t0))
+    return done
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | HIVE-PARTITIONED MASTER STORE
+
+✔ One directory per trade date (optionally per expiry below it)
+✔ Append rewrites only the partitions present in the new rows
+✔ Dedupe + sort enforced inside each partition
+✔ Partition values restored as columns on read
+✔ Row counts from parquet footers (no data scan)
+
+Layout:
+  <root>/TRADE_DATE=2024-01-02/part-0.parquet
+  <root>/TRADE_DATE=2024-01-02/EXP_DATE=2024-01-04/part-0.parquet
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from pipelines.storage import atomic, compact
+from pipelines.storage.upsert import sorted_upsert
+
+PART_FILE = "part-0.parquet"
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+def _fmt(value) -> str:
+    if isinstance(value, (pd.Timestamp, datetime)):
+        value = value.date()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def partition_dir(root: Path, cols, values) -> Path:
+    """
+    root/COL=value/... for one combination of partition values.
+    """
+    path = Path(root)
+    for c, v in zip(cols, values):
+        path = path / f"{c}={_fmt(v)}"
+    return path
+
+
+def detect_partition_cols(root: Path):
+    """
+    Partition columns of an existing dataset, read off the first
+    directory chain (TRADE_DATE=..., EXP_DATE=...). None if empty.
+    """
+    root = Path(root)
+    if not root.exists():
+        return None
+
+    cols = []
+    level = root
+    while True:
+        sub = next(
+            (p for p in sorted(level.iterdir()) if p.is_dir() and "=" in p.name),
+            None,
+        )
+        if sub is None:
+            break
+        cols.append(sub.name.split("=", 1)[0])
+        level = sub
+
+    return cols or None
+
+
+def _partitioning(cols):
+    # Partition keys are always dates here (TRADE_DATE / EXP_DATE)
+    return ds.partitioning(
+        pa.schema([(c, pa.date32()) for c in cols]),
+        flavor="hive",
+    )
+
+
+def dataset(root: Path):
+    """
+    pyarrow Dataset over root, or None when nothing has been written yet.
+    """
+    cols = detect_partition_cols(root)
+    if cols is None:
+        return None
+    return ds.dataset(
+        str(root),
+        format="parquet",
+        partitioning=_partitioning(cols),
+        exclude_invalid_files=False,
+    )
+
+
+def to_pandas(table: pa.Table) -> pd.DataFrame:
+    df = table.to_pandas(date_as_object=False)
+    for c in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[c]):
+            df[c] = df[c].astype("datetime64[ns]")
+    return df
+
+
+# --------------------------------------------------
+# READ
+# --------------------------------------------------
+def list_partitions(root: Path):
+    """
+    Sorted trade dates that have a partition directory.
+    """
+    root = Path(root)
+    if not root.exists():
+        return []
+
+    out = []
+    for p in root.iterdir():
+        if p.is_dir() and "=" in p.name:
+            out.append(date.fromisoformat(p.name.split("=", 1)[1]))
+    return sorted(out)
+
+
+def latest_partition(root: Path):
+    parts = list_partitions(root)
+    return parts[-1] if parts else None
+
+
+def count_rows(root: Path) -> int:
+    d = dataset(root)
+    return 0 if d is None else d.count_rows()
+
+
+def read(root: Path, columns=None, filter=None) -> pd.DataFrame:
+    """
+    Whole dataset (or the rows matching a pyarrow filter) as one frame.
+    """
+    d = dataset(root)
+    if d is None:
+        return pd.DataFrame(columns=columns or [])
+    return to_pandas(d.to_table(columns=columns, filter=filter))
+
+
+def read_dates(root: Path, dates, columns=None) -> pd.DataFrame:
+    """
+    Rows for the given trade dates only; other partitions are never opened.
+    """
+    dates = [pd.Timestamp(d).date() for d in dates]
+    return read(root, columns, ds.field("TRADE_DATE").isin(dates))
+
+
+# --------------------------------------------------
+# WRITE
+# --------------------------------------------------
+def _write_file(df: pd.DataFrame, out: Path, use_compact=False):
+    if use_compact:
+        atomic.write_table(compact.encode(df), out)
+    else:
+        atomic.write_parquet(df, out)
+
+
+def _read_file(path: Path, use_compact=False) -> pd.DataFrame:
+    table = pq.read_table(path)
+    return compact.decode(table) if use_compact else to_pandas(table)
+
+
+def write_partitions(root: Path, df: pd.DataFrame, partition_cols, keys, sort_by,
+                     use_compact=False):
+    """
+    Merge df into the dataset one partition at a time.
+
+    Only partitions that appear in df are read and rewritten. Within each
+    partition, rows are deduped on keys (new rows win) and sorted.
+    An existing dataset keeps its own layout. use_compact stores the
+    configs/schema.py storage types (new rows are round-tripped first so
+    dedupe compares like with like).
+
+    Returns {partition_dir: rows_after_merge}.
+    """
+    root = Path(root)
+    partition_cols = detect_partition_cols(root) or list(partition_cols)
+
+    written = {}
+    for values, part in df.groupby(partition_cols, sort=True):
+        if not isinstance(values, tuple):
+            values = (values,)
+
+        pdir = partition_dir(root, partition_cols, values)
+        out = pdir / PART_FILE
+
+        if use_compact:
+            part = compact.roundtrip(part)
+
+        old = part.iloc[:0]
+        if out.exists():
+            old = _read_file(out, use_compact)
+            for c, v in zip(partition_cols, values):
+                old[c] = pd.Timestamp(v)
+
+        part, _ = sorted_upsert(old, part, keys, sort_by)
+
+        _write_file(part.drop(columns=partition_cols), out, use_compact)
+        written[pdir] = len(part)
+
+    return written
+
+
+def rewrite_compact(root: Path):
+    """
+    Re-encode partition files not yet in the compact storage types.
+    Returns the number of files rewritten.
+    """
+    n = 0
+    for f in sorted(Path(root).rglob(PART_FILE)):
+        if compact.is_encoded(pq.read_schema(f)):
+            continue
+        _write_file(to_pandas(pq.read_table(f)), f, use_compact=True)
+        n += 1
+    return n
+
+
+def migrate_monolithic(parquet_path: Path, root: Path, partition_cols, keys, sort_by,
+                       use_compact=False):
+    """
+    One-time split of a legacy single-file master into partitions.
+    The legacy file is renamed to *_pre_partition.parquet (kept as backup).
+    """
+    parquet_path = Path(parquet_path)
+    if not parquet_path.exists() or list_partitions(root):
+        return 0
+
+    df = pd.read_parquet(parquet_path)
+    for c in partition_cols:
+        df[c] = pd.to_datetime(df[c], errors="coerce")
+    df = df.dropna(subset=list(partition_cols))
+
+    write_partitions(root, df, partition_cols, keys, sort_by, use_compact)
+    parquet_path.rename(
+        parquet_path.with_name(f"{parquet_path.stem}_pre_partition.parquet")
+    )
+    return len(df)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | SORTED-MERGE UPSERT
+
+✔ Master stays sorted; delta is small
+✔ Key-range lookup (searchsorted) per delta date into the master
+✔ Dedupe + sort only the overlapping rows (new rows win)
+✔ Back-dated rows land in order
+✔ Delta after the last master date: straight append
+✔ Otherwise only the master span between the first and last delta
+  date is spliced (one concat with the untouched head / tail)
+
+Shared by equity, futures and options masters.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def sorted_upsert(master: pd.DataFrame, delta: pd.DataFrame, keys, sort_by):
+    """
+    Merge delta into master, both ordered by sort_by.
+
+    sort_by[0] (the date column) must be part of keys: rows can only
+    collide with master rows that share that value, so each delta date
+    touches just its own slice of the master. Delta rows without a
+    value in sort_by[0] are dropped.
+
+    Returns (merged_frame, {"inserted", "updated", "touched"}).
+    """
+    lead = sort_by[0]
+    if lead not in keys:
+        raise ValueError(f"sorted_upsert: leading sort column {lead} must be a key")
+
+    stats = {"inserted": 0, "updated": 0, "touched": 0}
+
+    if delta.empty:
+        return master, stats
+
+    delta = (
+        delta.dropna(subset=[lead])
+        .drop_duplicates(subset=keys, keep="last")
+        .sort_values(sort_by, kind="mergesort")
+    )
+
+    if master.empty:
+        stats["inserted"] = len(delta)
+        return delta.reset_index(drop=True), stats
+
+    # Rows without a date (legacy junk) are kept, parked at the end
+    undated = master[master[lead].isna()]
+    if len(undated):
+        master = master[master[lead].notna()]
+
+    if not master[lead].is_monotonic_increasing:
+        # Legacy / hand-edited master: sort once, later runs stay incremental
+        print(f"  Master not sorted on {lead} — full sort once")
+        master = master.sort_values(sort_by, kind="mergesort").reset_index(drop=True)
+
+    # Whole delta after the master (the daily case): plain append
+    if master.empty or delta.empty or delta[lead].iloc[0] > master[lead].iloc[-1]:
+        stats["inserted"] = len(delta)
+        return pd.concat([master, delta, undated], ignore_index=True), stats
+
+    # Only the master span between the first and last delta date is
+    # rebuilt; rows before and after it are carried over as they are
+    dates = delta[lead].drop_duplicates()
+    lo = master[lead].searchsorted(dates, side="left")
+    hi = master[lead].searchsorted(dates, side="right")
+    start, end = int(lo[0]), int(hi[-1])
+    span = master.iloc[start:end]
+
+    # Span rows sharing a date with the delta: one slice per delta date
+    in_window = np.zeros(len(span), dtype=bool)
+    for a, b in zip(lo - start, hi - start):
+        in_window[a:b] = True
+
+    window = span[in_window]
+    stats["touched"] = len(window)
+
+    merged = (
+        pd.concat([window, delta])
+        .drop_duplicates(subset=keys, keep="last")
+        .sort_values(sort_by, kind="mergesort")
+    )
+    rest = span[~in_window]
+
+    # Splice: merged dates never occur in rest, so a searchsorted on
+    # rest gives each merged row's final slot — no global sort
+    ins = rest[lead].searchsorted(merged[lead], side="left")
+    slots = ins + np.arange(len(merged))
+
+    n = len(rest) + len(merged)
+    order = np.empty(n, dtype=np.int64)
+    is_merged = np.zeros(n, dtype=bool)
+    is_merged[slots] = True
+    order[slots] = len(rest) + np.arange(len(merged))
+    order[~is_merged] = np.arange(len(rest))
+
+    mid = pd.concat([rest, merged], ignore_index=True).take(order)
+    stats["inserted"] = len(mid) - len(span)
+    stats["updated"] = len(delta) - stats["inserted"]
+    out = pd.concat([master.iloc[:start], mid, master.iloc[end:], undated], ignore_index=True)
+    return out, stats
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | MASTER VERSIONS (HARD-LINK SNAPSHOTS)
+
+✔ Snapshot = hard links to the master's files (no data copied)
+✔ Works because every master file is replaced atomically, never
+  edited in place: an old version keeps the old inode
+✔ Append-only CSV mirrors are not linked; rollback queues a re-export
+✔ Unchanged master → no new version
+✔ Retention: newest KEEP versions (NIFTY_KEEP_VERSIONS)
+✔ Rollback relinks files (no data copied) and snapshots the
+  current state first, so a rollback can itself be undone
+
+Layout:
+  data/continuous/_versions/master_futures/v012/master_futures.parquet
+  data/continuous/_versions/master_options/v003/master_options/TRADE_DATE=.../part-0.parquet
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from pipelines.storage import atomic, manifest, outputs
+from pipelines.storage.ledger import ledger_path
+
+KEEP = int(os.environ.get("NIFTY_KEEP_VERSIONS", "20"))
+
+LINK   = "link"
+APPEND = "append"
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+def table_name(master: Path) -> str:
+    master = Path(master)
+    return master.stem if master.suffix == ".parquet" else master.name
+
+
+def versions_dir(master: Path) -> Path:
+    master = Path(master)
+    return master.parent / "_versions" / table_name(master)
+
+
+def _members(master: Path) -> dict:
+    """
+    {path relative to the master's folder: mode} for every file that
+    makes up the master right now.
+    """
+    master = Path(master)
+    base = master.parent
+    out = {}
+
+    if master.suffix == ".parquet":
+        for f in (master, master.with_suffix(".csv"),
+                  manifest.sidecar(master), ledger_path(master)):
+            if f.exists():
+                out[f.relative_to(base).as_posix()] = LINK
+        return out
+
+    if master.exists():
+        for f in master.rglob("*"):
+            if f.is_file() and not f.name.startswith("."):
+                out[f.relative_to(base).as_posix()] = LINK
+
+    # Dataset CSV mirror is appended in place → tracked, never linked
+    csv = base / f"{master.name}.csv"
+    if csv.exists():
+        out[csv.relative_to(base).as_posix()] = APPEND
+    return out
+
+
+def _link(src: Path, dst: Path):
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Filesystem without hard links: fall back to a real copy
+        shutil.copy2(src, dst)
+
+
+def _same(a: Path, b: Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def _load_meta(vdir: Path) -> dict:
+    return json.loads((vdir / "version.json").read_text(encoding="utf-8"))
+
+
+def list_versions(master: Path):
+    """
+    Version metadata, oldest first.
+    """
+    root = versions_dir(master)
+    if not root.exists():
+        return []
+    dirs = sorted(p for p in root.iterdir() if p.is_dir() and p.name.startswith("v"))
+    return [_load_meta(d) for d in dirs if (d / "version.json").exists()]
+
+
+def _unchanged(master: Path, members: dict, meta: dict) -> bool:
+    if set(members) != set(meta["files"]):
+        return False
+    base = Path(master).parent
+    vdir = versions_dir(master) / meta["version"]
+    for rel, rec in meta["files"].items():
+        if rec["mode"] == APPEND:
+            if (base / rel).stat().st_size != rec["size"]:
+                return False
+        elif not _same(base / rel, vdir / rel):
+            return False
+    return True
+
+
+# --------------------------------------------------
+# SNAPSHOT / PRUNE
+# --------------------------------------------------
+def snapshot(master: Path, note="", keep=None):
+    """
+    Record the master as it is now. Returns the version id, or None
+    when the master does not exist.
+    """
+    master = Path(master)
+    with atomic.master_lock(master):
+        members = _members(master)
+        if not members:
+            return None
+
+        history = list_versions(master)
+        if history and _unchanged(master, members, history[-1]):
+            return history[-1]["version"]
+
+        n = int(history[-1]["version"][1:]) + 1 if history else 1
+        version = f"v{n:03d}"
+        root = versions_dir(master)
+        tmp = root / f".{version}.tmp"
+        if tmp.exists():
+            shutil.rmtree(tmp)
+
+        base = master.parent
+        files = {}
+        for rel, mode in members.items():
+            src = base / rel
+            if mode == LINK:
+                _link(src, tmp / rel)
+            files[rel] = {"mode": mode, "size": src.stat().st_size}
+
+        m = manifest.load(master)
+        meta = {
+            "version": version,
+            "table": table_name(master),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "note": note,
+            "rows": m["rows"] if m else None,
+            "max_date": m["max_date"] if m else None,
+            "files": files,
+        }
+        atomic.write_text(tmp / "version.json", json.dumps(meta, indent=1))
+        os.replace(tmp, root / version)
+
+        prune(master, KEEP if keep is None else keep)
+        return version
+
+
+def prune(master: Path, keep=KEEP):
+    """
+    Drop all but the newest keep versions. Returns the ids removed.
+    """
+    history = list_versions(master)
+    drop = history[:-keep] if keep > 0 else history
+    root = versions_dir(master)
+    for meta in drop:
+        shutil.rmtree(root / meta["version"])
+    return [meta["version"] for meta in drop]
+
+
+# --------------------------------------------------
+# ROLLBACK
+# --------------------------------------------------
+def rollback(master: Path, version=None):
+    """
+    Make version (default: the newest one) the live master again.
+    Files are relinked, never copied; the current state is snapshotted
+    first. Returns the version id restored.
+    """
+    master = Path(master)
+    base = master.parent
+
+    with atomic.master_lock(master):
+        history = list_versions(master)
+        if not history:
+            raise FileNotFoundError(f"No versions recorded for {table_name(master)}")
+
+        meta = history[-1] if version is None else next(
+            (h for h in history if h["version"] == version), None
+        )
+        if meta is None:
+            raise ValueError(f"Unknown version {version} for {table_name(master)}")
+
+        current = snapshot(master, note=f"before rollback to {meta['version']}")
+        if current == meta["version"]:
+            print(f"Already at {meta['version']}")
+            return meta["version"]
+
+        vdir = versions_dir(master) / meta["version"]
+
+        for rel, rec in meta["files"].items():
+            dst = base / rel
+            if rec["mode"] == APPEND:
+                # Derived mirror: re-exported from the restored master
+                columns = pd.read_csv(dst, nrows=0).columns if dst.exists() else None
+                outputs.queue_export(dst, master, outputs.OPTIONS_MASTER, columns)
+                print(f"  CSV mirror queued for re-export : {rel}")
+                continue
+
+            if _same(dst, vdir / rel):
+                continue
+            with atomic.replacing(dst) as tmp:
+                tmp.unlink(missing_ok=True)
+                _link(vdir / rel, tmp)
+
+        # Files the old version did not have (new partitions, new sidecars)
+        for rel in set(_members(master)) - set(meta["files"]):
+            (base / rel).unlink()
+
+        if master.is_dir():
+            for d in sorted(master.rglob("*"), reverse=True):
+                if d.is_dir() and not any(d.iterdir()):
+                    d.rmdir()
+
+        return meta["version"]
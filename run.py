@@ -4,71 +4,283 @@
 """
 NIFTY-LAB | SINGLE ENTRYPOINT
 
+Stages are declared below with the data they read and write
+(globs under data/); pipelines/runner/dag.py derives the order,
+runs independent branches side by side and runs stages in-process.
+Stages whose inputs, parameters and code are unchanged since their
+last successful run are skipped (pipelines/runner/cache.py).
+In daily mode the rebuilt masters and features are handed from stage
+to stage in memory (pipelines/storage/bus.py); shared masters are
+written under their lock before the stage ends, other parquet files
+in the background.
+Every run writes a JSON metrics report to data/audit/runs/; profiled
+stages write to data/audit/profiles/<run id>/.
+Replay mode runs the daily code path for every date in a range, as of
+that date (pipelines/runner/replay.py).
+Serve mode keeps the models loaded in one process on localhost; predict
+stages and replay use it when it runs (pipelines/ml/model_server.py).
+
 Usage:
   python run.py --mode backtest
   python run.py --mode daily
+  python run.py --mode backfill --from 2024-01-01 [--to 2024-03-31]
+  python run.py --mode daily --csv-mirrors off|lazy|eager
+  python run.py --mode daily --jobs 1 --isolate     # old behaviour: serial, one process per step
+  python run.py --mode daily --plan                 # print the stage graph only
+  python run.py --mode daily --no-cache             # rerun stages even if unchanged
+  python run.py --mode daily --no-bus               # every stage reads / writes disk
+  python run.py --mode daily --profile predict      # or NIFTY_PROFILE=predict,clean_fo / all
+  python run.py --mode watch [--interval 60] [--fetcher nse|files|module:Class] [--once]
+  python run.py --mode replay --from 2024-01-01 [--to 2024-06-30] [--jobs 4]
+  python run.py --mode serve [--port 8766]          # warm model server for predict / replay
 """
 
 import argparse
+import os
 import subprocess
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
 
-def run(script):
-    """Run a python script safely"""
-    cmd = [sys.executable, str(script)]
-    print(f"\n▶ RUNNING: {script}")
-    subprocess.check_call(cmd)
+from configs.outputs import CSV_MODES, csv_mode
+from configs.paths import AUDIT_DIR, DATA_DIR, MODEL_DIR
+from pipelines.ml import model_server
+from pipelines.runner import metrics, profiling, replay, watch
+from pipelines.runner.cache import StageCache
+from pipelines.runner.dag import Stage, dependencies, order, run_dag, summary
+from pipelines.storage.bus import DataBus
+
+P = ROOT / "pipelines"
+S = ROOT / "strategies"
+
+# ==================================================
+# STAGES
+# ==================================================
+def backtest_stages():
+    return [
+        Stage("fut_oi_historical", P / "futures" / "build_nifty_fut_oi_historical.py",
+              inputs=["processed/futures_ml/nifty_fut_oi_daily.csv"],
+              outputs=["processed/futures_ml/nifty_fut_oi_historical.parquet"]),
+        Stage("ml_features_hist", P / "ml" / "build_nifty_ml_features_hist_no_pcr.py",
+              inputs=["continuous/master_equity.parquet",
+                      "processed/futures_ml/nifty_fut_oi_historical.parquet"],
+              outputs=["processed/ml/feature_store"]),
+        Stage("predict_hist", P / "ml" / "predict_nifty_ensemble_historical.py",
+              inputs=["processed/ml/feature_store",
+                      str(MODEL_DIR / "*.joblib"),
+                      str(MODEL_DIR / "*.features.json")],
+              outputs=["processed/ml/nifty_ml_prediction.*"]),
+        Stage("options_backtest", P / "backtest" / "batch_options_backtest.py",
+              inputs=["processed/ml/nifty_ml_prediction.*",
+                      "backtest/nifty_daily_returns.csv"],
+              outputs=["backtest/nifty_option_pnl_history.csv"]),
+        Stage("equity_curve", P / "backtest" / "equity_curve_analyzer.py",
+              inputs=["backtest/nifty_option_pnl_history.csv"],
+              outputs=["analysis/nifty_equity_curve.csv",
+                       "analysis/nifty_drawdown_curve.csv"]),
+    ]
 
-def run_backtest():
-    print("\n🚀 BACKTEST MODE STARTED")
 
-    run(ROOT / "pipelines" / "futures" / "build_nifty_fut_oi_historical.py")
-    run(ROOT / "pipelines" / "ml" / "build_nifty_ml_features_hist_no_pcr.py")
-    run(ROOT / "pipelines" / "ml" / "predict_nifty_ensemble_historical.py")
-    run(ROOT / "pipelines" / "backtest" / "batch_options_backtest.py")
-    run(ROOT / "pipelines" / "backtest" / "equity_curve_analyzer.py")
+def daily_stages():
+    return [
+        # ---------- equity branch ----------
+        Stage("download_equity", P / "equity" / "daily_download_equ_auto.py",
+              outputs=["raw/equity/*"]),
+        Stage("clean_equity", P / "equity" / "clean_daily_equ.py",
+              inputs=["raw/equity/*"],
+              outputs=["processed/daily/equity/*"]),
+        Stage("append_equity", P / "equity" / "append_master_equ.py",
+              inputs=["processed/daily/equity/*"],
+              outputs=["continuous/master_equity.parquet"]),
 
-    print("\n✅ BACKTEST MODE COMPLETE")
+        # ---------- FO branch (futures + options share one bhavcopy) ----------
+        Stage("download_fo", P / "fo" / "daily_download_fo_auto.py",
+              outputs=["raw/fo/*"]),
+        Stage("clean_fo", P / "fo" / "clean_daily_fo.py",
+              inputs=["raw/fo/*"],
+              outputs=["processed/daily/futures/*", "processed/daily/options/*"]),
+        Stage("append_futures", P / "futures" / "append_master_futures.py",
+              inputs=["processed/daily/futures/*"],
+              outputs=["continuous/master_futures.parquet"]),
+        Stage("append_options", P / "options" / "append_master_options.py",
+              inputs=["processed/daily/options/*"],
+              outputs=["continuous/master_options/*"]),
 
-def run_daily():
-    print("\n⚡ DAILY MODE STARTED")
+        # ---------- ML inference ----------
+        Stage("inference_features", P / "ml" / "build_nifty_inference_features.py",
+              inputs=["continuous/master_equity.parquet",
+                      "processed/futures_ml/nifty_fut_oi_historical.parquet"],
+              outputs=["processed/ml/nifty_inference_features.*",
+                       "processed/ml/inference_feature_state.json"],
+              # waits for the whole data refresh, as before
+              after=["append_futures", "append_options"],
+              reads_bus=True),
+        Stage("predict", P / "ml" / "predict_nifty_ensemble.py",
+              inputs=["processed/ml/nifty_inference_features.*",
+                      str(MODEL_DIR / "*.joblib"),
+                      str(MODEL_DIR / "*.features.json")],
+              outputs=["processed/ml/nifty_ml_daily_prediction.*"],
+              reads_bus=True),
 
-    run(ROOT / "pipelines" / "equity" / "daily_download_equ_auto.py")
-    run(ROOT / "pipelines" / "futures" / "daily_download_fut_auto.py")
-    run(ROOT / "pipelines" / "options" / "daily_download_opt_auto.py")
+        # ---------- execution ----------
+        Stage("options_execution", S / "options" / "options_execution_engine.py",
+              inputs=["signals/nifty_final_signal_*.csv",
+                      "processed/options_chain/nifty_option_chain_*.csv"],
+              outputs=["signals/nifty_option_trade_*.csv"],
+              after=["predict"]),
+    ]
 
-    run(ROOT / "pipelines" / "equity" / "clean_daily_equ.py")
-    run(ROOT / "pipelines" / "futures" / "clean_daily_fut.py")
-    run(ROOT / "pipelines" / "options" / "clean_daily_opt.py")
 
-    run(ROOT / "pipelines" / "equity" / "append_master_equ.py")
-    run(ROOT / "pipelines" / "futures" / "append_master_futures.py")
-    run(ROOT / "pipelines" / "options" / "append_master_options.py")
+def backfill_stages(args):
+    extra = ["--from", args.start, "--workers", args.workers, "--rps", args.rps]
+    if args.end:
+        extra += ["--to", args.end]
+    if args.base_url:
+        extra += ["--base-url", args.base_url]
 
-    run(ROOT / "pipelines" / "ml" / "build_nifty_inference_features.py")
-    run(ROOT / "pipelines" / "ml" / "predict_nifty_ensemble.py")
+    return [
+        Stage("backfill_download", P / "historical" / "backfill_download.py",
+              outputs=["raw/fo/*", "raw/equity/*"], args=extra),
+        Stage("clean_fo_all", P / "fo" / "clean_daily_fo.py",
+              inputs=["raw/fo/*"],
+              outputs=["processed/daily/futures/*", "processed/daily/options/*"],
+              args=["--all"]),
+    ]
 
-    run(ROOT / "strategies" / "options" / "options_execution_engine.py")
 
-    print("\n✅ DAILY MODE COMPLETE")
+# ==================================================
+# HELPERS
+# ==================================================
+def start_csv_export():
+    """Export lazily queued CSV mirrors in the background (low priority, not awaited)"""
+    script = ROOT / "tools" / "export_csv_mirrors.py"
+    print(f"\n▶ BACKGROUND: {script}")
+    flags = 0x4000 if os.name == "nt" else 0  # BELOW_NORMAL_PRIORITY_CLASS
+    subprocess.Popen([sys.executable, str(script)], creationflags=flags)
 
+def show_plan(stages):
+    deps = dependencies(stages)
+    for name in order(stages):
+        after = ", ".join(sorted(deps[name])) or "-"
+        print(f"  {name:<22} ← {after}")
+
+# ==================================================
+# MAIN
+# ==================================================
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "--mode",
         required=True,
-        choices=["backtest", "daily"],
+        choices=["backtest", "daily", "backfill", "watch", "replay", "serve"],
         help="Run mode"
     )
+    parser.add_argument("--from", dest="start", help="Backfill / replay start YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", help="Backfill / replay end YYYY-MM-DD (default: today)")
+    parser.add_argument("--workers", type=int, default=4, help="Backfill concurrent downloads")
+    parser.add_argument("--rps", type=float, default=2.0, help="Backfill max requests/second")
+    parser.add_argument("--base-url", help="Backfill / watch archive host (e.g. local stand-in)")
+    parser.add_argument(
+        "--csv-mirrors",
+        choices=CSV_MODES,
+        help="CSV mirrors of parquet outputs (default: NIFTY_CSV_MIRRORS or lazy)"
+    )
+    parser.add_argument("--jobs", type=int, default=4, help="Stages (replay: dates) run at the same time")
+    parser.add_argument("--isolate", action="store_true",
+                        help="Run every stage in its own python process")
+    parser.add_argument("--plan", action="store_true", help="Print the stage graph and exit")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Run every stage even when its fingerprint is unchanged")
+    parser.add_argument("--no-bus", action="store_true",
+                        help="Hand data between stages through disk only")
+    parser.add_argument("--profile", action="append", metavar="STAGE",
+                        help="Profile this stage (repeatable, 'all'; also NIFTY_PROFILE)")
+    parser.add_argument("--interval", type=int, default=watch.DEFAULT_INTERVAL,
+                        help="Watch: seconds between polls")
+    parser.add_argument("--fetcher", default="nse",
+                        help="Watch: nse, files (wait for dropped files) or module:Class")
+    parser.add_argument("--lookback", type=int, default=watch.DEFAULT_LOOKBACK,
+                        help="Watch: calendar days behind today to look for")
+    parser.add_argument("--after", default=watch.DEFAULT_AFTER,
+                        help="Watch: HH:MM before which today is not probed")
+    parser.add_argument("--once", action="store_true", help="Watch: one poll, then exit")
+    parser.add_argument("--verbose", action="store_true", help="Replay: keep per-date stage output")
+    parser.add_argument("--port", type=int, help="Serve: port (default from NIFTY_MODEL_SERVER)")
     args = parser.parse_args()
 
+    if args.mode in ("backfill", "replay") and not args.start:
+        parser.error(f"--mode {args.mode} requires --from")
+
+    if args.csv_mirrors:
+        # Seen by in-process stages and inherited by subprocesses
+        os.environ["NIFTY_CSV_MIRRORS"] = args.csv_mirrors
+    mirrors = csv_mode()
+
+    if args.mode == "watch":
+        watch.watch(interval=args.interval, fetcher=args.fetcher, base_url=args.base_url,
+                    lookback=args.lookback, after=args.after, once=args.once)
+        return
+
+    if args.mode == "replay":
+        replay.replay(args.start, args.end, jobs=args.jobs, verbose=args.verbose)
+        return
+
+    if args.mode == "serve":
+        model_server.serve_forever(port=args.port)
+        return
+
     if args.mode == "backtest":
-        run_backtest()
+        title, stages = "🚀 BACKTEST MODE", backtest_stages()
     elif args.mode == "daily":
-        run_daily()
+        title, stages = "⚡ DAILY MODE", daily_stages()
+    else:
+        title, stages = "📦 BACKFILL MODE", backfill_stages(args)
+
+    try:
+        profile = profiling.selected(stages, args.profile)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.plan:
+        print(f"{title} | stage graph")
+        show_plan(stages)
+        return
+
+    print(f"\n{title} STARTED")
+    started_at = datetime.now()
+    profile_dir = AUDIT_DIR / "profiles" / metrics.run_id(args.mode, started_at)
+    t0 = time.perf_counter()
+    cache = StageCache(
+        AUDIT_DIR / "stage_cache.json", DATA_DIR,
+        params={"csv_mirrors": mirrors}, force=args.no_cache,
+    )
+    bus = None if (args.no_bus or args.isolate) else DataBus()
+    results = run_dag(stages, jobs=args.jobs, isolate=args.isolate, cache=cache,
+                      data_dir=DATA_DIR, profile=profile, profile_dir=profile_dir,
+                      bus=bus)
+    ok = summary(results)
+    wall = time.perf_counter() - t0
+
+    report = metrics.write_report(
+        AUDIT_DIR, args.mode, results, started_at, wall,
+        settings={"jobs": args.jobs, "isolate": args.isolate,
+                  "csv_mirrors": mirrors, "cache": not args.no_cache,
+                  "bus": bus is not None,
+                  "profile": sorted(profile)},
+    )
+    print(f"\n⏱ Wall time: {wall:.1f}s (csv mirrors: {mirrors})")
+    print(f"📊 Run report: {report}")
+
+    if mirrors == "lazy":
+        start_csv_export()
+
+    if not ok:
+        print(f"\n⚠ {title} FINISHED WITH FAILURES")
+        sys.exit(1)
+    print(f"\n✅ {title} COMPLETE")
 
 if __name__ == "__main__":
     main()
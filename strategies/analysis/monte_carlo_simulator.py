@@ -8,6 +8,7 @@ PHASE-9 | MONTE CARLO SIMULATION (PRODUCTION SAFE)
 ✔ Equity curve robustness testing
 ✔ Drawdown & ruin probability
 ✔ Scheduler + CLI safe
+✔ simulate(pnls) importable; nothing runs on import
 """
 
 import sys
@@ -22,9 +23,7 @@ ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from configs.paths import BASE_DIR
-
-print("🧪 PHASE-9 | MONTE CARLO SIMULATION")
+from configs.paths import ANALYSIS_DIR, DATA_DIR
 
 # ==================================================
 # CONFIG
@@ -32,25 +31,21 @@ print("🧪 PHASE-9 | MONTE CARLO SIMULATION")
 N_SIMULATIONS   = 2000
 INITIAL_EQUITY  = 1.0
 
+BT_FILE  = DATA_DIR / "backtest_nifty_results.csv"
+OUT_FILE = ANALYSIS_DIR / "monte_carlo_summary.csv"
+
 # ==================================================
 # LOAD BACKTEST RESULTS
 # ==================================================
-BT_FILE = BASE_DIR / "data/backtest_nifty_results.csv"
-
-if not BT_FILE.exists():
-    raise FileNotFoundError(f"Backtest file not found → {BT_FILE}")
-
-bt = pd.read_csv(BT_FILE)
-
-if "pnl" not in bt.columns:
-    raise ValueError("Column 'pnl' missing in backtest results")
+def load_pnl(bt: pd.DataFrame) -> np.ndarray:
+    if "pnl" not in bt.columns:
+        raise ValueError("Column 'pnl' missing in backtest results")
 
-pnl_series = bt["pnl"].dropna().values
+    pnl_series = bt["pnl"].dropna().values
 
-if len(pnl_series) < 50:
-    raise ValueError("Not enough trades for Monte Carlo simulation")
-
-print(f"📊 Trades used : {len(pnl_series)}")
+    if len(pnl_series) < 50:
+        raise ValueError("Not enough trades for Monte Carlo simulation")
+    return pnl_series
 
 # ==================================================
 # MONTE CARLO ENGINE
@@ -69,35 +64,57 @@ def run_simulation(pnls: np.ndarray):
     return equity, max_dd
 
 
-results = [run_simulation(pnl_series) for _ in range(N_SIMULATIONS)]
-
-final_equity = np.array([r[0] for r in results])
-max_dd       = np.array([r[1] for r in results])
+def simulate(pnls: np.ndarray, n=N_SIMULATIONS) -> pd.DataFrame:
+    """
+    One-row summary of n bootstrap equity paths.
+    """
+    results = [run_simulation(pnls) for _ in range(n)]
+
+    final_equity = np.array([r[0] for r in results])
+    max_dd       = np.array([r[1] for r in results])
+
+    # SUMMARY METRICS
+    summary = {
+        "simulations": n,
+        "mean_final_equity": round(final_equity.mean(), 3),
+        "median_final_equity": round(np.median(final_equity), 3),
+        "best_equity": round(final_equity.max(), 3),
+        "worst_equity": round(final_equity.min(), 3),
+        "prob_equity_below_1": round((final_equity < 1).mean(), 3),
+        "avg_max_drawdown": round(max_dd.mean(), 3),
+        "worst_drawdown": round(max_dd.min(), 3),
+    }
+    return pd.DataFrame([summary])
+
+
+def run(bt_file=BT_FILE, out_file=OUT_FILE, n=N_SIMULATIONS) -> pd.DataFrame:
+    """
+    Stage entry: backtest trades in, summary CSV out (out_file=None
+    skips saving).
+    """
+    if not Path(bt_file).exists():
+        raise FileNotFoundError(f"Backtest file not found → {bt_file}")
+
+    pnl_series = load_pnl(pd.read_csv(bt_file))
+    print(f"📊 Trades used : {len(pnl_series)}")
+
+    out = simulate(pnl_series, n)
+    if out_file is not None:
+        Path(out_file).parent.mkdir(parents=True, exist_ok=True)
+        out.to_csv(out_file, index=False)
+    return out
 
 # ==================================================
-# SUMMARY METRICS
+# CLI
 # ==================================================
-summary = {
-    "simulations": N_SIMULATIONS,
-    "mean_final_equity": round(final_equity.mean(), 3),
-    "median_final_equity": round(np.median(final_equity), 3),
-    "best_equity": round(final_equity.max(), 3),
-    "worst_equity": round(final_equity.min(), 3),
-    "prob_equity_below_1": round((final_equity < 1).mean(), 3),
-    "avg_max_drawdown": round(max_dd.mean(), 3),
-    "worst_drawdown": round(max_dd.min(), 3),
-}
-
-out = pd.DataFrame([summary])
+def main():
+    print("🧪 PHASE-9 | MONTE CARLO SIMULATION")
+    out = run()
 
-# ==================================================
-# SAVE OUTPUT
-# ==================================================
-OUT_FILE = BASE_DIR / "data/analysis/monte_carlo_summary.csv"
-OUT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    print("\n✅ MONTE CARLO SIMULATION COMPLETE")
+    print(out)
+    print(f"\n💾 Saved → {OUT_FILE}")
 
-out.to_csv(OUT_FILE, index=False)
 
-print("\n✅ MONTE CARLO SIMULATION COMPLETE")
-print(out)
-print(f"\n💾 Saved → {OUT_FILE}")
+if __name__ == "__main__":
+    main()
@@ -10,17 +10,22 @@ PHASE-7.2 | REGIME PERFORMANCE ANALYSIS
 ✔ Production & research safe
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import ANALYSIS_DIR
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB-Trial")
-
-ATTR_FILE = BASE / "data" / "analysis" / "trade_attribution.csv"
-OUT_FILE  = BASE / "data" / "analysis" / "regime_performance.csv"
+ATTR_FILE = ANALYSIS_DIR / "trade_attribution.csv"
+OUT_FILE  = ANALYSIS_DIR / "regime_performance.csv"
 
 print("📊 PHASE-7.2 | REGIME PERFORMANCE BUILD")
 
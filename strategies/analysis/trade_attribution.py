@@ -10,21 +10,26 @@ PHASE-7.1 | TRADE ATTRIBUTION ANALYSIS (PRODUCTION SAFE)
 ✔ Zero dependency on live pipeline
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import ANALYSIS_DIR, CONT_DIR, DATA_DIR, FUTURES_ML_DIR, ML_DIR, OPTIONS_ML_DIR
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE_DIR = Path(r"H:\NIFTY-LAB-Trial")
-
-BACKTEST_FILE = BASE_DIR / "data" / "backtest_nifty_results.csv"
-ML_FILE       = BASE_DIR / "data" / "processed" / "ml" / "nifty_ml_prediction_historical.parquet"
-OI_FILE       = BASE_DIR / "data" / "processed" / "futures_ml" / "nifty_fut_oi_daily.parquet"
-PCR_FILE      = BASE_DIR / "data" / "processed" / "options_ml" / "nifty_pcr_daily.parquet"
-REGIME_FILE   = BASE_DIR / "data" / "continuous" / "nifty_regime.parquet"
+BACKTEST_FILE = DATA_DIR / "backtest_nifty_results.csv"
+ML_FILE       = ML_DIR / "nifty_ml_prediction_historical.parquet"
+OI_FILE       = FUTURES_ML_DIR / "nifty_fut_oi_daily.parquet"
+PCR_FILE      = OPTIONS_ML_DIR / "nifty_pcr_daily.parquet"
+REGIME_FILE   = CONT_DIR / "nifty_regime.parquet"
 
-OUT_DIR = BASE_DIR / "data" / "analysis"
+OUT_DIR = ANALYSIS_DIR
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 OUT_FILE = OUT_DIR / "trade_attribution.csv"
@@ -10,17 +10,22 @@ PHASE-10 | WALK-FORWARD VALIDATION (PRODUCTION GRADE)
 ✔ Outputs regime-aware metrics
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import ANALYSIS_DIR, DATA_DIR
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB-Trial")
-
-TRADES_FILE = BASE / "data/backtest_nifty_results.csv"
-OUT_FILE    = BASE / "data/analysis/walk_forward_results.csv"
+TRADES_FILE = DATA_DIR / "backtest_nifty_results.csv"
+OUT_FILE    = ANALYSIS_DIR / "walk_forward_results.csv"
 
 # --------------------------------------------------
 # CONFIG
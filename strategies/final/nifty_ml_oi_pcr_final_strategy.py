@@ -9,6 +9,7 @@ NIFTY-LAB | FINAL ML + OI + PCR STRATEGY
 ✔ Safe fallback when only PROB_UP exists
 ✔ Never crashes
 ✔ Signal-only (NO execution)
+✔ build_signal(predictions, regime) importable
 """
 
 # ==========================================================
@@ -29,21 +30,18 @@ from pipelines.ml.audit_logger import log_decision
 import pandas as pd
 from datetime import datetime
 
+from configs.paths import CONT_DIR, ML_DIR, SIGNAL_DIR
 from pipelines.ml.ensemble_blender import ensemble_probability
 from pipelines.ml.trade_decision import decide_trade
+from pipelines.storage import bus
 
 # ==========================================================
 # PATHS
 # ==========================================================
-BASE = ROOT
+PRED_FILE = ML_DIR / "nifty_ml_prediction.parquet"
+REGIME_FILE = CONT_DIR / "nifty_regime.parquet"
 
-PRED_FILE = BASE / "data/processed/ml/nifty_ml_prediction.parquet"
-REGIME_FILE = BASE / "data/continuous/nifty_regime.parquet"
-
-OUT_DIR = BASE / "data/signals"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
-OUT_FILE = OUT_DIR / f"nifty_final_signal_{datetime.now():%d-%m-%Y}.csv"
+OUT_DIR = SIGNAL_DIR
 
 # ==========================================================
 # CONFIG
@@ -59,120 +57,138 @@ REGIME_PRIOR = {
 }
 
 # ==========================================================
-# LOAD PREDICTIONS
+# REGIME (SAFE)
 # ==========================================================
-if not PRED_FILE.exists():
-    raise FileNotFoundError(f"❌ Missing prediction file: {PRED_FILE}")
-
-pred_df = pd.read_parquet(PRED_FILE)
-pred = pred_df.iloc[-1]
-pred.index = pred.index.str.upper()
-cols = pred.index.tolist()
+def current_regime(regime_df) -> str:
+    """
+    Latest regime label, TREND when unknown or missing.
+    """
+    if regime_df is None:
+        print("⚠ Regime file missing → defaulting to TREND")
+        return "TREND"
 
-# ==========================================================
-# LOAD REGIME (SAFE)
-# ==========================================================
-if REGIME_FILE.exists():
-    regime_df = pd.read_parquet(REGIME_FILE)
     regime = str(regime_df.iloc[-1].get("REGIME", "TREND")).upper()
-else:
-    regime = "TREND"
-    print("⚠ Regime file missing → defaulting to TREND")
-
-if regime not in REGIME_PRIOR:
-    regime = "TREND"
+    return regime if regime in REGIME_PRIOR else "TREND"
 
 # ==========================================================
-# CASE 1️⃣ : MULTI-MODEL PROBABILITIES AVAILABLE
+# ENSEMBLE
 # ==========================================================
-multi_model = all(c in cols for c in ["P_XGB", "P_LGBM", "P_LSTM"])
+def ensemble(pred: pd.Series, regime: str) -> dict:
+    pred = pred.copy()
+    pred.index = pred.index.str.upper()
+    cols = pred.index.tolist()
 
-if multi_model:
+    # CASE 1️⃣ : MULTI-MODEL PROBABILITIES AVAILABLE
+    if all(c in cols for c in ["P_XGB", "P_LGBM", "P_LSTM"]):
 
-    probs = [
-        float(pred["P_XGB"]),
-        float(pred["P_LGBM"]),
-        float(pred["P_LSTM"]),
-    ]
+        probs = [
+            float(pred["P_XGB"]),
+            float(pred["P_LGBM"]),
+            float(pred["P_LSTM"]),
+        ]
 
-    scores = [
-        float(pred.get("SCORE_XGB", 0.5)),
-        float(pred.get("SCORE_LGBM", 0.5)),
-        float(pred.get("SCORE_LSTM", 0.5)),
-    ]
+        scores = [
+            float(pred.get("SCORE_XGB", 0.5)),
+            float(pred.get("SCORE_LGBM", 0.5)),
+            float(pred.get("SCORE_LSTM", 0.5)),
+        ]
 
-    ensemble_out = ensemble_probability(
-        probs=probs,
-        scores=scores,
-        regime_weights=REGIME_PRIOR[regime]
-    )
+        return ensemble_probability(
+            probs=probs,
+            scores=scores,
+            regime_weights=REGIME_PRIOR[regime]
+        )
 
-# ==========================================================
-# CASE 2️⃣ : SINGLE MODEL (PROB_UP / PROB_DOWN)
-# ==========================================================
-elif "PROB_UP" in cols:
+    # CASE 2️⃣ : SINGLE MODEL (PROB_UP / PROB_DOWN)
+    if "PROB_UP" in cols:
 
-    p_up = float(pred["PROB_UP"])
+        p_up = float(pred["PROB_UP"])
 
-    # Fake a 3-model ensemble with identical beliefs
-    probs = [p_up, p_up, p_up]
-    scores = [0.5, 0.5, 0.5]
-
-    ensemble_out = ensemble_probability(
-        probs=probs,
-        scores=scores,
-        regime_weights=[1/3, 1/3, 1/3]
-    )
+        # Fake a 3-model ensemble with identical beliefs
+        out = ensemble_probability(
+            probs=[p_up, p_up, p_up],
+            scores=[0.5, 0.5, 0.5],
+            regime_weights=[1/3, 1/3, 1/3]
+        )
 
-    print("ℹ Single-model probability detected → ensemble fallback applied")
+        print("ℹ Single-model probability detected → ensemble fallback applied")
+        return out
 
-else:
     raise RuntimeError(
         f"❌ Unsupported prediction schema. Columns found:\n{cols}"
     )
 
 # ==========================================================
-# DECISION
+# SIGNAL
 # ==========================================================
-decision = decide_trade(
-    ensemble_out=ensemble_out,
-    capital=CAPITAL,
-    volatility=VOLATILITY,
-    regime=regime,
-    regime_changed_recently=REGIME_CHANGED_RECENTLY
-)
+def build_signal(pred_df: pd.DataFrame, regime_df=None, today=None) -> dict:
+    """
+    Final signal from the latest prediction row (signal only, no
+    execution).
+    """
+    today = today or datetime.now()
+    regime = current_regime(regime_df)
+    ensemble_out = ensemble(pred_df.iloc[-1], regime)
 
-# ==========================================================
-# OUTPUT SIGNAL
-# ==========================================================
-signal = {
-    "DATE": datetime.now().strftime("%Y-%m-%d"),
-    "SYMBOL": "NIFTY",
-    "REGIME": regime,
-    "ACTION": decision.action,
-    "POSITION_SIZE": decision.position_size,
-    "CONFIDENCE": round(ensemble_out["confidence"], 6),
-    "PROBABILITY": round(ensemble_out["P_adj"], 6),
-    "AGREEMENT": round(ensemble_out["agreement"], 6),
-    "REASON": decision.reason,
-}
-
-df_out = pd.DataFrame([signal])
-df_out.to_csv(OUT_FILE, index=False)
-
-# ==========================
-# AUDIT LOGGING (NEW)
-# ==========================
-csv_audit, pq_audit = log_decision(signal, BASE)
-
-
-# ==========================================================
-# CONSOLE OUTPUT
-# ==========================================================
-print("\n✅ FINAL SIGNAL GENERATED")
-print(df_out.to_string(index=False))
-print(f"\n📁 Saved to: {OUT_FILE}")
-print(f"\n🧾 Audit log updated:")
-print(f"CSV → {csv_audit}")
-print(f"PARQUET → {pq_audit}")
+    decision = decide_trade(
+        ensemble_out=ensemble_out,
+        capital=CAPITAL,
+        volatility=VOLATILITY,
+        regime=regime,
+        regime_changed_recently=REGIME_CHANGED_RECENTLY
+    )
 
+    return {
+        "DATE": today.strftime("%Y-%m-%d"),
+        "SYMBOL": "NIFTY",
+        "REGIME": regime,
+        "ACTION": decision.action,
+        "POSITION_SIZE": decision.position_size,
+        "CONFIDENCE": round(ensemble_out["confidence"], 6),
+        "PROBABILITY": round(ensemble_out["P_adj"], 6),
+        "AGREEMENT": round(ensemble_out["agreement"], 6),
+        "REASON": decision.reason,
+    }
+
+
+def run(pred_file=PRED_FILE, regime_file=REGIME_FILE, out_dir=OUT_DIR, audit=True):
+    """
+    Stage entry: predictions + regime in, signal CSV + audit log out
+    (out_dir=None skips both). Returns (signal frame, signal CSV path).
+    """
+    try:
+        pred_df = bus.read_parquet(pred_file)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"❌ Missing prediction file: {pred_file}") from None
+
+    regime_df = pd.read_parquet(regime_file) if Path(regime_file).exists() else None
+    today = datetime.now()
+    signal = build_signal(pred_df, regime_df, today)
+    df_out = pd.DataFrame([signal])
+
+    out_file = None
+    if out_dir is not None:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+        out_file = Path(out_dir) / f"nifty_final_signal_{today:%d-%m-%Y}.csv"
+        df_out.to_csv(out_file, index=False)
+
+        if audit:
+            csv_audit, pq_audit = log_decision(signal)
+            print(f"\n🧾 Audit log updated:")
+            print(f"CSV → {csv_audit}")
+            print(f"PARQUET → {pq_audit}")
+    return df_out, out_file
+
+# ==========================================================
+# CLI
+# ==========================================================
+def main():
+    df_out, out_file = run()
+
+    print("\n✅ FINAL SIGNAL GENERATED")
+    print(df_out.to_string(index=False))
+    print(f"\n📁 Saved to: {out_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ PHASE-13.2 | NIFTY OPTION CHAIN BUILDER (INDEX OPTIONS)
 ✔ Uses OPTIDX
 ✔ NSE column safe
 ✔ Uses TRADE_DATE (FIXED)
+✔ build_chain(df) importable
 """
 
 import sys
@@ -15,52 +16,72 @@ import pandas as pd
 
 # --------------------------------------------------
 ROOT = Path(__file__).resolve().parents[2]
-sys.path.insert(0, str(ROOT))
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-from configs.paths import BASE_DIR
+from configs.paths import OPTIONS_CHAIN_DIR
+from pipelines.storage.masters import load_options
 
-print("🚀 BUILDING NIFTY OPTION CHAIN (INDEX OPTIONS)")
+OUT_DIR = OPTIONS_CHAIN_DIR
+OUT     = OUT_DIR / "nifty_option_chain_latest.csv"
 
-# --------------------------------------------------
-# LOAD MASTER OPTIONS
-# --------------------------------------------------
-MASTER = BASE_DIR / "data/continuous/master_options.parquet"
-df = pd.read_parquet(MASTER)
+CHAIN_COLUMNS = [
+    "INSTRUMENT", "TRADE_DATE", "EXP_DATE", "STR_PRICE",
+    "OPT_TYPE", "CLOSE_PRICE", "OPEN_INT", "TRD_QTY",
+]
 
 # --------------------------------------------------
-# FILTER INDEX OPTIONS
+# BUILD
 # --------------------------------------------------
-df = df[df["INSTRUMENT"] == "OPTIDX"].copy()
+def build_chain(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Index-option chain of the latest TRADE_DATE in df (master options
+    rows, at least CHAIN_COLUMNS).
+    """
+    # FILTER INDEX OPTIONS
+    df = df[df["INSTRUMENT"] == "OPTIDX"].copy()
 
-# --------------------------------------------------
-# LATEST TRADE DATE (FIX)
-# --------------------------------------------------
-latest_date = df["TRADE_DATE"].max()
-df = df[df["TRADE_DATE"] == latest_date]
+    # LATEST TRADE DATE (FIX)
+    latest_date = df["TRADE_DATE"].max()
+    df = df[df["TRADE_DATE"] == latest_date]
 
-# --------------------------------------------------
-# NORMALIZE COLUMNS
-# --------------------------------------------------
-chain = pd.DataFrame({
-    "TRADE_DATE": df["TRADE_DATE"],
-    "EXPIRY_DT": df["EXP_DATE"],
-    "STRIKE": df["STR_PRICE"],
-    "OPTION_TYPE": df["OPT_TYPE"],
-    "CLOSE": df["CLOSE_PRICE"],
-    "OPEN_INTEREST": df["OPEN_INT"],
-    "VOLUME": df["TRD_QTY"],
-})
+    # NORMALIZE COLUMNS
+    return pd.DataFrame({
+        "TRADE_DATE": df["TRADE_DATE"],
+        "EXPIRY_DT": df["EXP_DATE"],
+        "STRIKE": df["STR_PRICE"],
+        "OPTION_TYPE": df["OPT_TYPE"],
+        "CLOSE": df["CLOSE_PRICE"],
+        "OPEN_INTEREST": df["OPEN_INT"],
+        "VOLUME": df["TRD_QTY"],
+    })
+
+
+def run(out=OUT) -> pd.DataFrame:
+    """
+    Stage entry: newest master partition in, chain CSV out (out=None
+    skips saving).
+    """
+    # Newest TRADE_DATE partition only, chain columns only
+    chain = build_chain(load_options(latest=True, columns=CHAIN_COLUMNS))
+
+    if out is not None:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        chain.to_csv(out, index=False)
+    return chain
 
 # --------------------------------------------------
-# SAVE
+# CLI
 # --------------------------------------------------
-OUT_DIR = BASE_DIR / "data/processed/options_chain"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+def main():
+    print("🚀 BUILDING NIFTY OPTION CHAIN (INDEX OPTIONS)")
+    chain = run()
+
+    print("✅ OPTION CHAIN BUILT SUCCESSFULLY")
+    print(f"📅 Trade date : {chain['TRADE_DATE'].max()}")
+    print(f"📦 Rows       : {len(chain)}")
+    print(f"💾 Saved → {OUT}")
 
-OUT = OUT_DIR / "nifty_option_chain_latest.csv"
-chain.to_csv(OUT, index=False)
 
-print("✅ OPTION CHAIN BUILT SUCCESSFULLY")
-print(f"📅 Trade date : {latest_date}")
-print(f"📦 Rows       : {len(chain)}")
-print(f"💾 Saved → {OUT}")
+if __name__ == "__main__":
+    main()
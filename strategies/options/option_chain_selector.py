@@ -10,14 +10,20 @@ PHASE-13.3 | OPTION CHAIN SELECTOR (FINAL FIXED)
 ✔ Regime aware
 """
 
+import sys
 from pathlib import Path
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import OPTIONS_CHAIN_DIR
+
 # --------------------------------------------------
 # CONFIG (INPUTS)
 # --------------------------------------------------
-BASE = Path(r"H:\NIFTY-LAB-Trial")
-CHAIN_DIR = BASE / "data/processed/options_chain"
+CHAIN_DIR = OPTIONS_CHAIN_DIR
 
 spot_price = 26142
 signal = "LONG"          # LONG / SHORT
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | INFERENCE MICRO-BENCHMARK (OLD vs FAST PATH)
+
+Scores the feature store rows (pipelines/ml/feature_store.py) with the
+installed models both ways:
+
+  old   DataFrame → registry column alignment → XGBClassifier.predict_proba
+        → NumPy logit → TemperatureScaler.transform (LGBM predict_proba)
+  fast  registry matrix → native booster in-place prediction → fused
+        temperature scaling (pipelines/ml/fast_inference.py)
+
+for the daily (calibrated XGB) and historical (XGB + LGBM mean) scores.
+Reports median latency per call for one row and per whole batch (and per
+row within it), and the largest probability difference.
+
+Usage:
+  python tools/bench_inference.py [--batch 0 (all rows)] [--repeat 2000]
+
+Exit code 1 when the two paths differ by more than TOLERANCE.
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pipelines.ml import fast_inference, feature_registry, feature_store
+from pipelines.ml import predict_nifty_ensemble as daily
+from pipelines.ml import predict_nifty_ensemble_historical as hist
+
+TOLERANCE = 1e-6        # old path computes the logit in float32
+
+# --------------------------------------------------
+# OLD PATH (as scored before fast_inference)
+# --------------------------------------------------
+def old_daily(df: pd.DataFrame, xgb, cal) -> np.ndarray:
+    X = df[feature_registry.FEATURE_NAMES]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        raw_prob = xgb.predict_proba(X)[:, 1]
+    eps = 1e-6
+    logits = np.log((raw_prob + eps) / (1 - raw_prob + eps))
+    return cal.transform(logits).ravel()
+
+
+def old_hist(df: pd.DataFrame, xgb, lgbm) -> np.ndarray:
+    X = df[feature_registry.FEATURE_NAMES]
+    p = xgb.predict_proba(X)[:, 1]
+    if lgbm:
+        p = (p + lgbm.predict_proba(X)[:, 1]) / 2
+    return p
+
+# --------------------------------------------------
+# TIMING
+# --------------------------------------------------
+def median_secs(fn, arg, repeat) -> float:
+    fn(arg)                                 # warm-up
+    t = np.empty(repeat)
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        t[i] = time.perf_counter() - t0
+    return float(np.median(t))
+
+
+def report(name, old, fast, row_df, row_X, df, X, repeat):
+    one_old = median_secs(old, row_df, repeat)
+    one_fast = median_secs(fast, row_X, repeat)
+    batch_repeat = max(5, repeat // 100)
+    all_old = median_secs(old, df, batch_repeat)
+    all_fast = median_secs(fast, X, batch_repeat)
+    n = len(df)
+
+    print(f"\n{name}")
+    print(f"  {'':<14}{'old':>12}{'fast':>12}{'speed-up':>10}")
+    print(f"  {'1 row (us)':<14}{one_old * 1e6:>12.1f}{one_fast * 1e6:>12.1f}{one_old / one_fast:>9.1f}x")
+    print(f"  {f'{n} rows (ms)':<14}{all_old * 1e3:>12.2f}{all_fast * 1e3:>12.2f}{all_old / all_fast:>9.1f}x")
+    print(f"  {'per row (us)':<14}{all_old / n * 1e6:>12.2f}{all_fast / n * 1e6:>12.2f}")
+
+    diff = float(np.max(np.abs(old(df) - fast(X))))
+    print(f"  max |old - fast| : {diff:.2e}")
+    return diff
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, default=0, help="Rows per batch (0: whole store)")
+    parser.add_argument("--repeat", type=int, default=2000, help="Single-row calls timed")
+    args = parser.parse_args()
+
+    df = feature_store.read(columns=feature_registry.FEATURE_NAMES)
+    if args.batch:
+        df = df.tail(args.batch).reset_index(drop=True)
+    X = feature_registry.matrix(df)
+    print(f"📥 Rows : {len(df):,} | feature set {feature_registry.FEATURE_HASH} | "
+          f"watermark {feature_store.key()[1]}")
+
+    xgb, cal = daily.load_models()
+    _, lgbm = hist.load_models()
+    fast_daily = fast_inference.compile_scorer(xgb, cal)
+    fast_hist = fast_inference.compile_scorer(xgb, lgbm=lgbm)
+
+    row_df, row_X = df.tail(1), X[-1:]
+    diffs = [
+        report("DAILY (calibrated XGB)", lambda d: old_daily(d, xgb, cal), fast_daily,
+               row_df, row_X, df, X, args.repeat),
+        report("HISTORICAL (XGB + LGBM)" if lgbm else "HISTORICAL (XGB)",
+               lambda d: old_hist(d, xgb, lgbm), fast_hist,
+               row_df, row_X, df, X, args.repeat),
+    ]
+
+    if max(diffs) > TOLERANCE:
+        print(f"\n❌ PATHS DIFFER (> {TOLERANCE:g})")
+        sys.exit(1)
+    print("\n✅ SAME PROBABILITIES")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | INCREMENTAL FEATURE PARITY (BIT FOR BIT)
+
+Streams the equity master and the futures OI history bar by bar through
+the rolling state (pipelines/ml/incremental_features.py) and compares,
+on each of the last --days equity days, its inference row with the
+full recomputation (build_nifty_inference_features.build_features on
+the history up to that day): columns, dtypes and raw float bits.
+Also times one full recomputation against one incremental update.
+
+Usage:
+  python tools/check_feature_parity.py [--days 250] [--every 1]
+
+Exit code 1 on any mismatch.
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pipelines.ml import incremental_features as inc
+from pipelines.ml.build_nifty_inference_features import EQ_FILE, FUT_FILE, build_features
+
+
+def timings(eq, fut):
+    """
+    (full recompute secs, incremental update secs) for the last bar.
+    """
+    t0 = time.perf_counter()
+    build_features(pd.read_parquet(EQ_FILE), pd.read_parquet(FUT_FILE))
+    full = time.perf_counter() - t0
+
+    scratch = Path(tempfile.mkdtemp(prefix="feature_parity_"))
+    try:
+        eq_prev = scratch / "eq.parquet"
+        state_file = scratch / "state.json"
+        eq.iloc[:-1].to_parquet(eq_prev, index=False)
+        inc.update(eq_prev, FUT_FILE, state_file)
+        eq.to_parquet(eq_prev, index=False)
+
+        t0 = time.perf_counter()
+        _, mode = inc.update(eq_prev, FUT_FILE, state_file)
+        step = time.perf_counter() - t0
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return full, step, mode
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=250, help="Last equity days compared")
+    parser.add_argument("--every", type=int, default=1, help="Compare every n-th of those days")
+    args = parser.parse_args()
+
+    eq = pd.read_parquet(EQ_FILE)
+    fut = pd.read_parquet(FUT_FILE)
+    print(f"📥 Equity bars : {len(eq)} | futures rows : {len(fut)}")
+
+    t0 = time.perf_counter()
+    mismatches = inc.check_parity(eq, fut, last=args.days, every=args.every)
+    print(f"🔍 Compared last {args.days} days in {time.perf_counter() - t0:.1f}s")
+
+    full, step, mode = timings(eq, fut)
+    print(f"⏱ Full recompute : {full * 1000:.1f} ms")
+    print(f"⏱ One new bar    : {step * 1000:.1f} ms ({mode})")
+
+    if mismatches:
+        print(f"\n❌ {len(mismatches)} MISMATCHES")
+        for day, diff in mismatches[:20]:
+            print(f"  {day}: {diff}")
+        sys.exit(1)
+    print("\n✅ PARITY OK (bit for bit)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | EXPORT PENDING CSV MIRRORS
+
+Writes every CSV queued in lazy mode (configs/outputs.py) from its
+parquet source. Runs at low priority so it can trail the daily run in
+the background (run.py starts it automatically in lazy mode).
+
+Usage:
+  python tools/export_csv_mirrors.py            # export everything queued
+  python tools/export_csv_mirrors.py --list
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pipelines.storage import outputs
+
+
+def lower_priority():
+    if hasattr(os, "nice"):
+        os.nice(10)
+        return
+    try:
+        import ctypes
+        BELOW_NORMAL = 0x4000
+        k32 = ctypes.windll.kernel32
+        k32.SetPriorityClass(k32.GetCurrentProcess(), BELOW_NORMAL)
+    except (AttributeError, OSError):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export lazily queued CSV mirrors")
+    parser.add_argument("--list", action="store_true", help="Only show the queue")
+    parser.add_argument("--normal-priority", action="store_true", help="Do not lower priority")
+    args = parser.parse_args()
+
+    print("NIFTY-LAB | EXPORT PENDING CSV MIRRORS")
+    print("-" * 60)
+
+    queue = outputs.pending()
+    print(f"Queued : {len(queue)}")
+    if args.list:
+        for csv_path, rec in queue.items():
+            print(f"  {rec['queued_at']}  {Path(csv_path).name}  ← {Path(rec['source']).name}")
+        return
+    if not queue:
+        return
+
+    if not args.normal_priority:
+        lower_priority()
+
+    total = 0.0
+    for csv_path, rows, secs in outputs.export_pending():
+        total += secs
+        print(f"  {Path(csv_path).name:<40}{rows:>12,} rows {secs:>8.2f}s")
+    print(f"CSV export time : {total:.2f}s")
+    print("DONE")
+
+
+if __name__ == "__main__":
+    main()
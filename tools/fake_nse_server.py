@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | LOCAL NSE ARCHIVE STAND-IN
+
+Serves synthetic NSE files on localhost so downloaders can be exercised
+without touching nsearchives.nseindia.com:
+
+  /archives/fo/mkt/foDDMMYYYY.zip              → FO bhavcopy ZIP
+  /content/indices/ind_close_all_DDMMYYYY.csv  → index EOD CSV
+
+Weekends and --holiday days return 404. HTTP/1.1 keep-alive.
+
+Usage:
+  python tools/fake_nse_server.py --port 8765
+  python pipelines/historical/backfill_download.py --from 2024-01-01 --to 2024-03-31 \
+      --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FO_RE     = re.compile(r"^/archives/fo/mkt/fo(\d{8})\.zip$")
+EQUITY_RE = re.compile(r"^/content/indices/ind_close_all_(\d{8})\.csv$")
+
+FO_HEADER = (
+    "INSTRUMENT,SYMBOL,EXP_DATE,STR_PRICE,OPT_TYPE,OPEN_PRICE,HI_PRICE,"
+    "LO_PRICE,CLOSE_PRICE,OPEN_INT*,TRD_QTY,NO_OF_CONT,NO_OF_TRADE,"
+    "NOTION_VAL,PR_VAL"
+)
+
+# --------------------------------------------------
+# SYNTHETIC FILES
+# --------------------------------------------------
+def spot_for(d: date) -> float:
+    return 20000.0 + (d.toordinal() % 400) * 5.0
+
+
+def fo_zip(d: date, strikes: int = 300) -> bytes:
+    spot = spot_for(d)
+    exp = d.strftime("%d-%b-%Y").upper()
+    atm = int(spot // 50) * 50
+
+    lines = [f"F&O BHAVCOPY FOR {d:%d-%b-%Y}", "", FO_HEADER]
+    lines.append(
+        f"FUTIDX,NIFTY,{exp},0,XX,{spot:.2f},{spot + 60:.2f},"
+        f"{spot - 60:.2f},{spot + 10:.2f},1000000,50000,2000,900,1.0,1.0"
+    )
+    for i in range(strikes):
+        k = atm + (i - strikes // 2) * 50
+        for t in ("CE", "PE"):
+            px = max(0.05, (spot - k) if t == "CE" else (k - spot)) + 10
+            lines.append(
+                f"OPTIDX,NIFTY,{exp},{k},{t},{px:.2f},{px + 5:.2f},"
+                f"{max(px - 5, 0.05):.2f},{px:.2f},{1000 + i},{500 + i},10,5,1.0,1.0"
+            )
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as z:
+        z.writestr(f"op{d:%d%m%Y}.csv", "\r\n".join(lines) + "\r\n")
+    return buf.getvalue()
+
+
+def index_csv(d: date) -> bytes:
+    spot = spot_for(d)
+    rows = [
+        "Index Name,Index Date,Open Index Value,High Index Value,"
+        "Low Index Value,Closing Index Value,Points Change,Change(%),Volume",
+        f"Nifty 50,{d:%d-%m-%Y},{spot:.2f},{spot + 80:.2f},{spot - 80:.2f},"
+        f"{spot + 10:.2f},10,0.05,0",
+        f"Nifty Bank,{d:%d-%m-%Y},{spot * 2:.2f},{spot * 2 + 80:.2f},"
+        f"{spot * 2 - 80:.2f},{spot * 2 + 10:.2f},10,0.05,0",
+    ]
+    return ("\n".join(rows) + "\n").encode()
+
+
+# --------------------------------------------------
+# SERVER
+# --------------------------------------------------
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    holidays = set()
+
+    def _send(self, code, body=b"", ctype="application/octet-stream"):
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        for rx, build, ctype in (
+            (FO_RE, fo_zip, "application/zip"),
+            (EQUITY_RE, index_csv, "text/csv"),
+        ):
+            m = rx.match(self.path)
+            if not m:
+                continue
+            d = datetime.strptime(m.group(1), "%d%m%Y").date()
+            if d.weekday() >= 5 or d in self.holidays:
+                return self._send(404, b"Not Found", "text/plain")
+            return self._send(200, build(d), ctype)
+
+        self._send(404, b"Not Found", "text/plain")
+
+    def log_message(self, fmt, *args):
+        if not self.server.quiet:
+            super().log_message(fmt, *args)
+
+
+def serve(port=8765, holidays=(), quiet=False):
+    Handler.holidays = set(holidays)
+    httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    httpd.quiet = quiet
+    return httpd
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local NSE archive stand-in")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--holiday",
+        action="append",
+        default=[],
+        help="YYYY-MM-DD to answer 404 (repeatable)",
+    )
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    httpd = serve(
+        args.port,
+        [datetime.strptime(h, "%Y-%m-%d").date() for h in args.holiday],
+        args.quiet,
+    )
+    print(f"Fake NSE archive on http://127.0.0.1:{args.port} (Ctrl-C to stop)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | MASTER VERSIONS (LIST / SNAPSHOT / ROLLBACK / PRUNE)
+
+Replaces ad-hoc fixes such as deleting the last equity date by hand:
+roll the master back to the version taken before the bad append.
+
+Usage:
+  python tools/master_versions.py list     --table equity
+  python tools/master_versions.py snapshot --table options --note "before fix"
+  python tools/master_versions.py rollback --table futures            # undo last write
+  python tools/master_versions.py rollback --table futures --to v012
+  python tools/master_versions.py prune    --table futures --keep 10 --legacy-backups
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import MASTER_EQUITY_PQ, MASTER_FUTURES_PQ, MASTER_OPTIONS_DS
+from pipelines.storage import versions
+
+TABLES = {
+    "equity":  MASTER_EQUITY_PQ,
+    "futures": MASTER_FUTURES_PQ,
+    "options": MASTER_OPTIONS_DS,
+}
+
+
+def show(master):
+    history = versions.list_versions(master)
+    if not history:
+        print("No versions recorded")
+        return
+
+    print(f"{'version':<9}{'created':<21}{'rows':>12}  {'max_date':<12}note")
+    for h in history:
+        rows = f"{h['rows']:,}" if h["rows"] is not None else "-"
+        print(f"{h['version']:<9}{h['created_at']:<21}{rows:>12}  {h['max_date'] or '-':<12}{h['note']}")
+
+
+def legacy_backups(master):
+    """
+    *_backup_{ts}.parquet / .csv full copies written by older appends.
+    """
+    master = Path(master)
+    return sorted(master.parent.glob(f"{versions.table_name(master)}_backup_*"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Versioned master snapshots")
+    parser.add_argument("action", choices=["list", "snapshot", "rollback", "prune"])
+    parser.add_argument("--table", required=True, choices=sorted(TABLES))
+    parser.add_argument("--to", dest="version", help="Rollback target (default: newest version)")
+    parser.add_argument("--note", default="manual", help="Snapshot note")
+    parser.add_argument("--keep", type=int, default=versions.KEEP, help="Prune: versions to keep")
+    parser.add_argument("--legacy-backups", action="store_true",
+                        help="Prune: also delete old *_backup_* full copies")
+    args = parser.parse_args()
+
+    master = TABLES[args.table]
+    print(f"NIFTY-LAB | MASTER VERSIONS | {args.table}")
+    print("-" * 60)
+
+    if args.action == "list":
+        show(master)
+
+    elif args.action == "snapshot":
+        v = versions.snapshot(master, note=args.note)
+        print(f"Snapshot : {v}" if v else "Master does not exist — nothing to snapshot")
+
+    elif args.action == "rollback":
+        v = versions.rollback(master, args.version)
+        print(f"Restored : {v}")
+        show(master)
+
+    elif args.action == "prune":
+        dropped = versions.prune(master, args.keep)
+        print(f"Versions removed : {len(dropped)} {' '.join(dropped)}")
+        if args.legacy_backups:
+            old = legacy_backups(master)
+            for f in old:
+                f.unlink()
+            print(f"Legacy backups removed : {len(old)}")
+
+
+if __name__ == "__main__":
+    main()
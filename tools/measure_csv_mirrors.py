@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | CSV MIRROR COST (WALL TIME WITH vs WITHOUT)
+
+For every parquet output the daily run writes (masters, daily cleaned
+files, ML features, predictions, PCR), times writing it as parquet only
+vs parquet + CSV mirror, into a scratch directory.
+
+For the end-to-end figure, run the daily mode both ways; run.py prints
+its wall time:
+  python run.py --mode daily --csv-mirrors eager
+  python run.py --mode daily --csv-mirrors off
+
+Usage:
+  python tools/measure_csv_mirrors.py [--days 1]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import (
+    CONT_DIR, ML_DIR, OPTIONS_ML_DIR, PROC_EQ_DAILY, PROC_FUT_DAILY, PROC_OPT_DAILY,
+)
+from pipelines.options import master_store
+from pipelines.storage.masters import load_options
+
+
+def daily_outputs(days):
+    """
+    (label, loader) for each output one daily run writes.
+    """
+    out = []
+    for name in ("master_equity.parquet", "master_futures.parquet"):
+        f = CONT_DIR / name
+        if f.exists():
+            out.append((name, lambda f=f: pd.read_parquet(f)))
+
+    if master_store.latest_date() is not None:
+        # Eager mode rewrites the whole options CSV mirror when it is rebuilt
+        out.append(("master_options (full)", load_options))
+
+    for d, pattern in ((PROC_EQ_DAILY, "EQUITY_NIFTY_*.parquet"),
+                       (PROC_FUT_DAILY, "FUT_NIFTY_*.parquet"),
+                       (PROC_OPT_DAILY, "OPTIONS_NIFTY_*.parquet")):
+        for f in sorted(d.glob(pattern))[-days:]:
+            out.append((f.name, lambda f=f: pd.read_parquet(f)))
+
+    for d in (ML_DIR, OPTIONS_ML_DIR):
+        for f in sorted(d.glob("*.parquet")):
+            out.append((f.name, lambda f=f: pd.read_parquet(f)))
+    return out
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main(days=1):
+    print("NIFTY-LAB | CSV MIRROR COST")
+    print("-" * 60)
+
+    items = daily_outputs(days)
+    if not items:
+        print("No outputs found — run the pipeline first")
+        return
+
+    tot_pq = tot_csv = 0.0
+    print(f"{'output':<40}{'rows':>12}{'parquet s':>11}{'csv s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for label, load in items:
+            df = load()
+            pq_s = timed(lambda: df.to_parquet(tmp / "x.parquet", index=False))
+            csv_s = timed(lambda: df.to_csv(tmp / "x.csv", index=False))
+            tot_pq += pq_s
+            tot_csv += csv_s
+            print(f"{label:<40}{len(df):>12,}{pq_s:>11.2f}{csv_s:>9.2f}")
+
+    print("-" * 60)
+    print(f"Without CSV mirrors : {tot_pq:.2f}s")
+    print(f"With CSV mirrors    : {tot_pq + tot_csv:.2f}s  (+{tot_csv:.2f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time outputs with and without CSV mirrors")
+    parser.add_argument("--days", type=int, default=1, help="Daily files per kind to include")
+    args = parser.parse_args()
+    main(args.days)
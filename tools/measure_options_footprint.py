@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | OPTIONS MASTER FOOTPRINT (LEGACY vs COMPACT)
+
+Loads the options master (or its last --days partitions) through
+load_options() and compares in-memory size against the legacy layout
+the old monolithic master used: object strings, float64 numerics,
+datetime64[ns] dates. Also reports the pandas default string dtype and
+bytes on disk.
+
+Usage:
+  python tools/measure_options_footprint.py
+  python tools/measure_options_footprint.py --days 250 --min-ratio 3
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import MASTER_OPTIONS_DS
+from pipelines.options import master_store
+from pipelines.storage.compact import frame_nbytes
+from pipelines.storage.masters import load_options
+
+STRING_COLS = ["INSTRUMENT", "SYMBOL", "OPT_TYPE"]
+DATE_COLS   = ["TRADE_DATE", "EXP_DATE"]
+
+
+def legacy_frame(df: pd.DataFrame, strings="object") -> pd.DataFrame:
+    out = {}
+    for c in df.columns:
+        if c in STRING_COLS:
+            out[c] = df[c].astype(strings)
+        elif c in DATE_COLS:
+            out[c] = df[c].astype("datetime64[ns]")
+        else:
+            out[c] = df[c].astype("float64")
+    return pd.DataFrame(out)
+
+
+def disk_bytes(dates=None) -> int:
+    files = MASTER_OPTIONS_DS.rglob("*.parquet")
+    if dates is not None:
+        keep = {f"TRADE_DATE={d}" for d in dates}
+        files = (f for f in files if f.relative_to(MASTER_OPTIONS_DS).parts[0] in keep)
+    return sum(f.stat().st_size for f in files)
+
+
+def main(days=None, min_ratio=None):
+    print("NIFTY-LAB | OPTIONS MASTER FOOTPRINT")
+    print("-" * 60)
+
+    dates = master_store.trade_dates()
+    if not dates:
+        print("Options master is empty — nothing to measure")
+        return None
+    if days:
+        dates = dates[-days:]
+
+    compact_df = load_options(dates=dates)
+    rows = len(compact_df)
+    if rows == 0:
+        print("No rows loaded")
+        return None
+
+    sizes = {
+        "legacy (object str, float64)": frame_nbytes(legacy_frame(compact_df)),
+        "pandas default str, float64": frame_nbytes(legacy_frame(compact_df, "str")),
+        "compact (configs/schema.py)": frame_nbytes(compact_df),
+    }
+    base = sizes["legacy (object str, float64)"]
+
+    print(f"Trade dates : {len(dates)} ({dates[0]} → {dates[-1]})")
+    print(f"Rows        : {rows:,}")
+    print()
+    print(f"{'layout':<32}{'MB':>10}{'B/row':>10}{'vs legacy':>12}")
+    for name, b in sizes.items():
+        print(f"{name:<32}{b / 1e6:>10.1f}{b / rows:>10.1f}{base / b:>11.2f}x")
+    print()
+    print(f"On disk     : {disk_bytes(dates) / 1e6:.1f} MB (compact parquet)")
+
+    print()
+    print("Dtypes (compact):")
+    for c, t in compact_df.dtypes.items():
+        print(f"  {c:<12} {t}")
+
+    ratio = base / sizes["compact (configs/schema.py)"]
+    if min_ratio is not None and ratio < min_ratio:
+        print(f"FAIL: reduction {ratio:.2f}x < {min_ratio}x")
+        sys.exit(1)
+    return ratio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure options master memory footprint")
+    parser.add_argument("--days", type=int, help="Only the newest N trade dates")
+    parser.add_argument("--min-ratio", type=float, help="Exit 1 below this reduction")
+    args = parser.parse_args()
+    main(args.days, args.min_ratio)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+NIFTY-LAB | RUN REPORT (STAGE COST + REGRESSIONS)
+
+Reads the JSON reports run.py writes to data/audit/runs/ and shows the
+latest run's stages by wall time, next to the median of the previous
+runs of the same mode. Stages slower than --threshold x their median
+are flagged.
+
+Usage:
+  python tools/run_report.py                 # latest run, any mode
+  python tools/run_report.py --mode daily --history 10 --threshold 1.5
+"""
+
+import argparse
+import json
+import statistics
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from configs.paths import AUDIT_DIR
+
+RUNS_DIR = AUDIT_DIR / "runs"
+
+
+def load_reports(mode=None):
+    """
+    Reports oldest first (file names start with the run timestamp).
+    """
+    reports = []
+    for f in sorted(RUNS_DIR.glob("*.json")):
+        r = json.loads(f.read_text(encoding="utf-8"))
+        if mode is None or r["mode"] == mode:
+            reports.append(r)
+    return reports
+
+
+def fmt(v, spec):
+    return "-" if v is None else format(v, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show stage costs of the latest run")
+    parser.add_argument("--mode", choices=["backtest", "daily", "backfill"])
+    parser.add_argument("--history", type=int, default=10, help="Previous runs to compare with")
+    parser.add_argument("--threshold", type=float, default=1.5, help="Flag at this x median")
+    args = parser.parse_args()
+
+    reports = load_reports(args.mode)
+    if not reports:
+        print(f"No run reports in {RUNS_DIR}")
+        return
+
+    latest = reports[-1]
+    previous = [r for r in reports[:-1] if r["mode"] == latest["mode"]][-args.history:]
+
+    # Median wall time per stage, over runs where it actually ran
+    medians = {}
+    for r in previous:
+        for st in r["stages"]:
+            if st["status"] == "ok":
+                medians.setdefault(st["stage"], []).append(st["seconds"])
+    medians = {k: statistics.median(v) for k, v in medians.items()}
+
+    print(f"NIFTY-LAB | RUN REPORT — {latest['mode']} @ {latest['started_at']}")
+    print(f"Wall : {latest['wall_secs']:.1f}s   ok: {latest['ok']}   "
+          f"compared with {len(previous)} previous run(s)")
+    print("-" * 92)
+    print(f"{'stage':<24}{'status':<9}{'wall s':>8}{'median':>8}{'cpu s':>8}"
+          f"{'rss MB':>9}{'rows in':>12}{'rows out':>12}")
+
+    flagged = []
+    for st in sorted(latest["stages"], key=lambda s: -s["seconds"]):
+        med = medians.get(st["stage"])
+        slow = (st["status"] == "ok" and med and st["seconds"] > args.threshold * med)
+        if slow:
+            flagged.append(st["stage"])
+        print(f"{st['stage']:<24}{st['status']:<9}{st['seconds']:>8.1f}{fmt(med, '.1f'):>8}"
+              f"{fmt(st.get('cpu_secs'), '.1f'):>8}{fmt(st.get('peak_rss_mb'), '.0f'):>9}"
+              f"{fmt(st.get('rows_in'), ','):>12}{fmt(st.get('rows_out'), ','):>12}"
+              f"{'  ⚠ SLOWER' if slow else ''}")
+    print("-" * 92)
+
+    if flagged:
+        print(f"⚠ Slower than {args.threshold}x median: {', '.join(flagged)}")
+
+
+if __name__ == "__main__":
+    main()